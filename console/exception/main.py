@@ -180,3 +180,13 @@ class ErrTenantLackOfMemory(ErrInsufficientResource):
         self.msg_show = "团队使用内存已超过限额，请联系企业管理员增加限额"
         self.status_code = 412
         self.error_code = 10413
+
+
+class ErrRegionUnavailable(ServiceHandleException):
+    """
+    the circuit of the region is open, requests fail fast
+    """
+
+    def __init__(self, region_name):
+        super(ErrRegionUnavailable, self).__init__(
+            "region {} is unavailable".format(region_name), msg_show="集群暂时无法访问，请稍后重试", error_code=10411)
@@ -4,9 +4,27 @@ import os
 import threading
 
 import redis
+from console.utils.cache import LocalCache
 
 logger = logging.getLogger("default")
 
+# check the jwt and refresh it in one round trip, only when its remaining lifetime drops
+# below the threshold. returns 0 if the jwt does not exist.
+_REFRESH_SCRIPT = """
+local ttl = redis.call('TTL', KEYS[1])
+if ttl == -2 then
+    return 0
+end
+if ttl < tonumber(ARGV[1]) then
+    local user_id = redis.call('GET', KEYS[1])
+    redis.call('EXPIRE', KEYS[1], ARGV[2])
+    if user_id then
+        redis.call('SET', user_id, KEYS[1], 'EX', ARGV[2])
+    end
+end
+return 1
+"""
+
 
 class JwtManager(object):
     _instance_lock = threading.Lock()
@@ -31,7 +49,16 @@ class JwtManager(object):
                     port=os.getenv("REDIS_PORT", 6379),
                     db=os.getenv("REDIS_DB", 0),
                     password=os.getenv("REDIS_PASSWORD", None))
-                cls.cache_time = os.getenv("JWT_CACHE_TIME", 3600)
+                cls.cache_time = int(os.getenv("JWT_CACHE_TIME", 3600))
+                # refresh the expire time at most once per refresh interval, and at the latest
+                # at half of the lifetime, so that a short JWT_CACHE_TIME is still refreshed
+                refresh_interval = int(os.getenv("JWT_REFRESH_INTERVAL", 60))
+                cls.refresh_threshold = max(cls.cache_time // 2, cls.cache_time - refresh_interval)
+                cls.refresh_script = cls.r.register_script(_REFRESH_SCRIPT)
+                # jwt validated by redis recently, not checked again within local_cache_time
+                cls.local_cache_time = float(os.getenv("JWT_LOCAL_CACHE_TIME", 5))
+                cls.local_cache_size = int(os.getenv("JWT_LOCAL_CACHE_SIZE", 10000))
+                cls.validated = LocalCache(cls.local_cache_size)
 
         return JwtManager._instance
 
@@ -44,14 +71,36 @@ class JwtManager(object):
             logger.exception(e)
             return True
 
+    def validate(self, jwt):
+        """
+        Check if the jwt exists, and reset its expire time if it is about to expire.
+        """
+        if not self.enable:
+            return True
+        if isinstance(jwt, bytes):
+            jwt = jwt.decode()
+        if self.validated.get(jwt):
+            return True
+        try:
+            exists = self.refresh_script(keys=[jwt], args=[self.refresh_threshold, self.cache_time])
+        except Exception as e:
+            logger.exception(e)
+            return True
+        if not exists:
+            self.validated.delete(jwt)
+            return False
+        if self.local_cache_time > 0:
+            self.validated.set(jwt, True, self.local_cache_time)
+        return True
+
     def set(self, jwt, user_id):
         if not self.enable:
             return
-        # expired in 3600s
-        # TODO: A rate limiter can reduce the stress of redis server.
         try:
-            self.r.set(jwt, user_id, ex=self.cache_time)
-            self.r.set(user_id, jwt, ex=self.cache_time)
+            pipe = self.r.pipeline(transaction=False)
+            pipe.set(jwt, user_id, ex=self.cache_time)
+            pipe.set(user_id, jwt, ex=self.cache_time)
+            pipe.execute()
         except Exception as e:
             logger.exception(e)
 
@@ -59,4 +108,5 @@ class JwtManager(object):
         jwt = self.r.get(user_id)
         if jwt:
             self.r.delete(jwt)
+            self.validated.delete(jwt.decode())
         self.r.delete(user_id)
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+import fakeredis
+import pytest
+
+from console.login import jwt_manager
+from console.login.jwt_manager import JwtManager
+
+
+@pytest.fixture
+def manager(mocker, monkeypatch):
+    def manager(**env):
+        monkeypatch.setenv("ENABLE_JWT_MANAGER", "true")
+        for key, value in env.items():
+            monkeypatch.setenv(key, value)
+        mocker.patch.object(jwt_manager.redis, "Redis", lambda **kwargs: fakeredis.FakeStrictRedis())
+        if hasattr(JwtManager, "_instance"):
+            del JwtManager._instance
+        return JwtManager()
+
+    yield manager
+    if hasattr(JwtManager, "_instance"):
+        del JwtManager._instance
+
+
+def test_validate(manager):
+    m = manager(JWT_LOCAL_CACHE_TIME="0")
+    assert not m.validate("jwt")
+    m.set("jwt", "1")
+    assert m.validate("jwt")
+    assert m.validate(b"jwt")
+
+    m.delete_user_id("1")
+    assert not m.validate("jwt")
+
+
+def test_refresh_when_about_to_expire(manager):
+    m = manager(JWT_CACHE_TIME="3600", JWT_REFRESH_INTERVAL="60", JWT_LOCAL_CACHE_TIME="0")
+    m.set("jwt", "1")
+    # within the refresh interval, the expire time is left as is
+    m.r.expire("jwt", 3580)
+    assert m.validate("jwt")
+    assert m.r.ttl("jwt") <= 3580
+
+    m.r.expire("jwt", 3500)
+    m.r.expire("1", 3500)
+    assert m.validate("jwt")
+    assert m.r.ttl("jwt") > 3580
+    assert m.r.ttl("1") > 3580
+    assert m.r.get("1") == b"jwt"
+
+
+def test_refresh_threshold_clamped(manager):
+    m = manager(JWT_CACHE_TIME="60", JWT_REFRESH_INTERVAL="60")
+    assert m.refresh_threshold == 30
+    m = manager(JWT_CACHE_TIME="3600", JWT_REFRESH_INTERVAL="60")
+    assert m.refresh_threshold == 3540
+
+
+def test_local_cache(manager):
+    m = manager(JWT_LOCAL_CACHE_TIME="60", JWT_LOCAL_CACHE_SIZE="2")
+    m.set("jwt", "1")
+    assert m.validate("jwt")
+    # validated recently, redis is not asked again
+    m.r.delete("jwt")
+    assert m.validate("jwt")
+
+    # the local cache is bounded
+    m.set("a", "2")
+    m.set("b", "3")
+    assert m.validate("a") and m.validate("b")
+    assert m.validated.size <= 2
+    assert not m.validate("jwt")
+
+
+def test_disabled(monkeypatch):
+    monkeypatch.delenv("ENABLE_JWT_MANAGER", raising=False)
+    if hasattr(JwtManager, "_instance"):
+        del JwtManager._instance
+    try:
+        assert JwtManager().validate("jwt")
+    finally:
+        del JwtManager._instance
@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+from console.services.event_archive import EventArchiver, event_archiver
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Move the completed service events older than the retention days into service_event_archive'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--retention-days', type=int, default=event_archiver.retention_days, help="Keep the events of the last days")
+        parser.add_argument('--batch-size', type=int, default=event_archiver.batch_size, help="Events moved per transaction")
+        parser.add_argument('--max-batches', type=int, default=None, help="Stop after this many batches")
+
+    def handle(self, *args, **options):
+        archiver = EventArchiver(retention_days=options['retention_days'], batch_size=options['batch_size'])
+        moved = archiver.archive(max_batches=options['max_batches'])
+        print("archived {} service events".format(moved))
@@ -114,6 +114,11 @@ class RainbondCenterAppVersion(BaseModel):
 
     class Meta:
         db_table = "rainbond_center_app_version"
+        indexes = [
+            models.Index(fields=['enterprise_id', 'app_id', 'version'], name='app_version_enterprise_idx'),
+            models.Index(fields=['app_id', 'version'], name='app_version_app_idx'),
+            models.Index(fields=['record_id'], name='app_version_record_idx'),
+        ]
 
     enterprise_id = models.CharField(max_length=32, default="public", help_text="企业ID")
     app_id = models.CharField(max_length=32, help_text="应用id")
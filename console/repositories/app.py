@@ -8,7 +8,7 @@ import os
 from console.exception.main import ServiceHandleException
 from console.models.main import (AppMarket, RainbondCenterAppTag, RainbondCenterAppTagsRelation, ServiceRecycleBin,
                                  ServiceRelationRecycleBin, ServiceSourceInfo)
-from console.repositories.base import BaseConnection
+from console.repositories.base import BaseConnection, overwrite_by_keys
 from django.db import transaction
 from docker_image import reference
 from www.models.main import (ServiceWebhooks, TenantServiceInfo, TenantServiceInfoDelete)
@@ -267,8 +267,8 @@ class ServiceSourceRepository(object):
         ServiceSourceInfo.objects.bulk_create(service_sources)
 
     def bulk_update(self, service_sources):
-        ServiceSourceInfo.objects.filter(pk__in=[source.ID for source in service_sources]).delete()
-        self.bulk_create(service_sources)
+        source_ids = [source.ID for source in service_sources]
+        overwrite_by_keys(ServiceSourceInfo.objects.filter(pk__in=source_ids), service_sources, ("ID", ))
 
 
 class ServiceRecycleBinRepository(object):
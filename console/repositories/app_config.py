@@ -8,6 +8,7 @@ import logging
 import os
 
 from console.exception.main import AbortRequest
+from console.repositories.base import overwrite_by_keys
 from console.utils.shortcuts import get_object_or_404
 from django.db.models import Q
 from www.db.base import BaseConnection
@@ -131,8 +132,7 @@ class TenantServiceEnvVarRepository(object):
 
     @staticmethod
     def overwrite_by_component_ids(component_ids, envs):
-        TenantServiceEnvVar.objects.filter(service_id__in=component_ids).delete()
-        TenantServiceEnvVar.objects.bulk_create(envs)
+        overwrite_by_keys(TenantServiceEnvVar.objects.filter(service_id__in=component_ids), envs, ("service_id", "attr_name"))
 
     @staticmethod
     def create_or_update(env: TenantServiceEnvVar):
@@ -146,8 +146,7 @@ class TenantServiceEnvVarRepository(object):
 
     @staticmethod
     def bulk_update(envs):
-        TenantServiceEnvVar.objects.filter(pk__in=[env.ID for env in envs]).delete()
-        TenantServiceEnvVar.objects.bulk_create(envs)
+        overwrite_by_keys(TenantServiceEnvVar.objects.filter(pk__in=[env.ID for env in envs]), envs, ("ID", ))
 
 
 class TenantServicePortRepository(object):
@@ -204,13 +203,12 @@ class TenantServicePortRepository(object):
 
     @staticmethod
     def bulk_create_or_update(ports):
-        TenantServicesPort.objects.filter(pk__in=[port.ID for port in ports]).delete()
-        TenantServicesPort.objects.bulk_create(ports)
+        overwrite_by_keys(TenantServicesPort.objects.filter(pk__in=[port.ID for port in ports]), ports, ("ID", ))
 
     @staticmethod
     def overwrite_by_component_ids(component_ids, ports):
-        TenantServicesPort.objects.filter(service_id__in=component_ids).delete()
-        TenantServicesPort.objects.bulk_create(ports)
+        overwrite_by_keys(
+            TenantServicesPort.objects.filter(service_id__in=component_ids), ports, ("service_id", "container_port"))
 
     @staticmethod
     def list_by_service_ids(tenant_id, service_ids):
@@ -313,8 +311,8 @@ class TenantServiceVolumnRepository(object):
             self.create_or_update(volume)
 
     def overwrite_by_component_ids(self, component_ids, volumes):
-        TenantServiceVolume.objects.filter(service_id__in=component_ids).delete()
-        self.bulk_create(volumes)
+        overwrite_by_keys(
+            TenantServiceVolume.objects.filter(service_id__in=component_ids), volumes, ("service_id", "volume_name"))
 
     @staticmethod
     def create_or_update(volume: TenantServiceVolume):
@@ -333,8 +331,9 @@ class ComponentConfigurationFileRepository(object):
 
     @staticmethod
     def overwrite_by_component_ids(component_ids, config_files):
-        TenantServiceConfigurationFile.objects.filter(service_id__in=component_ids).delete()
-        TenantServiceConfigurationFile.objects.bulk_create(config_files)
+        overwrite_by_keys(
+            TenantServiceConfigurationFile.objects.filter(service_id__in=component_ids), config_files,
+            ("service_id", "volume_name"))
 
 
 def bulk_create_or_update(tenant_id, component_deps):
@@ -748,8 +747,7 @@ class ServiceExtendRepository(object):
         ServiceExtendMethod.objects.bulk_create(extend_infos)
 
     def bulk_create_or_update(self, extend_infos):
-        ServiceExtendMethod.objects.filter(pk__in=[ei.ID for ei in extend_infos]).delete()
-        self.bulk_create(extend_infos)
+        overwrite_by_keys(ServiceExtendMethod.objects.filter(pk__in=[ei.ID for ei in extend_infos]), extend_infos, ("ID", ))
 
 
 class CompileEnvRepository(object):
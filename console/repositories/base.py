@@ -1,17 +1,75 @@
 # -*- coding: utf8 -*-
-from addict import Dict
-from django.db import connections
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from www.db.base import BaseConnection
 
+__all__ = ["BaseConnection", "overwrite_by_keys"]
 
-class BaseConnection(object):
-    def __init__(self, db_alias='default', *args, **kwargs):
-        self.db_alias = db_alias
 
-    def _dict_fetch_all(self, cursor):
-        desc = cursor.description
-        return [Dict(list(zip([col[0] for col in desc], row))) for row in cursor.fetchall()]
+def _value(field, obj):
+    value = field.value_from_object(obj)
+    try:
+        # objects built from templates may hold "80" for 80
+        return field.to_python(value)
+    except ValidationError:
+        return value
 
-    def query(self, sql, args=None):
-        cursor = connections[self.db_alias].cursor()
-        cursor.execute(sql, args)
-        return self._dict_fetch_all(cursor)
+
+def overwrite_by_keys(queryset, objs, keys):
+    """
+    Make the rows of queryset the objs, with the least writes: a row and an obj of the
+    same keys fields are paired, the row is updated only if a field of the obj differs.
+    The objs without a row are inserted and the rows without an obj deleted, in one
+    transaction. The fields with auto_now_add keep the value of the row.
+
+    :param keys: the fields identifying an obj among the rows, e.g. ("service_id", "attr_name")
+    :return: the numbers of rows inserted, updated and deleted
+    """
+    model = queryset.model
+    key_fields = [model._meta.get_field(key) for key in keys]
+    fields = [field for field in model._meta.concrete_fields if not field.primary_key]
+
+    def key_of(obj):
+        return tuple(_value(field, obj) for field in key_fields)
+
+    with transaction.atomic():
+        # inside the transaction, the rows are read from the primary
+        rows = {}
+        for row in queryset:
+            rows.setdefault(key_of(row), []).append(row)
+
+        inserts = []
+        updates = []
+        paired_pks = set()
+        for obj in objs:
+            paired = rows.get(key_of(obj))
+            if not paired:
+                inserts.append(obj)
+                continue
+            row = paired.pop(0)
+            obj.pk = row.pk
+            paired_pks.add(row.pk)
+            changed = {}
+            for field in fields:
+                if getattr(field, "auto_now_add", False):
+                    setattr(obj, field.attname, getattr(row, field.attname))
+                elif not getattr(field, "auto_now", False) and _value(field, obj) != _value(field, row):
+                    changed[field.attname] = getattr(obj, field.attname)
+            if changed:
+                for field in fields:
+                    if getattr(field, "auto_now", False):
+                        changed[field.attname] = field.pre_save(obj, False)
+                updates.append((row.pk, changed))
+
+        deletes = [row.pk for paired in rows.values() for row in paired]
+        # an obj whose keys changed can not keep the id given to the obj taking its keys
+        for obj in inserts:
+            if obj.pk in paired_pks:
+                obj.pk = None
+        if deletes:
+            model.objects.filter(pk__in=deletes).delete()
+        for pk, changed in updates:
+            model.objects.filter(pk=pk).update(**changed)
+        if inserts:
+            model.objects.bulk_create(inserts)
+    return len(inserts), len(updates), len(deletes)
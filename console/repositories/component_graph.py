@@ -2,6 +2,7 @@
 
 from console.models.main import ComponentGraph
 from console.exception.bcode import ErrComponentGraphExists, ErrComponentGraphNotFound
+from console.repositories.base import overwrite_by_keys
 
 
 class ComponentGraphRepository(object):
@@ -66,8 +67,8 @@ class ComponentGraphRepository(object):
         ComponentGraph.objects.bulk_create(component_graphs)
 
     def overwrite_by_component_ids(self, component_ids, component_graphs):
-        ComponentGraph.objects.filter(component_id__in=component_ids).delete()
-        self.bulk_create(component_graphs)
+        overwrite_by_keys(
+            ComponentGraph.objects.filter(component_id__in=component_ids), component_graphs, ("component_id", "graph_id"))
 
     def batch_delete(self, component_id, graph_ids):
         ComponentGraph.objects.filter(component_id=component_id, graph_id__in=graph_ids).delete()
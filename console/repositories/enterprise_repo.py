@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 import logging
 
+from addict import Dict
 from console.enum.enterprise_enum import EnterpriseRolesEnum
 from console.exception.exceptions import (ExterpriseNotExistError, UserNotExistError)
 from console.models.main import (Applicants, EnterpriseUserPerm, RainbondCenterApp)
@@ -10,6 +11,9 @@ from console.repositories.service_repo import service_repo
 from console.repositories.team_repo import team_repo
 from console.repositories.user_repo import user_repo
 from console.repositories.user_role_repo import (UserRoleNotFoundException, user_role_repo)
+from console.services.identity_context import enterprise_snapshots
+from console.services.perm_cache import perm_cache
+from console.utils.cache import cached, tag_cache
 from django.db.models import Q
 from www.models.main import (PermRelTenant, ServiceGroup, ServiceGroupRelation, TenantEnterprise, TenantRegionInfo, Tenants,
                              Users)
@@ -148,6 +152,7 @@ class TenantEnterpriseRepo(object):
         else:
             return enterprise
 
+    @cached(tags=("enterprise", ))
     def get_enterprise_by_enterprise_id(self, enterprise_id, exception=True):
         enterprise = TenantEnterprise.objects.filter(enterprise_id=enterprise_id)
         if not enterprise:
@@ -172,16 +177,11 @@ class TenantEnterpriseRepo(object):
 
     def update(self, eid, **data):
         TenantEnterprise.objects.filter(enterprise_id=eid).update(**data)
+        enterprise_snapshots.invalidate()
+        tag_cache.invalidate("enterprise")
 
     def list_appstore_infos(self, query="", page=None, page_size=None):
-        limit = ""
-        if page is not None and page_size is not None:
-            page = page if page > 0 else 1
-            page = (page - 1) * page_size
-            limit = "Limit {page}, {size}".format(page=page, size=page_size)
-        where = ""
-        if query:
-            where = "WHERE a.enterprise_alias LIKE '%{query}%' OR a.enterprise_name LIKE '%{query}%'".format(query=query)
+        where, params = self._appstore_infos_where(query)
         sql = """
         SELECT
             a.enterprise_id,
@@ -192,18 +192,15 @@ class TenantEnterpriseRepo(object):
             tenant_enterprise a
             JOIN tenant_enterprise_token b ON a.id = b.enterprise_id
         {where}
-        {limit}
-        """.format(
-            where=where, limit=limit)
+        """.format(where=where)
 
         conn = BaseConnection()
-        result = conn.query(sql)
-        return result
+        if page is not None and page_size is not None:
+            return [Dict(row._asdict()) for row in conn.query_page(sql, params, page=page, page_size=page_size)]
+        return conn.query(sql, params)
 
     def count_appstore_infos(self, query=""):
-        where = ""
-        if query:
-            where = "WHERE a.enterprise_alias LIKE '%{query}%' OR a.enterprise_name LIKE '%{query}%'".format(query=query)
+        where, params = self._appstore_infos_where(query)
         sql = """
         SELECT
             count(*) as total
@@ -214,9 +211,17 @@ class TenantEnterpriseRepo(object):
         """.format(where=where)
 
         conn = BaseConnection()
-        result = conn.query(sql)
+        result = conn.query(sql, params)
         return result[0]["total"]
 
+    @staticmethod
+    def _appstore_infos_where(query):
+        # query_page appends its conditions to the where clause
+        if not query:
+            return "WHERE 1 = 1", []
+        query = "%{}%".format(query)
+        return "WHERE (a.enterprise_alias LIKE %s OR a.enterprise_name LIKE %s)", [query, query]
+
     def get_enterprise_user_request_join(self, enterprise_id, user_id):
         team_ids = self.get_enterprise_teams(enterprise_id).values_list("tenant_id", flat=True)
         return Applicants.objects.filter(user_id=user_id, team_id__in=team_ids).order_by("is_pass", "-apply_time")
@@ -273,6 +278,7 @@ class TenantEnterpriseUserPermRepo(object):
 
     def update_roles(self, enterprise_id, user_id, identity):
         EnterpriseUserPerm.objects.filter(enterprise_id=enterprise_id, user_id=user_id).update(identity=identity)
+        perm_cache.invalidate()
 
     def get_user_enterprise_perm(self, user_id, enterprise_id):
         return EnterpriseUserPerm.objects.filter(user_id=user_id, enterprise_id=enterprise_id)
@@ -319,3 +325,5 @@ class TenantEnterpriseUserPermRepo(object):
 
 enterprise_repo = TenantEnterpriseRepo()
 enterprise_user_perm_repo = TenantEnterpriseUserPermRepo()
+
+tag_cache.bind(TenantEnterprise, "enterprise")
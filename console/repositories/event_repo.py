@@ -2,50 +2,111 @@
 """
   Created on 18/1/24.
 """
-from www.models.main import ServiceEvent
+import os
+import time
+
+from django.db import connection
+from www.models.main import ServiceEvent, ServiceEventArchive
 
 
 class ServiceEventRepository(object):
+    """
+    Completed events older than the retention are moved to service_event_archive, see
+    console.services.event_archive; the readers of a single event or of the history of a
+    component fall back to the archive. The event feeds of a team or a region only read
+    the recent events of service_event, which is what the archive keeps them bounded to.
+    """
+
+    def __init__(self):
+        self._has_archive = False
+        self._archive_checked_at = None
+        # how long a missing archive table is remembered before it is looked for again
+        self.archive_check_interval = float(os.getenv("EVENT_ARCHIVE_CHECK_INTERVAL", 300))
+
+    def has_archive(self):
+        """whether service_event_archive exists, an upgraded install may not have run its sql yet"""
+        if self._has_archive:
+            return True
+        now = time.time()
+        if self._archive_checked_at is None or now - self._archive_checked_at >= self.archive_check_interval:
+            self._archive_checked_at = now
+            self._has_archive = ServiceEventArchive._meta.db_table in connection.introspection.table_names()
+        return self._has_archive
+
+    def _models(self):
+        return (ServiceEvent, ServiceEventArchive) if self.has_archive() else (ServiceEvent, )
+
     def get_last_event(self, tenant_id, service_id):
-        events = ServiceEvent.objects.filter(tenant_id=tenant_id, service_id=service_id).order_by("-start_time")
-        if events:
-            return events[0]
+        for model in self._models():
+            event = model.objects.filter(tenant_id=tenant_id, service_id=service_id).order_by("-start_time").first()
+            if event:
+                return event
         return None
 
     def get_last_deploy_event(self, tenant_id, service_id):
-        events = ServiceEvent.objects.filter(tenant_id=tenant_id, service_id=service_id).order_by("-start_time")
-        if events:
-            return events[0]
-        return None
+        return self.get_last_event(tenant_id, service_id)
 
     def get_event_by_event_id(self, event_id):
-        try:
-            return ServiceEvent.objects.get(event_id=event_id)
-        except ServiceEvent.DoesNotExist:
-            return None
+        for model in self._models():
+            event = model.objects.filter(event_id=event_id).first()
+            if event:
+                return event
+        return None
 
     def get_events_by_event_ids(self, event_ids):
-        return ServiceEvent.objects.filter(event_id__in=event_ids)
+        events = []
+        missing = set(event_ids)
+        for model in self._models():
+            if not missing:
+                break
+            found = list(model.objects.filter(event_id__in=missing))
+            missing -= {event.event_id for event in found}
+            events.extend(found)
+        return events
 
-    def get_events_before_specify_time(self, tenant_id, service_id, start_time):
+    @staticmethod
+    def _events_before(model, tenant_id, service_id, start_time):
+        events = model.objects.filter(tenant_id=tenant_id, service_id=service_id)
         if start_time:
-            return ServiceEvent.objects.filter(
-                tenant_id=tenant_id, service_id=service_id, start_time__lte=start_time).order_by("-start_time")
-        else:
-            return ServiceEvent.objects.filter(tenant_id=tenant_id, service_id=service_id).order_by("-start_time")
+            events = events.filter(start_time__lte=start_time)
+        return events.order_by("-start_time")
+
+    def list_events_before_specify_time(self, tenant_id, service_id, start_time, page, page_size):
+        """
+        a page of the events of the component, the newest first, continued with the
+        archived events after the last one of service_event.
+        :return: the events of the page, and whether there is a next page
+        """
+        offset = (max(page, 1) - 1) * page_size
+        events = list(self._events_before(ServiceEvent, tenant_id, service_id, start_time)[offset:offset + page_size + 1])
+        if len(events) <= page_size and self.has_archive():
+            if events or offset == 0:
+                archive_offset = 0
+            else:
+                archive_offset = offset - self._events_before(ServiceEvent, tenant_id, service_id, start_time).count()
+            archived = self._events_before(ServiceEventArchive, tenant_id, service_id, start_time)
+            events.extend(archived[archive_offset:archive_offset + page_size + 1 - len(events)])
+        return events[:page_size], len(events) > page_size
 
     def create_event(self, **event_info):
         return ServiceEvent.objects.create(**event_info)
 
     def delete_events(self, service_id):
-        ServiceEvent.objects.filter(service_id=service_id).delete()
+        for model in self._models():
+            model.objects.filter(service_id=service_id).delete()
 
     def delete_event_by_build_version(self, service_id, deploy_version):
-        ServiceEvent.objects.filter(deploy_version=deploy_version, service_id=service_id).delete()
+        for model in self._models():
+            model.objects.filter(deploy_version=deploy_version, service_id=service_id).delete()
 
     def get_specified_num_events(self, tenant_id, service_id, num=6):
         """查询指定条数的日志"""
-        return ServiceEvent.objects.filter(tenant_id=tenant_id, service_id=service_id).order_by("-ID")[:num]
+        events = []
+        for model in self._models():
+            if len(events) >= num:
+                break
+            events.extend(model.objects.filter(tenant_id=tenant_id, service_id=service_id).order_by("-ID")[:num - len(events)])
+        return events
 
     def get_specified_region_events(self, tenant_id, region):
         return ServiceEvent.objects.filter(tenant_id=tenant_id, region=region).order_by("-ID")
@@ -5,9 +5,10 @@
 import logging
 
 from datetime import datetime
-from django.db.models import Q
+from django.db.models import Case, DateTimeField, Q, Value, When
 
 from console.exception.bcode import ErrComponentGroupNotFound
+from console.utils.cache import cached, tag_cache
 from www.models.main import (ServiceGroup, ServiceGroupRelation, TenantServiceGroup)
 
 logger = logging.getLogger("default")
@@ -21,6 +22,7 @@ class GroupRepository(object):
     @staticmethod
     def update(app_id, **data):
         ServiceGroup.objects.filter(pk=app_id).update(**data)
+        tag_cache.invalidate("app")
 
     def list_tenant_group_on_region(self, tenant, region_name):
         return ServiceGroup.objects.filter(
@@ -38,9 +40,20 @@ class GroupRepository(object):
             create_time=datetime.now())
         return group
 
+    # the update time of apps is eventually consistent, writing it does not invalidate the cached apps
     def update_group_time(self, group_id):
         ServiceGroup.objects.filter(pk=group_id).update(update_time=datetime.now())
 
+    @staticmethod
+    def update_groups_time(update_times):
+        """
+        set the update time of many apps in one UPDATE
+        :param update_times: a dict of app id to update time
+        """
+        cases = [When(pk=group_id, then=Value(update_time)) for group_id, update_time in update_times.items()]
+        ServiceGroup.objects.filter(pk__in=list(update_times.keys())).update(
+            update_time=Case(*cases, output_field=DateTimeField()))
+
     def get_group_by_unique_key(self, tenant_id, region_name, group_name):
         groups = ServiceGroup.objects.filter(tenant_id=tenant_id, region_name=region_name, group_name=group_name)
         if groups:
@@ -48,6 +61,7 @@ class GroupRepository(object):
         return None
 
     # get_group_by_pk get group by group id and tenantid and region name
+    @cached(tags=("app", ))
     def get_group_by_pk(self, tenant_id, region_name, app_id):
         try:
             return ServiceGroup.objects.get(tenant_id=tenant_id, region_name=region_name, pk=app_id)
@@ -56,10 +70,12 @@ class GroupRepository(object):
 
     def update_group_name(self, group_id, new_group_name, group_note=""):
         ServiceGroup.objects.filter(pk=group_id).update(group_name=new_group_name, note=group_note, update_time=datetime.now())
+        tag_cache.invalidate("app")
 
     def update_governance_mode(self, tenant_id, region_name, app_id, governance_mode):
         ServiceGroup.objects.filter(pk=app_id).update(
             tenant_id=tenant_id, region_name=region_name, governance_mode=governance_mode, update_time=datetime.now())
+        tag_cache.invalidate("app")
 
     def delete_group_by_pk(self, group_id):
         logger.debug("delete group id {0}".format(group_id))
@@ -217,3 +233,5 @@ group_repo = GroupRepository()
 group_service_relation_repo = GroupServiceRelationRepository()
 # 应用实体
 tenant_service_group_repo = TenantServiceGroupRepository()
+
+tag_cache.bind(ServiceGroup, "app")
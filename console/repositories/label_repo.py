@@ -2,6 +2,7 @@
 """
   Created on 18/1/30.
 """
+from console.repositories.base import overwrite_by_keys
 from www.models.label import ServiceLabels, NodeLabels, Labels
 from www.utils.crypt import make_uuid
 import datetime
@@ -29,8 +30,7 @@ class ServiceLabelsReporsitory(object):
         ServiceLabels.objects.bulk_create(labels)
 
     def overwrite_by_component_ids(self, component_ids, labels: [ServiceLabels]):
-        ServiceLabels.objects.filter(service_id__in=component_ids).delete()
-        self.bulk_create(labels)
+        overwrite_by_keys(ServiceLabels.objects.filter(service_id__in=component_ids), labels, ("service_id", "label_id"))
 
 
 class NodeLabelsReporsitory(object):
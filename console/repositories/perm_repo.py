@@ -9,6 +9,7 @@ from console.models.main import PermsInfo
 from console.models.main import RoleInfo
 from console.models.main import RolePerms
 from console.models.main import UserRole
+from console.services.perm_cache import perm_cache
 from console.utils.perms import get_perms_metadata
 from www.models.main import PermRelTenant
 
@@ -28,6 +29,7 @@ class PermsRepo(object):
             for perm in all_perms_list:
                 perms_list.append(PermsInfo(name=perm[0], desc=perm[1], code=perm[2], group=perm[3], kind=perm[4]))
             PermsInfo.objects.bulk_create(perms_list)
+            perm_cache.invalidate()
 
     def get_all_perms(self):
         perms = PermsInfo.objects.all()
@@ -93,7 +95,9 @@ class RolePermRelationRepo(object):
             role_perm_list = []
             for perm_code in perm_codes:
                 role_perm_list.append(RolePerms(role_id=role_id, perm_code=perm_code))
-            return RolePerms.objects.bulk_create(role_perm_list)
+            role_perms = RolePerms.objects.bulk_create(role_perm_list)
+            perm_cache.invalidate()
+            return role_perms
         return []
 
     def delete_role_perm_relation(self, role_id):
@@ -177,6 +181,7 @@ class UserKindRoleRepo(object):
         for role_id in update_role_ids:
             update_role_list.append(UserRole(user_id=user.user_id, role_id=role_id))
         UserRole.objects.bulk_create(update_role_list)
+        perm_cache.invalidate()
 
     def delete_user_roles(self, kind, kind_id, user, role_ids=None):
         if not user:
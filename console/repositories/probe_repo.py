@@ -4,6 +4,7 @@
 """
 import logging
 
+from console.repositories.base import overwrite_by_keys
 from www.models.main import ServiceProbe
 
 logger = logging.getLogger("default")
@@ -54,8 +55,7 @@ class ServiceProbeRepository(object):
         ServiceProbe.objects.bulk_create(probes)
 
     def overwrite_by_component_ids(self, component_ids, probes):
-        ServiceProbe.objects.filter(service_id__in=component_ids).delete()
-        self.bulk_create(probes)
+        overwrite_by_keys(ServiceProbe.objects.filter(service_id__in=component_ids), probes, ("service_id", "mode"))
 
 
 probe_repo = ServiceProbeRepository()
@@ -3,6 +3,7 @@ from console.exception.main import RegionNotFound
 from console.models.main import RegionConfig
 from console.repositories.base import BaseConnection
 from console.repositories.team_repo import team_repo
+from console.utils.cache import cached, tag_cache
 from django.db.models import Q
 from www.models.main import TenantRegionInfo
 
@@ -51,6 +52,7 @@ class RegionRepo(object):
             return None
         return TenantRegionInfo.objects.filter(tenant_id=tenant.tenant_id)
 
+    @cached(tags=("region", ))
     def get_region_by_region_name(self, region_name):
         region_configs = RegionConfig.objects.filter(region_name=region_name)
         if region_configs:
@@ -202,3 +204,5 @@ class RegionRepo(object):
 
 
 region_repo = RegionRepo()
+
+tag_cache.bind(RegionConfig, "region")
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 import logging
 
-from console.repositories.base import BaseConnection
+from console.repositories.base import BaseConnection, overwrite_by_keys
 from console.services.service_services import base_service
 from www.models.main import ServiceEvent
 from www.models.main import TenantServiceInfo
@@ -82,9 +82,6 @@ class ServiceRepo(object):
             statuscn_cache[status["service_id"]] = status["status_cn"]
         result = []
         for service in group_services_list:
-            service_obj = TenantServiceInfo.objects.filter(service_id=service["service_id"]).first()
-            if service_obj:
-                service["service_source"] = service_obj.service_source
             service["status_cn"] = statuscn_cache.get(service["service_id"], "未知")
             status = status_cache.get(service["service_id"], "unknow")
 
@@ -153,8 +150,7 @@ class ServiceRepo(object):
 
     @staticmethod
     def bulk_update(components):
-        TenantServiceInfo.objects.filter(pk__in=[cpt.ID for cpt in components]).delete()
-        TenantServiceInfo.objects.bulk_create(components)
+        overwrite_by_keys(TenantServiceInfo.objects.filter(pk__in=[cpt.ID for cpt in components]), components, ("ID", ))
 
 
 service_repo = ServiceRepo()
@@ -5,6 +5,7 @@ from console.exception.exceptions import TenantNotExistError
 from console.exception.main import ServiceHandleException
 from console.models.main import RegionConfig, TeamGitlabInfo
 from console.repositories.base import BaseConnection
+from console.utils.cache import cached, tag_cache
 from django.db.models import Q
 from www.models.main import (PermRelTenant, TenantEnterprise, TenantRegionInfo, Tenants, Users)
 
@@ -16,6 +17,7 @@ class TeamRepo(object):
         perms = PermRelTenant.objects.filter(tenant_id=tenant_id, user_id=user_id)
         return perms
 
+    @cached(tags=("team", ))
     def get_tenant_by_tenant_name(self, tenant_name, exception=True):
         tenants = Tenants.objects.filter(tenant_name=tenant_name)
         if not tenants and exception:
@@ -207,7 +209,9 @@ class TeamRepo(object):
         return Tenants.objects.filter(enterprise_id=enterprise_id, tenant_name=team_name).first()
 
     def update_by_tenant_id(self, tenant_id, **data):
-        return Tenants.objects.filter(tenant_id=tenant_id).update(**data)
+        rows = Tenants.objects.filter(tenant_id=tenant_id).update(**data)
+        tag_cache.invalidate("team")
+        return rows
 
     def list_teams_v2(self, query="", page=None, page_size=None):
         where = "WHERE t.creater = u.user_id"
@@ -339,3 +343,5 @@ class TeamGitlabRepo(object):
 
 team_repo = TeamRepo()
 team_gitlab_repo = TeamGitlabRepo()
+
+tag_cache.bind(Tenants, "team")
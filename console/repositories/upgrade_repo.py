@@ -6,6 +6,7 @@ from django.db.models import Q
 
 from console.exception.bcode import ErrAppUpgradeRecordNotFound
 from console.models.main import (AppUpgradeRecord, ServiceUpgradeRecord, UpgradeStatus)
+from console.repositories.base import overwrite_by_keys
 
 
 class UpgradeRepo(object):
@@ -91,8 +92,7 @@ class ComponentUpgradeRecordRepository(object):
 
     @staticmethod
     def bulk_update(records):
-        ServiceUpgradeRecord.objects.filter(pk__in=[record.ID for record in records]).delete()
-        ServiceUpgradeRecord.objects.bulk_create(records)
+        overwrite_by_keys(ServiceUpgradeRecord.objects.filter(pk__in=[record.ID for record in records]), records, ("ID", ))
 
 
 upgrade_repo = UpgradeRepo()
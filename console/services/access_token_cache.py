@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+  process-local cache of the users of openapi access tokens.
+"""
+import copy
+import logging
+import os
+import time
+
+from console.models.main import UserAccessKey
+from console.utils.cache import LocalCache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from www.models.main import Users
+
+logger = logging.getLogger("default")
+
+
+class AccessTokenCache(object):
+    """
+    A LocalCache of access token to user, so that the openapi does not query the
+    database for every request of a client reusing its token.
+
+    An entry lives for the ttl, or until the token expires if that is earlier. Changes of
+    the access keys or of a user evict the tokens of the user once the transaction commits,
+    through model signals or, for update which sends no signal, by calling invalidate_user.
+    The ttl bounds how long other gunicorn workers can accept a regenerated token.
+    """
+
+    def __init__(self, ttl=None, max_size=None):
+        if ttl is None:
+            ttl = float(os.getenv("OPENAPI_TOKEN_CACHE_TTL", 60))
+        if max_size is None:
+            max_size = int(os.getenv("OPENAPI_TOKEN_CACHE_MAX_SIZE", 1024))
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = LocalCache(max_size)
+
+    def get_user(self, token, loader):
+        """
+        :param loader: called on miss, returns (user, expire_time) or (None, None) for an invalid token
+        :return: a copy of the user of the token, or None
+        """
+        user = self._entries.get(token)
+        if user is not None:
+            return copy.copy(user)
+        user, expire_time = loader(token)
+        # invalid tokens are not cached, or any client could evict the tokens in use
+        if not user or self.ttl <= 0:
+            return user
+        seconds = self.ttl
+        if expire_time:
+            seconds = min(seconds, expire_time - time.time())
+        self._entries.set(token, user, seconds)
+        return copy.copy(user)
+
+    def invalidate_user(self, user_id):
+        """evict the tokens of the user once the current transaction commits"""
+        transaction.on_commit(lambda: self._evict(user_id))
+
+    def _evict(self, user_id):
+        self._entries.delete_if(lambda user: str(user.user_id) == str(user_id))
+
+    def clear(self):
+        self._entries.clear()
+
+
+access_token_cache = AccessTokenCache()
+
+
+def _invalidate(sender, instance, **kwargs):
+    access_token_cache.invalidate_user(instance.user_id)
+
+
+for _sender in (UserAccessKey, Users):
+    post_save.connect(_invalidate, sender=_sender, dispatch_uid="access_token_cache_{}".format(_sender.__name__))
+    post_delete.connect(_invalidate, sender=_sender, dispatch_uid="access_token_cache_{}".format(_sender.__name__))
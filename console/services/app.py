@@ -35,6 +35,7 @@ from console.services.app_config import label_service
 from console.services.app_config.port_service import AppPortService
 from console.services.app_config.probe_service import ProbeService
 from console.services.app_config.service_monitor import service_monitor_repo
+from console.services.component_status_cache import component_status_cache
 from console.utils.oauth.oauth_types import support_oauth_type
 from console.utils.validation import validate_endpoints_info
 from www.apiclient.regionapi import RegionInvokeApi
@@ -496,9 +497,8 @@ class AppService(object):
         """获取组件状态"""
         start_time = ""
         try:
-            body = region_api.check_service_status(service.service_region, tenant.tenant_name, service.service_alias,
-                                                   tenant.enterprise_id)
-            bean = body["bean"]
+            bean = component_status_cache.get_status(service.service_region, tenant.tenant_name, service.service_id,
+                                                     service.service_alias, tenant.enterprise_id)
             status = bean["cur_status"]
             start_time = bean["start_time"]
         except Exception as e:
@@ -12,7 +12,6 @@ from console.repositories.event_repo import event_repo
 from console.repositories.region_repo import region_repo
 from console.services.plugin.app_plugin import AppPluginService
 from console.utils.timeutil import str_to_time, time_to_str
-from goodrain_web.tools import JuncheePaginator
 from www.apiclient.regionapi import RegionInvokeApi
 from www.utils.crypt import make_uuid
 
@@ -158,13 +157,8 @@ class AppEventService(object):
             start_time = str_to_time(start_time_str, fmt="%Y-%m-%d %H:%M")
             start_time_str = time_to_str(start_time + datetime.timedelta(minutes=1))
 
-        events = event_repo.get_events_before_specify_time(tenant.tenant_id, service.service_id, start_time_str)
-        event_paginator = JuncheePaginator(events, int(page_size))
-        total = event_paginator.count
-        page_events = event_paginator.page(page)
-        has_next = True
-        if page_size * page >= total:
-            has_next = False
+        page_events, has_next = event_repo.list_events_before_specify_time(tenant.tenant_id, service.service_id, start_time_str,
+                                                                           page, page_size)
         self.__sync_region_service_event_status(service.service_region, tenant.tenant_name, page_events)
 
         re_events = []
@@ -264,7 +258,7 @@ class AppEventService(object):
         total = 0
         res, rt_data = region_api.get_target_events_list(region, tenant.tenant_name, target, target_id, page, page_size)
         if int(res.status) == 200:
-            msg_list = rt_data.get("list", [])
+            msg_list = rt_data.get("list") or []
             total = rt_data.get("number", 0)
             has_next = True
             if page_size * page >= total:
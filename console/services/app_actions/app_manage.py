@@ -37,6 +37,7 @@ from console.services.app_config import (AppEnvVarService, AppMntService, AppPor
                                          AppVolumeService)
 from console.services.app_config.component_graph import component_graph_service
 from console.services.app_config.service_monitor import service_monitor_repo
+from console.services.component_status_cache import component_status_cache
 from console.services.exception import ErrChangeServiceType
 from console.services.group_service import group_service
 from console.services.service_services import base_service
@@ -161,6 +162,7 @@ class AppManageService(AppManageBase):
             body["enterprise_id"] = tenant.enterprise_id
             try:
                 region_api.start_service(service.service_region, tenant.tenant_name, service.service_alias, body)
+                component_status_cache.invalidate(service.service_region, [service.service_id])
                 logger.debug("user {0} start app !".format(user.nick_name))
             except region_api.CallApiError as e:
                 logger.exception(e)
@@ -177,6 +179,7 @@ class AppManageService(AppManageBase):
             body["enterprise_id"] = tenant.enterprise_id
             try:
                 region_api.stop_service(service.service_region, tenant.tenant_name, service.service_alias, body)
+                component_status_cache.invalidate(service.service_region, [service.service_id])
                 logger.debug("user {0} stop app !".format(user.nick_name))
             except region_api.CallApiError as e:
                 logger.exception(e)
@@ -196,6 +199,7 @@ class AppManageService(AppManageBase):
             body["enterprise_id"] = tenant.enterprise_id
             try:
                 region_api.restart_service(service.service_region, tenant.tenant_name, service.service_alias, body)
+                component_status_cache.invalidate(service.service_region, [service.service_id])
                 logger.debug("user {0} retart app !".format(user.nick_name))
             except region_api.CallApiError as e:
                 logger.exception(e)
@@ -286,6 +290,7 @@ class AppManageService(AppManageBase):
             logger.warning("service_source is not exist for service {0}".format(service.service_id))
         try:
             re = region_api.build_service(service.service_region, tenant.tenant_name, service.service_alias, body)
+            component_status_cache.invalidate(service.service_region, [service.service_id])
             if re and re.get("bean") and re.get("bean").get("status") != "success":
                 return 507, "构建异常", ""
             event_id = re["bean"].get("event_id", "")
@@ -437,6 +442,7 @@ class AppManageService(AppManageBase):
         body["operator"] = str(user.nick_name)
         try:
             body = region_api.upgrade_service(service.service_region, tenant.tenant_name, service.service_alias, body)
+            component_status_cache.invalidate(service.service_region, [service.service_id])
             event_id = body["bean"].get("event_id", "")
             return 200, "操作成功", event_id
         except region_api.CallApiError as e:
@@ -486,6 +492,7 @@ class AppManageService(AppManageBase):
             body["enterprise_id"] = tenant.enterprise_id
             try:
                 region_api.rollback(service.service_region, tenant.tenant_name, service.service_alias, body)
+                component_status_cache.invalidate(service.service_region, [service.service_id])
             except region_api.CallApiError as e:
                 logger.exception(e)
                 return 507, "组件异常"
@@ -548,6 +555,7 @@ class AppManageService(AppManageBase):
         # 获取数据中心信息
         try:
             _, body = region_api.batch_operation_service(region_name, tenant.tenant_name, data)
+            component_status_cache.invalidate(region_name, [service.service_id for service in services])
             events = body["bean"]["batch_result"]
             return events
         except region_api.CallApiError as e:
@@ -778,6 +786,7 @@ class AppManageService(AppManageBase):
             body["enterprise_id"] = tenant.enterprise_id
             try:
                 region_api.vertical_upgrade(service.service_region, tenant.tenant_name, service.service_alias, body)
+                component_status_cache.invalidate(service.service_region, [service.service_id])
                 service.min_cpu = new_cpu
                 service.min_memory = new_memory
                 service.container_gpu = new_gpu
@@ -811,6 +820,7 @@ class AppManageService(AppManageBase):
             body["enterprise_id"] = tenant.enterprise_id
             try:
                 region_api.horizontal_upgrade(service.service_region, tenant.tenant_name, service.service_alias, body)
+                component_status_cache.invalidate(service.service_region, [service.service_id])
                 service.min_node = new_node
                 service.save()
             except ServiceHandleException as e:
@@ -1,8 +1,18 @@
 # -*- coding: utf8 -*-
+import logging
+import os
+import queue
+import threading
+import time
+from functools import partial
+
 from www.apiclient.regionapi import RegionInvokeApi
 
+logger = logging.getLogger("default")
 region_api = RegionInvokeApi()
 
+_EOF = object()
+
 
 class ComponentLogService(object):
     @staticmethod
@@ -11,5 +21,145 @@ class ComponentLogService(object):
         for chunk in r.stream(1024):
             yield chunk
 
+    @staticmethod
+    def list_log_targets(tenant_name, region_name, service, enterprise_id, container_name=None):
+        """
+        (pod_name, container_name) of all pods of the component.
+        without container_name, the main container is used if it can be told apart, else all containers.
+        """
+        body = region_api.get_service_pods(region_name, tenant_name, service.service_alias, enterprise_id)
+        bean = body.get("bean") or {}
+        targets = []
+        for pod in (bean.get("new_pods") or []) + (bean.get("old_pods") or []):
+            containers = [name for name in (pod.get("container") or {}) if name != "POD"]
+            if container_name:
+                containers = [name for name in containers if name == container_name]
+            else:
+                main = [name for name in containers if name in (service.service_id, service.service_alias)]
+                containers = main or sorted(containers)
+            targets.extend((pod["pod_name"], name) for name in containers)
+        return targets
+
+    @staticmethod
+    def get_component_logs_stream(tenant_name, region_name, service_alias, targets, follow):
+        """
+        merge the logs of multiple (pod_name, container_name) into one stream, every line is prefixed
+        with its pod, and with its container if a pod has more than one.
+        """
+        return _LogFanIn(tenant_name, region_name, service_alias, targets, follow).stream()
+
+
+class _LogFanIn(object):
+    """
+    One reader per container copies complete lines into a bounded queue, the response
+    generator drains it into batches flushed by size or by age.
+
+    The queue is the backpressure: when the client reads slowly, readers block on it and
+    stop reading from the region, so the memory of a request is bounded by queue_size reads.
+    """
+
+    read_size = 8 * 1024
+    max_line_size = 64 * 1024
+
+    def __init__(self, tenant_name, region_name, service_alias, targets, follow):
+        self.tenant_name = tenant_name
+        self.region_name = region_name
+        self.service_alias = service_alias
+        self.follow = follow
+        max_streams = int(os.getenv("COMPONENT_LOG_MAX_STREAMS", 20))
+        self.targets = targets[:max_streams]
+        self.skipped = targets[max_streams:]
+        self.batch_bytes = int(os.getenv("COMPONENT_LOG_BATCH_BYTES", 32 * 1024))
+        self.batch_interval = float(os.getenv("COMPONENT_LOG_BATCH_INTERVAL", 0.2))
+        self.queue = queue.Queue(maxsize=int(os.getenv("COMPONENT_LOG_QUEUE_SIZE", 64)))
+        self.stopped = threading.Event()
+        self.responses = []
+        pods = [pod_name for pod_name, _ in self.targets]
+        self.prefixes = {}
+        for pod_name, container_name in self.targets:
+            name = pod_name if pods.count(pod_name) == 1 else "{}/{}".format(pod_name, container_name)
+            self.prefixes[(pod_name, container_name)] = "[{}] ".format(name).encode("utf-8")
+
+    def stream(self):
+        calls = {
+            target: partial(region_api.get_component_log, self.tenant_name, self.region_name, self.service_alias, target[0],
+                            target[1], self.follow)
+            for target in self.targets
+        }
+        results = region_api.fan_out(calls) if calls else {}
+        batch = []
+        readers = 0
+        for target in self.targets:
+            result = results[target]
+            if result.error is not None:
+                batch.append(self.prefixes[target] + "open log failure: {}\n".format(result.error).encode("utf-8"))
+                continue
+            self.responses.append(result.value)
+            threading.Thread(target=self._read, args=(target, result.value), daemon=True).start()
+            readers += 1
+        if self.skipped:
+            batch.append("[console] logs of {} more containers are not shown\n".format(len(self.skipped)).encode("utf-8"))
+        try:
+            for chunk in self._merge(batch, readers):
+                yield chunk
+        finally:
+            # the client disconnected or all logs are read
+            self.stopped.set()
+            for response in self.responses:
+                response.close()
+                response.release_conn()
+
+    def _merge(self, batch, readers):
+        size = sum(len(item) for item in batch)
+        deadline = time.time()
+        while readers:
+            try:
+                item = self.queue.get(timeout=max(deadline - time.time(), 0) if batch else None)
+            except queue.Empty:
+                item = None
+            if item is _EOF:
+                readers -= 1
+            elif item:
+                if not batch:
+                    deadline = time.time() + self.batch_interval
+                batch.append(item)
+                size += len(item)
+            # a busy stream is flushed by size, a quiet one by age
+            if batch and (size >= self.batch_bytes or time.time() >= deadline):
+                yield b"".join(batch)
+                batch, size = [], 0
+        if batch:
+            yield b"".join(batch)
+
+    def _put(self, item):
+        while not self.stopped.is_set():
+            try:
+                self.queue.put(item, timeout=1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _read(self, target, response):
+        prefix = self.prefixes[target]
+        rest = b""
+        try:
+            for chunk in response.stream(self.read_size):
+                lines = (rest + chunk).split(b"\n")
+                rest = lines.pop()
+                if len(rest) > self.max_line_size:
+                    lines.append(rest)
+                    rest = b""
+                if lines and not self._put(b"".join(prefix + line + b"\n" for line in lines)):
+                    return
+            if rest:
+                self._put(prefix + rest + b"\n")
+        except Exception as e:
+            if not self.stopped.is_set():
+                logger.warning("read log of {} interrupted: {}".format(target, e))
+                self._put(prefix + "log interrupted: {}\n".format(e).encode("utf-8"))
+        finally:
+            self._put(_EOF)
+
 
 component_log_service = ComponentLogService()
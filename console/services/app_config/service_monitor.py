@@ -7,6 +7,7 @@ from django.db.models import Q
 from console.exception.main import ServiceHandleException
 from console.exception.bcode import ErrServiceMonitorExists, ErrRepeatMonitoringTarget
 from console.models.main import ServiceMonitor
+from console.repositories.base import overwrite_by_keys
 from console.services.app_config.port_service import AppPortService
 from www.apiclient.regionapi import RegionInvokeApi
 from www.utils.crypt import make_uuid
@@ -112,8 +113,7 @@ class ComponentServiceMonitor(object):
         ServiceMonitor.objects.bulk_create(monitors)
 
     def overwrite_by_component_ids(self, component_ids, monitors):
-        ServiceMonitor.objects.filter(service_id__in=component_ids).delete()
-        self.bulk_create(monitors)
+        overwrite_by_keys(ServiceMonitor.objects.filter(service_id__in=component_ids), monitors, ("service_id", "name"))
 
 
 service_monitor_repo = ComponentServiceMonitor()
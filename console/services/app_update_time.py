@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+  write-behind of the update time of apps.
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+
+from console.repositories.group import group_repo
+from django.db import connection
+
+logger = logging.getLogger("default")
+
+
+class AppUpdateTimeCoalescer(object):
+    """
+    Every change of an app or its components touches the update time of the app, which
+    the app lists are sorted by. Touches are recorded in process and written by a
+    background thread in one UPDATE per interval, so a burst of changes of an app is
+    one write of the row instead of one write per request.
+
+    The app lists see the new update time after at most the interval. With an interval
+    of 0, every touch is written at once.
+    """
+
+    def __init__(self, interval=None):
+        if interval is None:
+            interval = float(os.getenv("APP_UPDATE_TIME_INTERVAL", 5))
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._flusher = None
+        self._pid = None
+
+    def touch(self, app_id):
+        if not app_id:
+            return
+        if self.interval <= 0:
+            group_repo.update_groups_time({app_id: datetime.now()})
+            return
+        with self._lock:
+            self._pending[app_id] = datetime.now()
+            self._start_flusher()
+
+    def _start_flusher(self):
+        # a forked gunicorn worker does not inherit the thread of its parent
+        if self._flusher is not None and self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        self._flusher = threading.Thread(target=self._run, name="app-update-time", daemon=True)
+        self._flusher.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            self.flush()
+
+    def flush(self):
+        """write the pending touches, return the number of apps written"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+        try:
+            group_repo.update_groups_time(pending)
+        except Exception as e:
+            logger.exception(e)
+            with self._lock:
+                for app_id, update_time in pending.items():
+                    if app_id not in self._pending:
+                        self._pending[app_id] = update_time
+            return 0
+        finally:
+            if threading.current_thread() is self._flusher:
+                connection.close()
+        return len(pending)
+
+
+app_update_time = AppUpdateTimeCoalescer()
+atexit.register(app_update_time.flush)
@@ -56,7 +56,7 @@ class GroupAppBackupService(object):
             "service_ids": service_ids,
             "enterprise_id": tenant.enterprise_id
         })
-        status_list = body["list"]
+        status_list = body.get("list") or []
         service_status_map = {status_map["service_id"]: status_map["status"] for status_map in status_list}
         # 处于运行中的有状态
         running_state_services = []
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+  short-lived cache of component status, shared by list, topology and overview endpoints.
+"""
+import json
+import logging
+import os
+
+from console.utils.cache import Cache
+from www.apiclient.regionapi import RegionInvokeApi
+
+logger = logging.getLogger("default")
+region_api = RegionInvokeApi()
+
+
+class ComponentStatusCache(object):
+    """
+    Cache the component status queried from the region by (region, service_id) for a few seconds.
+
+    Batch lookups read all keys at once and only ask the region for the components that
+    missed. With REDIS_HOST, the entries are shared by all workers through the two-tier
+    console cache. Operations which change the status of components (start, stop, deploy...)
+    must call invalidate.
+    """
+
+    def __init__(self, ttl=None, max_size=None):
+        if ttl is None:
+            ttl = float(os.getenv("COMPONENT_STATUS_CACHE_TTL", 3))
+        if max_size is None:
+            max_size = int(os.getenv("COMPONENT_STATUS_CACHE_MAX_SIZE", 20000))
+        self.ttl = ttl
+        self.max_size = max_size
+        self._store = Cache(max_size)
+
+    @staticmethod
+    def _key(kind, region, service_id):
+        return "component_status:{}:{}:{}".format(kind, region, service_id)
+
+    def _get_many(self, kind, region, service_ids):
+        """a dict of service_id to the cached value, for the service_ids found"""
+        keys = {self._key(kind, region, service_id): service_id for service_id in service_ids}
+        return {keys[key]: json.loads(value) for key, value in self._store.get_many(list(keys.keys())).items()}
+
+    def _set_many(self, kind, region, values):
+        if self.ttl <= 0:
+            return
+        self._store.set_many({self._key(kind, region, service_id): json.dumps(value)
+                              for service_id, value in values.items()}, self.ttl)
+
+    def list_status(self, region, tenant_name, service_ids, enterprise_id, use_cache=True):
+        """
+        status of multiple components, the same data as region_api.service_status.
+        use_cache=False always asks the region, e.g. for the checks before a delete, and refreshes the cache.
+        """
+        statuses = self._get_many("status", region, service_ids) if use_cache else {}
+        missed = [service_id for service_id in service_ids if service_id not in statuses]
+        if missed:
+            body = region_api.service_status(region, tenant_name, {"service_ids": missed, "enterprise_id": enterprise_id})
+            fetched = {status["service_id"]: dict(status) for status in (body.get("list") or [])}
+            # components unknown to the region are cached as None as well
+            fetched = {service_id: fetched.get(service_id) for service_id in missed}
+            self._set_many("status", region, fetched)
+            statuses.update(fetched)
+        return [dict(statuses[service_id]) for service_id in service_ids if statuses.get(service_id) is not None]
+
+    def get_status(self, region, tenant_name, service_id, service_alias, enterprise_id):
+        """status of a single component, the same data as the bean of region_api.check_service_status"""
+        bean = self._get_many("detail", region, [service_id]).get(service_id)
+        if bean is None:
+            body = region_api.check_service_status(region, tenant_name, service_alias, enterprise_id)
+            bean = dict(body["bean"])
+            self._set_many("detail", region, {service_id: bean})
+        return dict(bean)
+
+    def list_pods(self, region, tenant_name, service_ids):
+        """pods of multiple components, the same data as region_api.get_dynamic_services_pods"""
+        pods = self._get_many("pods", region, service_ids)
+        missed = [service_id for service_id in service_ids if service_id not in pods]
+        if missed:
+            body = region_api.get_dynamic_services_pods(region, tenant_name, missed)
+            fetched = {service_id: [] for service_id in missed}
+            for pod in (body.get("list") or []):
+                if pod.get("service_id") in fetched:
+                    fetched[pod["service_id"]].append(dict(pod))
+            self._set_many("pods", region, fetched)
+            pods.update(fetched)
+        return [dict(pod) for service_id in service_ids for pod in pods.get(service_id, [])]
+
+    def invalidate(self, region, service_ids):
+        self._store.delete_many(
+            [self._key(kind, region, service_id) for service_id in service_ids for kind in ("status", "detail", "pods")])
+
+    def clear(self):
+        """drop the entries of this worker"""
+        self._store.local.clear()
+
+
+component_status_cache = ComponentStatusCache()
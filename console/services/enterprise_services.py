@@ -5,8 +5,8 @@ import random
 import re
 import string
 import json
+from functools import partial
 
-from console.exception.main import ServiceHandleException
 from console.exception.bcode import ErrUserNotFound, ErrTenantNotFound
 from console.services.perm_services import user_kind_role_service
 from console.repositories.enterprise_repo import enterprise_repo
@@ -232,10 +232,12 @@ class EnterpriseServices(object):
     # def get_services_status_by_service_ids(self, region_name, enterprise_id, service_ids):
     def get_enterprise_runing_service(self, enterprise_id, regions):
         cache_key = "{}+enterprise_running_service".format(enterprise_id)
-        cache_data = cache.get(cache_key)
-        if cache_data:
-            return json.loads(cache_data)
+        cache_data = cache.get_or_compute(
+            cache_key, lambda: json.dumps(self._get_enterprise_runing_service(enterprise_id, regions)), 30)
+        return json.loads(cache_data)
 
+    @staticmethod
+    def _get_enterprise_runing_service(enterprise_id, regions):
         app_total_num = 0
         app_running_num = 0
         component_total_num = 0
@@ -269,12 +271,17 @@ class EnterpriseServices(object):
         # 3. get all running component
         # attention, component maybe belong to any other enterprise
         running_component_ids = []
-        for region in regions:
-            data = None
-            try:
-                data = region_api.get_enterprise_running_services(enterprise_id, region.region_name, test=True)
-            except (region_api.CallApiError, ServiceHandleException) as e:
-                logger.exception("get region:'{0}' running failed: {1}".format(region.region_name, e))
+        calls = {
+            region.region_name: partial(
+                region_api.get_enterprise_running_services, enterprise_id, region.region_name, test=True)
+            for region in regions
+        }
+        results = region_api.fan_out(calls)
+        for region_name, result in results.items():
+            if result.error:
+                logger.warning("get region:'{0}' running failed: {1}".format(region_name, result.error))
+                continue
+            data = result.value
             if data and data.get("service_ids"):
                 running_component_ids.extend(data.get("service_ids"))
 
@@ -304,7 +311,6 @@ class EnterpriseServices(object):
                 "closed": component_total_num - component_running_num
             }
         }
-        cache.set(cache_key, json.dumps(data), 30)
         return data
 
     @staticmethod
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+  archival of completed service events.
+"""
+import datetime
+import logging
+import os
+import threading
+import time
+
+from console.repositories.event_repo import event_repo
+from django.db import connection, transaction
+from www.models.main import ServiceEvent, ServiceEventArchive
+
+logger = logging.getLogger("default")
+
+
+class EventArchiver(object):
+    """
+    Move the completed service events older than retention_days from service_event to
+    service_event_archive, batch_size events per transaction, so that service_event only
+    holds the recent events and its indexes stay small. The events keep their ID, and
+    the readers of the event history fall back to the archive, see event_repo.
+
+    start runs archive every interval seconds in a background thread; with several
+    workers on MySQL, a named lock lets only one of them archive at a time.
+    """
+    lock_name = "console_service_event_archive"
+
+    def __init__(self, retention_days=None, batch_size=None, interval=None):
+        if retention_days is None:
+            retention_days = int(os.getenv("EVENT_RETENTION_DAYS", 30))
+        if batch_size is None:
+            batch_size = int(os.getenv("EVENT_ARCHIVE_BATCH_SIZE", 1000))
+        if interval is None:
+            interval = float(os.getenv("EVENT_ARCHIVE_INTERVAL", 3600))
+        self.retention_days = retention_days
+        self.batch_size = batch_size
+        self.interval = interval
+        self._archiver = None
+        self._pid = None
+
+    def archive(self, max_batches=None):
+        """archive the events past the retention, return the number of events moved"""
+        if not event_repo.has_archive():
+            logger.warning("table service_event_archive does not exist, service events are not archived")
+            return 0
+        before = datetime.datetime.now() - datetime.timedelta(days=self.retention_days)
+        moved = 0
+        batches = 0
+        after = 0
+        while max_batches is None or batches < max_batches:
+            count, after = self._archive_batch(before, after)
+            moved += count
+            batches += 1
+            if count < self.batch_size:
+                break
+        return moved
+
+    def _archive_batch(self, before, after):
+        """move the next batch of events with an ID above after, return their number and the last ID"""
+        with transaction.atomic():
+            # the oldest events come first in ID order, no index on start_time is needed; the
+            # scan goes on after the last event moved, the events still running are not read again
+            events = ServiceEvent.objects.filter(ID__gt=after, start_time__lt=before).exclude(final_status="")
+            events = list(events.order_by("ID")[:self.batch_size])
+            if not events:
+                return 0, after
+            fields = [field.attname for field in ServiceEvent._meta.concrete_fields]
+            archived = [ServiceEventArchive(**{name: getattr(event, name) for name in fields}) for event in events]
+            ServiceEventArchive.objects.bulk_create(archived)
+            ServiceEvent.objects.filter(pk__in=[event.pk for event in events]).delete()
+        return len(events), events[-1].pk
+
+    def start(self):
+        """archive periodically in this process, an interval of 0 disables it"""
+        # a forked gunicorn worker does not inherit the thread of its parent
+        if self.interval <= 0 or (self._archiver is not None and self._pid == os.getpid()):
+            return
+        self._pid = os.getpid()
+        self._archiver = threading.Thread(target=self._run, name="service-event-archive", daemon=True)
+        self._archiver.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                if self._acquire():
+                    try:
+                        moved = self.archive()
+                        if moved:
+                            logger.info("archived {} service events".format(moved))
+                    finally:
+                        self._release()
+            except Exception as e:
+                logger.exception(e)
+            finally:
+                connection.close()
+
+    def _acquire(self):
+        if connection.vendor != "mysql":
+            return True
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT GET_LOCK(%s, 0)", [self.lock_name])
+            return cursor.fetchone()[0] == 1
+
+    def _release(self):
+        if connection.vendor != "mysql":
+            return
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT RELEASE_LOCK(%s)", [self.lock_name])
+
+
+event_archiver = EventArchiver()
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 import datetime
 import logging
+import os
 
 from django.db.models import Q
 
@@ -8,13 +9,15 @@ from console.repositories.app import service_repo
 from console.repositories.event_repo import event_repo
 from console.repositories.team_repo import team_repo
 from console.services.app_actions.app_log import AppEventService
-from goodrain_web.tools import JuncheePaginator
+from console.utils.cache import cache
 from www.apiclient.regionapi import RegionInvokeApi
 from www.db.base import BaseConnection
 from www.models.main import ServiceEvent
 
 logger = logging.getLogger("default")
 region_api = RegionInvokeApi()
+# the event feed is not counted again for this many seconds, the count grows with the table
+EVENT_COUNT_CACHE_TTL = int(os.getenv("EVENT_COUNT_CACHE_TTL", 60))
 e_s = AppEventService()
 
 
@@ -83,8 +86,13 @@ class ServiceEventDynamic(object):
 
         return event_list
 
-    def get_services_events(self, page, page_size, create_time, status, team):
-
+    def get_services_events(self, page, page_size, create_time, status, team, cursor=None):
+        """
+        :param cursor: the ID of the last event of the previous page, the next page is then
+            sought by ID instead of skipping (page - 1) * page_size events
+        :return: the events of the page, the number of events, counted at most once per
+            EVENT_COUNT_CACHE_TTL seconds, and the cursor of the next page or None
+        """
         query = Q()
         status = "success" if status == "complete" else status
         if team:
@@ -94,11 +102,21 @@ class ServiceEventDynamic(object):
         if status:
             query &= Q(status=status)
 
-        events = ServiceEvent.objects.filter(query).order_by("-ID")
-        logger.debug(events.query)
-        total = events.count()
-        paginator = JuncheePaginator(events, int(page_size))
-        show_events = paginator.page(int(page))
+        events = ServiceEvent.objects.filter(query)
+        count_key = "service_events_total:{}:{}:{}".format(team.tenant_id if team else "", create_time or "", status or "")
+        total = int(cache.get_or_compute(count_key, events.count, EVENT_COUNT_CACHE_TTL))
+
+        page_size = int(page_size)
+        if cursor:
+            events = events.filter(ID__lt=int(cursor)).order_by("-ID")[:page_size + 1]
+        else:
+            offset = (max(int(page), 1) - 1) * page_size
+            events = events.order_by("-ID")[offset:offset + page_size + 1]
+        show_events = list(events)
+        next_cursor = None
+        if len(show_events) > page_size:
+            show_events = show_events[:page_size]
+            next_cursor = show_events[-1].ID
         service_ids = list(set([e.service_id for e in show_events]))
         team_ids = list(set([e.tenant_id for e in show_events]))
         teams = team_repo.get_team_by_team_ids(team_ids)
@@ -133,7 +151,7 @@ class ServiceEventDynamic(object):
                 # 同步数据中心信息
                 self.__sync_events(region, events)
 
-        return show_events, total
+        return show_events, total, next_cursor
 
     def __sync_events(self, region, events, timeout=False):
         local_events_not_complete = {event.event_id: event for event in events}
@@ -142,7 +160,7 @@ class ServiceEventDynamic(object):
         except Exception as e:
             logger.exception(e)
             return
-        region_events = body.get('list')
+        region_events = body.get('list') or []
         for region_event in region_events:
             local_event = local_events_not_complete.get(region_event.get('EventID'))
             if not local_event:
@@ -178,7 +196,7 @@ class ServiceEventDynamic(object):
             logger.exception(e)
             return
 
-        region_events = body.get('list')
+        region_events = body.get('list') or []
         for region_event in region_events:
             local_event = local_events_not_complete.get(region_event.get('EventID'))
             if not local_event:
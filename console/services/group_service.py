@@ -23,6 +23,7 @@ from console.repositories.share_repo import share_repo
 from console.repositories.upgrade_repo import upgrade_repo
 from console.repositories.user_repo import user_repo
 from console.repositories.migration_repo import migrate_repo
+from console.services.app_update_time import app_update_time
 from console.services.app_config_group import app_config_group_service
 from console.services.service_services import base_service
 from console.utils.shortcuts import get_object_or_404
@@ -452,7 +453,7 @@ class GroupService(object):
             app_id_rels[region_app.app_id] = region_app.region_app_id
         # Get the status of cluster application
         resp = region_api.list_app_statuses_by_app_ids(tenant_name, region_name, {"app_ids": region_app_ids})
-        app_statuses = resp.get("list", [])
+        app_statuses = resp.get("list") or []
         # The relationship between cluster application ID and state
         # is transformed into that between console application ID and state
         # Returns the relationship between console application ID and status
@@ -589,7 +590,7 @@ class GroupService(object):
     def set_app_update_time_by_service(self, service):
         sg = self.get_service_group_info(service.service_id)
         if sg and sg.ID:
-            group_repo.update_group_time(sg.ID)
+            app_update_time.touch(sg.ID)
 
     @transaction.atomic
     def update_governance_mode(self, tenant, region_name, app_id, governance_mode):
@@ -175,7 +175,7 @@ class GroupappsMigrateService(object):
             "service_ids": service_ids,
             "enterprise_id": tenant.enterprise_id
         })
-        status_list = body["list"]
+        status_list = body.get("list") or []
         for status in status_list:
             if status["status"] not in ("closed", "undeploy"):
                 return False
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""
+  identity of the user of a console request, resolved once per request.
+"""
+import copy
+import logging
+import os
+
+from console.enum.enterprise_enum import EnterpriseRolesEnum
+from console.models.main import (EnterpriseUserPerm, PermsInfo, RoleInfo, RolePerms, UserRole)
+from console.repositories.group import group_repo
+from console.services.perm_cache import perm_cache
+from console.utils import perms
+from console.utils.cache import LocalCache
+from console.utils.perm_mask import PermissionMask
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from www.apiclient.regioncache import region_cache
+from www.models.main import TenantEnterprise, Tenants
+
+logger = logging.getLogger("default")
+
+
+class EnterpriseSnapshots(object):
+    """
+    Process-local LRU of the enterprises, every caller gets its own copy.
+
+    Changes of an enterprise bump the version once the transaction commits, through
+    model signals or, for update which sends no signal, by calling invalidate. The ttl
+    bounds how long other gunicorn workers can serve a stale enterprise.
+    """
+
+    def __init__(self, ttl=None, max_size=None):
+        if ttl is None:
+            ttl = float(os.getenv("ENTERPRISE_CACHE_TTL", 30))
+        if max_size is None:
+            max_size = int(os.getenv("ENTERPRISE_CACHE_MAX_SIZE", 10000))
+        self.ttl = ttl
+        self.max_size = max_size
+        self.version = 0
+        self._entries = LocalCache(max_size)
+
+    def get(self, enterprise_id):
+        """return a copy of the TenantEnterprise of enterprise_id, or None if not exists"""
+        version = self.version
+        entry = self._entries.get(enterprise_id)
+        if entry is not None and entry[0] == version:
+            enterprise = entry[1]
+        else:
+            enterprise = TenantEnterprise.objects.filter(enterprise_id=enterprise_id).first()
+            if enterprise and self.ttl > 0:
+                self._entries.set(enterprise_id, (version, enterprise), self.ttl)
+        return copy.copy(enterprise)
+
+    def invalidate(self):
+        transaction.on_commit(self._bump)
+
+    def _bump(self):
+        self.version += 1
+
+    def clear(self):
+        self._bump()
+        self._entries.clear()
+
+
+enterprise_snapshots = EnterpriseSnapshots()
+
+
+def _load_enterprise_perms(enterprise_id, user_id):
+    perm = EnterpriseUserPerm.objects.filter(enterprise_id=enterprise_id, user_id=user_id).first()
+    if not perm:
+        return False, PermissionMask()
+    is_enterprise_admin = EnterpriseRolesEnum.admin.name in perm.identity
+    return is_enterprise_admin, PermissionMask(perms.list_enterprise_perm_codes_by_roles(perm.identity.split(",")))
+
+
+def _load_team_perms(user, tenant, is_team_owner):
+    # the identity in the enterprise of the user and in the enterprise of the team, mostly the same row
+    enterprise_perms = {
+        perm.enterprise_id: perm
+        for perm in EnterpriseUserPerm.objects.filter(
+            enterprise_id__in={user.enterprise_id, tenant.enterprise_id}, user_id=user.user_id)
+    }
+    is_enterprise_admin = tenant.enterprise_id in enterprise_perms
+    user_perm = enterprise_perms.get(user.enterprise_id)
+    admin_roles = user_perm.identity.split(",") if user_perm else []
+    user_perms = list(perms.list_enterprise_perm_codes_by_roles(admin_roles))
+    if is_team_owner:
+        user_perms.extend(PermsInfo.objects.filter(kind="team").values_list("code", flat=True))
+        user_perms.append(200000)
+    else:
+        role_ids = RoleInfo.objects.filter(kind="team", kind_id=tenant.tenant_id).values_list("ID", flat=True)
+        user_role_ids = UserRole.objects.filter(user_id=user.user_id, role_id__in=role_ids).values_list("role_id", flat=True)
+        user_perms.extend(RolePerms.objects.filter(role_id__in=user_role_ids).values_list("perm_code", flat=True))
+    return is_enterprise_admin, PermissionMask(user_perms)
+
+
+class IdentityContext(object):
+    """
+    Who makes a console request and where: the user, the enterprise, the team, the
+    region and the app of the request, and the permissions of the user there.
+
+    The view base classes resolve it once per request and attach it to the request. The
+    team is read from the database, the enterprise, the region and the permissions come
+    from the process caches.
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self.enterprise = None
+        self.tenant = None
+        self.region = None
+        self.app = None
+        self.is_team_owner = False
+        self.is_enterprise_admin = False
+        self.perm_mask = PermissionMask()
+
+    @classmethod
+    def of(cls, request):
+        """the context attached to the request, created for request.user on first access"""
+        http_request = getattr(request, "_request", request)
+        context = getattr(http_request, "identity", None)
+        if context is None or context.user is not request.user:
+            context = cls(request.user)
+            http_request.identity = context
+        return context
+
+    def load_enterprise_perms(self):
+        """the enterprise of the user and the permissions of the user in it"""
+        self.enterprise = enterprise_snapshots.get(self.user.enterprise_id)
+        self.is_enterprise_admin, self.perm_mask = perm_cache.get_enterprise_perms(
+            self.user.enterprise_id,
+            self.user.user_id, lambda: _load_enterprise_perms(self.user.enterprise_id, self.user.user_id))
+        return self
+
+    def load_enterprise(self, enterprise_id):
+        """the enterprise of the request, or None if not exists"""
+        if not self.enterprise or self.enterprise.enterprise_id != enterprise_id:
+            self.enterprise = enterprise_snapshots.get(enterprise_id)
+        return self.enterprise
+
+    def load_tenant(self, tenant_name, enterprise_id=None):
+        """
+        the team of the request and its enterprise
+        :raise Tenants.DoesNotExist:
+        """
+        if enterprise_id:
+            self.tenant = Tenants.objects.get(tenant_name=tenant_name, enterprise_id=enterprise_id)
+        else:
+            self.tenant = Tenants.objects.get(tenant_name=tenant_name)
+        self.is_team_owner = self.user.user_id == self.tenant.creater
+        if not self.enterprise or self.enterprise.enterprise_id != self.tenant.enterprise_id:
+            self.enterprise = enterprise_snapshots.get(self.tenant.enterprise_id)
+        return self.tenant
+
+    def load_team_perms(self):
+        """the permissions of the user in the team loaded by load_tenant"""
+        tenant = self.tenant
+        self.is_enterprise_admin, self.perm_mask = perm_cache.get_team_perms(
+            tenant.enterprise_id, tenant.tenant_id, self.user.user_id,
+            self.is_team_owner, lambda: _load_team_perms(self.user, tenant, self.is_team_owner))
+        return self
+
+    def load_region(self, region_name):
+        """the RegionConfig of the request, or None if not exists"""
+        self.region = region_cache.get_region(region_name)
+        return self.region
+
+    def load_app(self, app_id):
+        """the app of the request in the team and region loaded before, or None if not exists"""
+        self.app = group_repo.get_group_by_pk(self.tenant.tenant_id, self.region.region_name, app_id)
+        return self.app
+
+
+def _invalidate_enterprises(sender, **kwargs):
+    enterprise_snapshots.invalidate()
+
+
+post_save.connect(_invalidate_enterprises, sender=TenantEnterprise, dispatch_uid="enterprise_snapshots_save")
+post_delete.connect(_invalidate_enterprises, sender=TenantEnterprise, dispatch_uid="enterprise_snapshots_delete")
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+  process-local cache of the resolved permission codes of users.
+"""
+import logging
+import os
+
+from console.models.main import (EnterpriseUserPerm, PermsInfo, RoleInfo, RolePerms, UserRole)
+from console.utils.cache import LocalCache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from goodrain_web.router import read_primary
+from www.models.main import PermRelTenant
+
+logger = logging.getLogger("default")
+
+
+class PermCache(object):
+    """
+    Cache what the views resolve on every request: whether the user is an enterprise admin
+    and the permission codes of the user, in the enterprise or in a team.
+
+    The entries live in a LocalCache, the least recently used are evicted when it is
+    full. Every entry records the version it was resolved under. Changes of roles, role perms,
+    enterprise identities and team members bump the version, through model signals or,
+    for bulk_create and update which send no signal, by calling invalidate. The ttl bounds
+    how long other gunicorn workers can serve stale permissions.
+    """
+
+    def __init__(self, ttl=None, max_size=None):
+        if ttl is None:
+            ttl = float(os.getenv("PERM_CACHE_TTL", 10))
+        if max_size is None:
+            max_size = int(os.getenv("PERM_CACHE_MAX_SIZE", 10000))
+        self.ttl = ttl
+        self.max_size = max_size
+        self.version = 0
+        self._entries = LocalCache(max_size)
+
+    def _get_or_load(self, key, loader):
+        version = self.version
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+        # the entries are dropped on commit, a lagging replica would bring the old rows back
+        with read_primary():
+            value = loader()
+        if self.ttl > 0:
+            self._entries.set(key, (version, value), self.ttl)
+        return value
+
+    def get_enterprise_perms(self, enterprise_id, user_id, loader):
+        """
+        :param loader: called on miss, returns (is_enterprise_admin, PermissionMask)
+        :return: (is_enterprise_admin, PermissionMask)
+        """
+        return self._get_or_load(("enterprise", enterprise_id, user_id), loader)
+
+    def get_team_perms(self, enterprise_id, tenant_id, user_id, is_team_owner, loader):
+        """
+        :param loader: called on miss, returns (is_enterprise_admin, PermissionMask)
+        :return: (is_enterprise_admin, PermissionMask)
+        """
+        return self._get_or_load(("team", enterprise_id, tenant_id, user_id, is_team_owner), loader)
+
+    def invalidate(self):
+        """
+        bump the version once the current transaction commits, so that no request
+        caches the old permissions under the new version.
+        """
+        transaction.on_commit(self._bump)
+
+    def _bump(self):
+        self.version += 1
+
+    def clear(self):
+        self._bump()
+        self._entries.clear()
+
+
+perm_cache = PermCache()
+
+
+def _invalidate(sender, **kwargs):
+    perm_cache.invalidate()
+
+
+for _sender in (EnterpriseUserPerm, PermsInfo, RoleInfo, RolePerms, UserRole, PermRelTenant):
+    post_save.connect(_invalidate, sender=_sender, dispatch_uid="perm_cache_{}".format(_sender.__name__))
+    post_delete.connect(_invalidate, sender=_sender, dispatch_uid="perm_cache_{}".format(_sender.__name__))
@@ -9,6 +9,7 @@ from console.repositories.perm_repo import perms_repo
 from console.repositories.perm_repo import role_kind_repo
 from console.repositories.perm_repo import role_perm_relation_repo
 from console.repositories.perm_repo import user_kind_role_repo
+from console.services.perm_cache import perm_cache
 from console.utils.perms import get_perms_structure, get_perms_model, get_team_perms_model, get_enterprise_perms_model, \
     get_perms_name_code_kv, DEFAULT_TEAM_ROLE_PERMS, DEFAULT_ENTERPRISE_ROLE_PERMS
 
@@ -212,6 +213,7 @@ class RolePermService(object):
     def unpack_role_perms_tree(self, perms_model, role_id, perms_name_code_kv):
         role_perms_list = self.__unpack_to_build_perms_list(perms_model, role_id, perms_name_code_kv)
         RolePerms.objects.bulk_create(role_perms_list)
+        perm_cache.invalidate()
 
     @transaction.atomic()
     def update_role_perms(self, role_id, perms_model, kind=None):
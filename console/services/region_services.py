@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 import json
 import logging
+from functools import partial
 
 import yaml
 from console.enum.region_enum import RegionStatusEnum
@@ -295,7 +296,11 @@ class RegionService(object):
             # check component status
             service_ids = [service.service_id for service in services]
             status_list = base_service.status_multi_service(
-                region=region_name, tenant_name=tenant.tenant_name, service_ids=service_ids, enterprise_id=tenant.enterprise_id)
+                region=region_name,
+                tenant_name=tenant.tenant_name,
+                service_ids=service_ids,
+                enterprise_id=tenant.enterprise_id,
+                use_cache=False)
             status_list = [x for x in [x["status"] for x in status_list] if x not in ["closed", "undeploy"]]
             if len(status_list) > 0:
                 raise ServiceHandleException(
@@ -534,33 +539,43 @@ class RegionService(object):
 
     def conver_regions_info(self, regions, check_status, level="open"):
         # 转换集群数据，若需要附加状态则从集群API获取
-        region_info_list = []
+        region_info_list = [self.__init_region_resource_data(region, level) for region in regions]
+        if check_status != "yes":
+            return region_info_list
+        # 并发查询所有集群的版本与资源，耗时取决于最慢的一次调用
+        calls = {}
         for region in regions:
-            region_info_list.append(self.conver_region_info(region, check_status, level))
+            calls[(region.region_name, "version")] = partial(
+                region_api.get_enterprise_api_version_v2, enterprise_id=region.enterprise_id, region=region.region_name)
+            calls[(region.region_name, "resources")] = partial(
+                region_api.get_region_resources, region.enterprise_id, region=region.region_name)
+        results = region_api.fan_out(calls)
+        for region_resource in region_info_list:
+            region_name = region_resource["region_name"]
+            self.__set_region_status(region_resource, results[(region_name, "version")], results[(region_name, "resources")])
         return region_info_list
 
     def conver_region_info(self, region, check_status, level="open"):
         # 转换集群数据，若需要附加状态则从集群API获取
-        region_resource = self.__init_region_resource_data(region, level)
-        if check_status == "yes":
-            try:
-                _, rbd_version = region_api.get_enterprise_api_version_v2(
-                    enterprise_id=region.enterprise_id, region=region.region_name)
-                res, body = region_api.get_region_resources(region.enterprise_id, region=region.region_name)
-                rbd_version = rbd_version["raw"]
-                if res.get("status") == 200:
-                    region_resource["total_memory"] = body["bean"]["cap_mem"]
-                    region_resource["used_memory"] = body["bean"]["req_mem"]
-                    region_resource["total_cpu"] = body["bean"]["cap_cpu"]
-                    region_resource["used_cpu"] = body["bean"]["req_cpu"]
-                    region_resource["total_disk"] = body["bean"]["cap_disk"] / 1024 / 1024 / 1024
-                    region_resource["used_disk"] = body["bean"]["req_disk"] / 1024 / 1024 / 1024
-                    region_resource["rbd_version"] = rbd_version
-            except (region_api.CallApiError, ServiceHandleException) as e:
-                logger.exception(e)
-                region_resource["rbd_version"] = ""
-                region_resource["health_status"] = "failure"
-        return region_resource
+        return self.conver_regions_info([region], check_status, level)[0]
+
+    def __set_region_status(self, region_resource, version_result, resources_result):
+        error = version_result.error or resources_result.error
+        if error:
+            logger.warning("get region {0} status failed: {1}".format(region_resource["region_name"], error))
+            region_resource["rbd_version"] = ""
+            region_resource["health_status"] = "failure"
+            return
+        _, rbd_version = version_result.value
+        res, body = resources_result.value
+        if res.get("status") == 200:
+            region_resource["total_memory"] = body["bean"]["cap_mem"]
+            region_resource["used_memory"] = body["bean"]["req_mem"]
+            region_resource["total_cpu"] = body["bean"]["cap_cpu"]
+            region_resource["used_cpu"] = body["bean"]["req_cpu"]
+            region_resource["total_disk"] = body["bean"]["cap_disk"] / 1024 / 1024 / 1024
+            region_resource["used_disk"] = body["bean"]["req_disk"] / 1024 / 1024 / 1024
+            region_resource["rbd_version"] = rbd_version["raw"]
 
     def get_enterprise_regions(self, enterprise_id, level="open", status="", check_status="yes"):
         regions = region_repo.get_regions_by_enterprise_id(enterprise_id, status)
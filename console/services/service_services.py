@@ -3,8 +3,10 @@ import json
 import logging
 from re import split as re_split
 
+from addict import Dict
 from console.exception.main import RbdAppNotFound, ServiceHandleException
 from console.repositories.app import service_source_repo
+from console.services.component_status_cache import component_status_cache
 from console.utils.oauth.oauth_types import support_oauth_type
 from www.apiclient.regionapi import RegionInvokeApi
 from www.db.base import BaseConnection
@@ -37,13 +39,12 @@ class BaseService(object):
                 LEFT JOIN region_info i ON t.service_region = i.region_name
 
             WHERE
-                t.tenant_id = "{team_id}"
-                AND t.service_region = "{region_name}"
+                t.tenant_id = %s
+                AND t.service_region = %s
             ORDER BY
-                t.update_time DESC;
-        '''.format(
-            team_id=team_id, region_name=region_name)
-        services = dsn.query(query_sql)
+                t.update_time DESC
+        '''
+        services = dsn.query(query_sql, [team_id, region_name])
         return services
 
     def get_group_services_list(self, team_id, region_name, group_id, query=""):
@@ -59,21 +60,21 @@ class BaseService(object):
                 t.version,
                 t.update_time,
                 t.min_memory * t.min_node AS min_memory,
+                t.service_source,
                 g.group_name
             FROM
                 tenant_service t
                 LEFT JOIN service_group_relation r ON t.service_id = r.service_id
                 LEFT JOIN service_group g ON r.group_id = g.ID
             WHERE
-                t.tenant_id = "{team_id}"
-                AND t.service_region = "{region_name}"
-                AND r.group_id = "{group_id}"
-                AND t.service_cname like "%{service_cname}%"
+                t.tenant_id = %s
+                AND t.service_region = %s
+                AND r.group_id = %s
+                AND t.service_cname LIKE %s
             ORDER BY
-                t.update_time DESC;
-        '''.format(
-            team_id=team_id, region_name=region_name, group_id=group_id, service_cname=query)
-        services = dsn.query(query_sql)
+                t.update_time DESC
+        '''
+        services = dsn.query(query_sql, [team_id, region_name, group_id, "%{}%".format(query)])
         return services
 
     def get_no_group_services_list(self, team_id, region_name):
@@ -95,22 +96,40 @@ class BaseService(object):
                 LEFT JOIN service_group_relation r ON t.service_id = r.service_id
                 LEFT JOIN service_group g ON r.group_id = g.ID
             WHERE
-                t.tenant_id = "{team_id}"
-                AND t.service_region = "{region_name}"
+                t.tenant_id = %s
+                AND t.service_region = %s
                 AND r.group_id IS NULL
             ORDER BY
-                t.update_time DESC;
-        '''.format(
-            team_id=team_id, region_name=region_name)
-        services = dsn.query(query_sql)
+                t.update_time DESC
+        '''
+        services = dsn.query(query_sql, [team_id, region_name])
         return services
 
-    def get_fuzzy_services_list(self, team_id, region_name, query_key, fields, order):
+    def _fuzzy_services_from(self, team_id, region_name, query_key):
+        """the FROM and WHERE clause shared by the page and the count of the fuzzy query, and its params"""
+        from_sql = '''
+            FROM
+                tenant_service t
+                LEFT JOIN service_group_relation r ON t.service_id = r.service_id
+                LEFT JOIN service_group g ON r.group_id = g.ID
+            WHERE
+                t.tenant_id = %s
+                AND t.service_region = %s
+                AND t.service_cname LIKE %s
+        '''
+        return from_sql, [team_id, region_name, "%{}%".format(query_key)]
+
+    def get_fuzzy_services_list(self, team_id, region_name, query_key, fields, order, page=None, page_size=None):
+        """
+        the components of the team whose name contains query_key, all or the page of
+        page_size components.
+        """
         if fields != "update_time" and fields != "ID":
             fields = "ID"
         if order != "desc" and order != "asc":
             order = "desc"
         dsn = BaseConnection()
+        from_sql, params = self._fuzzy_services_from(team_id, region_name, query_key)
         query_sql = '''
             SELECT
                 t.create_status,
@@ -124,25 +143,24 @@ class BaseService(object):
                 t.update_time,
                 r.group_id,
                 g.group_name
-            FROM
-                tenant_service t
-                LEFT JOIN service_group_relation r ON t.service_id = r.service_id
-                LEFT JOIN service_group g ON r.group_id = g.ID
-            WHERE
-                t.tenant_id = "{team_id}"
-                AND t.service_region = "{region_name}"
-                AND t.service_cname LIKE "%{query_key}%"
-            ORDER BY
-                t.{fields} {order};
-        '''.format(
-            team_id=team_id, region_name=region_name, query_key=query_key, fields=fields, order=order)
-        services = dsn.query(query_sql)
-        return services
+        ''' + from_sql
+        order_by = ("t." + fields, order)
+        if page is not None:
+            rows = dsn.query_page(query_sql, params, page=page, page_size=page_size, order_by=order_by)
+        else:
+            rows = dsn.iter_query(query_sql + " ORDER BY {} {}".format(*order_by), params)
+        return [Dict(row._asdict()) for row in rows]
+
+    def count_fuzzy_services(self, team_id, region_name, query_key):
+        """the number of rows of get_fuzzy_services_list"""
+        dsn = BaseConnection()
+        from_sql, params = self._fuzzy_services_from(team_id, region_name, query_key)
+        rows = dsn.query("SELECT count(*) AS total" + from_sql, params)
+        return rows[0]["total"]
 
-    def status_multi_service(self, region, tenant_name, service_ids, enterprise_id):
+    def status_multi_service(self, region, tenant_name, service_ids, enterprise_id, use_cache=True):
         try:
-            body = region_api.service_status(region, tenant_name, {"service_ids": service_ids, "enterprise_id": enterprise_id})
-            return body["list"]
+            return component_status_cache.list_status(region, tenant_name, service_ids, enterprise_id, use_cache=use_cache)
         except Exception as e:
             logger.exception(e)
             return []
@@ -3,6 +3,7 @@ import logging
 from functools import reduce
 
 from console.services.region_services import region_services
+from console.services.component_status_cache import component_status_cache
 from www.apiclient.regionapi import RegionInvokeApi
 from www.models.main import (ServiceDomain, ServiceGroupRelation, TenantServiceInfo, TenantServiceRelation, TenantServicesPort)
 
@@ -30,11 +31,7 @@ class TopologicalService(object):
         # 批量查询组件状态
         if len(service_list) > 0:
             try:
-                service_status_list = region_api.service_status(region, team_name, {
-                    "service_ids": all_service_id_list,
-                    "enterprise_id": enterprise_id
-                })
-                service_status_list = service_status_list["list"]
+                service_status_list = component_status_cache.list_status(region, team_name, all_service_id_list, enterprise_id)
                 if service_status_list:
                     service_status_map = {status_map["service_id"]: status_map for status_map in service_status_list}
             except Exception as e:
@@ -43,9 +40,8 @@ class TopologicalService(object):
 
         # 拼接组件状态
         try:
-            dynamic_services_info = region_api.get_dynamic_services_pods(region, team_name,
-                                                                         [service.service_id for service in service_list])
-            dynamic_services_list = dynamic_services_info["list"]
+            dynamic_services_list = component_status_cache.list_pods(region, team_name,
+                                                                     [service.service_id for service in service_list])
         except Exception as e:
             logger.exception(e)
             dynamic_services_list = []
@@ -182,19 +178,19 @@ class TopologicalService(object):
         # pod节点信息
         region_data = dict()
         try:
-            status_data = region_api.check_service_status(
+            region_data = component_status_cache.get_status(
                 region=region_name,
                 tenant_name=team_name,
+                service_id=service.service_id,
                 service_alias=service.service_alias,
                 enterprise_id=team.enterprise_id)
-            region_data = status_data["bean"]
 
             pod_list = region_api.get_service_pods(
                 region=region_name,
                 tenant_name=team_name,
                 service_alias=service.service_alias,
                 enterprise_id=team.enterprise_id)
-            region_data["pod_list"] = pod_list["list"]
+            region_data["pod_list"] = pod_list.get("list") or []
         except region_api.CallApiError as e:
             if e.message["httpcode"] == 404:
                 region_data = {"status_cn": "创建中", "cur_status": "creating"}
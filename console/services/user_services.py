@@ -14,6 +14,7 @@ from console.repositories.enterprise_repo import enterprise_user_perm_repo
 from console.repositories.oauth_repo import oauth_user_repo
 from console.repositories.team_repo import team_repo
 from console.repositories.user_repo import user_repo
+from console.services.access_token_cache import access_token_cache
 from console.services.app_actions import app_manage_service
 from console.services.exception import (ErrAdminUserDoesNotExist, ErrCannotDelLastAdminUser)
 from console.services.perm_services import (role_kind_services, user_kind_role_service)
@@ -213,6 +214,7 @@ class UserService(object):
             d["is_active"] = data["is_active"]
 
         Users.objects.filter(user_id=user_id).update(**d)
+        access_token_cache.invalidate_user(user_id)
         if data.get("password", None) is not None:
             user = Users.objects.get(user_id=user_id)
             user.set_password(data["password"])
@@ -320,11 +322,13 @@ class UserService(object):
         return enterprise_user_perm_repo.get_user_enterprise_perm(user.user_id, enterprise_id)
 
     def get_user_by_openapi_token(self, token):
+        return access_token_cache.get_user(token, self._load_user_by_openapi_token)
+
+    def _load_user_by_openapi_token(self, token):
         perm = user_access_services.check_user_access_key(token)
         if not perm:
-            return None
-        user = self.get_user_by_user_id(perm.user_id)
-        return user
+            return None, None
+        return self.get_user_by_user_id(perm.user_id), perm.expire_time
 
     def get_administrator_user_token(self, user):
         perm_list = enterprise_user_perm_repo.get_user_enterprise_perm(user.user_id, user.enterprise_id)
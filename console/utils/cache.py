@@ -1,80 +1,396 @@
 # -*- coding: utf8 -*-
+import copy
+import functools
+import json
+import math
 import os
+import threading
 import time
+import uuid
+from collections import OrderedDict
+
 import redis
 import logging
 
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from goodrain_web.router import read_primary
+from www.apiclient.singleflight import SingleFlight
+
 logger = logging.getLogger('default')
 
 
+class LocalCache(object):
+    """
+    An in-process LRU of at most max_size keys with expiration, O(1) get, set and eviction.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._items = OrderedDict()
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            if item[0] < time.time():
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return item[1]
+
+    def set(self, key, value, seconds):
+        with self._lock:
+            self._items[key] = (time.time() + seconds, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._items.pop(key, None)
+
+    def delete_if(self, predicate):
+        """drop the keys whose value matches predicate, O(n)"""
+        with self._lock:
+            keys = [key for key, item in self._items.items() if predicate(item[1])]
+            for key in keys:
+                del self._items[key]
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    @property
+    def size(self):
+        return len(self._items)
+
+
 class Cache(object):
-    def __init__(self, max_cache_size=30):
-        self.cache = {}
+    """
+    A key value cache with expiration.
+
+    Without REDIS_HOST, keys are kept in process in a LocalCache of max_cache_size keys.
+    With REDIS_HOST, keys are kept in redis behind a LocalCache of CONSOLE_CACHE_L1_TTL
+    seconds (2 by default); every write is published on CONSOLE_CACHE_CHANNEL, so the
+    other workers drop the key from their LocalCache. add_listener lets other in-process
+    caches hear about the keys changed by other workers, and notify publishes keys
+    without writing them.
+
+    get_or_compute lets only one greenlet of the process compute a missing key, the
+    concurrent callers of the same key wait for it and share its value.
+    """
+
+    def __init__(self, max_cache_size=None):
+        if max_cache_size is None:
+            max_cache_size = int(os.getenv("CONSOLE_CACHE_MAX_SIZE", 1024))
         self.max_cache_size = max_cache_size
+        self.local = LocalCache(max_cache_size)
+        self._flight = SingleFlight()
+        self._listeners = []
         self.redis = None
-        if self.enable_redis:
+        if os.getenv("REDIS_HOST"):
             self.redis = redis.Redis(
                 host=os.getenv("REDIS_HOST", "127.0.0.1"),
                 port=os.getenv("REDIS_PORT", 6379),
                 db=os.getenv("REDIS_DB", 0),
                 password=os.getenv("REDIS_PASSWORD", None))
+            self.l1_ttl = float(os.getenv("CONSOLE_CACHE_L1_TTL", 2))
+            self.channel = os.getenv("CONSOLE_CACHE_CHANNEL", "console_cache_invalidate")
+            self._origin = None
+            self._pid = None
+            self._subscriber_lock = threading.Lock()
 
     def get(self, key):
-        if self.enable_redis:
-            return self._redis_get(key)
-        return self._memory_get(key)
+        return self.get_many([key]).get(key)
 
-    def _redis_get(self, key):
+    def get_many(self, keys):
+        """return a dict of the keys found, redis is asked once for all keys missing locally"""
+        values = {}
+        missed = []
+        for key in keys:
+            value = self.local.get(key)
+            if value is None:
+                missed.append(key)
+            else:
+                values[key] = value
+        if not missed or not self.enable_redis:
+            return values
+        self._subscribe()
         try:
-            return self.redis.get(key)
+            fetched = self.redis.mget(missed)
         except Exception as e:
             logger.exception(e)
-
-    def _memory_get(self, key):
-        if key not in self.cache:
-            return None
-        if self.cache[key]["expired_time"] < time.time():
-            self.cache.pop(key)
-            return None
-        return self.cache[key]["value"]
+            return values
+        for key, value in zip(missed, fetched):
+            if value is not None:
+                self._set_local(key, value, self.l1_ttl)
+                values[key] = value
+        return values
 
     def set(self, key, value, seconds):
-        if self.enable_redis:
-            return self._redis_set(key, value, seconds)
-        self._memory_set(key, value, seconds)
+        self.set_many({key: value}, seconds)
 
-    def _redis_set(self, key, value, seconds):
+    def set_many(self, mapping, seconds):
+        """set all keys in one redis round trip"""
+        if not self.enable_redis:
+            for key, value in mapping.items():
+                self._set_local(key, value, seconds)
+            return
+        self._subscribe()
         try:
-            self.redis.set(key, value, seconds)
+            pipe = self.redis.pipeline(transaction=False)
+            for key, value in mapping.items():
+                # redis expires keys in whole seconds
+                pipe.set(key, value, max(1, int(math.ceil(seconds))))
+            self._publish(pipe, mapping.keys())
+            pipe.execute()
         except Exception as e:
             logger.exception(e)
+            return
+        for key, value in mapping.items():
+            self._set_local(key, value, min(self.l1_ttl, seconds))
+
+    def delete(self, key):
+        self.delete_many([key])
+
+    def delete_many(self, keys):
+        keys = list(keys)
+        for key in keys:
+            self.local.delete(key)
+        if not keys or not self.enable_redis:
+            return
+        self._subscribe()
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.delete(*keys)
+            self._publish(pipe, keys)
+            pipe.execute()
+        except Exception as e:
+            logger.exception(e)
+
+    def notify(self, keys):
+        """tell the other workers that keys changed"""
+        keys = list(keys)
+        if not keys or not self.enable_redis:
+            return
+        self._subscribe()
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            self._publish(pipe, keys)
+            pipe.execute()
+        except Exception as e:
+            logger.exception(e)
+
+    def add_listener(self, listener):
+        """
+        listener is called with the keys changed by other workers, or with None
+        if changes may have been missed.
+        """
+        self._listeners.append(listener)
+
+    def get_or_compute(self, key, compute, seconds):
+        """
+        return the value of key, or compute, cache and return it if it is missing.
+        None is never cached.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+        return self._flight.do(key, self._compute, key, compute, seconds)
 
-    def _memory_set(self, key, value, seconds):
-        if key not in self.cache and self.size >= self.max_cache_size:
-            remove_num = self._remove_expired_key()
-            if remove_num == 0:
-                logger.debug("The cache is full and cannot be set")
+    def _compute(self, key, compute, seconds):
+        # the previous holder of the key may have just set it
+        value = self.get(key)
+        if value is not None:
+            return value
+        value = compute()
+        if value is not None:
+            self.set(key, value, seconds)
+        return value
+
+    def _set_local(self, key, value, seconds):
+        if seconds > 0:
+            self.local.set(key, value, seconds)
+
+    def _publish(self, pipe, keys):
+        pipe.publish(self.channel, json.dumps({"origin": self._origin, "keys": [str(key) for key in keys]}))
+
+    def _subscribe(self):
+        """start listening to the writes of other workers, once per process"""
+        if self._pid == os.getpid():
+            return
+        with self._subscriber_lock:
+            if self._pid == os.getpid():
                 return
-        self.cache[key] = {"expired_time": time.time() + seconds, "value": value}
+            # a forked gunicorn worker neither inherits the thread nor may share the origin of its parent
+            self._pid = os.getpid()
+            self._origin = uuid.uuid4().hex
+            self.local.clear()
+            threading.Thread(target=self._listen, name="console-cache-invalidation", daemon=True).start()
+
+    def _listen(self):
+        while True:
+            try:
+                pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                for message in pubsub.listen():
+                    self._on_message(message.get("data"))
+            except Exception as e:
+                logger.warning("console cache invalidation channel: {}".format(e))
+                # writes may have been missed while disconnected
+                self.local.clear()
+                self._call_listeners(None)
+                time.sleep(1)
 
-    def _remove_expired_key(self):
-        remove_keys = []
-        for key in self.cache:
-            if self.cache[key]["expired_time"] < time.time():
-                remove_keys.append(key)
-        for remove_key in remove_keys:
-            self.cache.pop(remove_key)
-        return len(remove_keys)
+    def _on_message(self, data):
+        try:
+            message = json.loads(data)
+        except (TypeError, ValueError):
+            return
+        if message.get("origin") == self._origin:
+            return
+        keys = message.get("keys") or []
+        for key in keys:
+            self.local.delete(key)
+        self._call_listeners(keys)
+
+    def _call_listeners(self, keys):
+        for listener in self._listeners:
+            try:
+                listener(keys)
+            except Exception as e:
+                logger.exception(e)
 
     @property
     def size(self):
-        return len(self.cache)
+        return self.local.size
 
     @property
     def enable_redis(self):
-        if os.getenv("REDIS_HOST"):
-            return True
-        return False
+        return self.redis is not None
 
 
 cache = Cache()
+
+_NONE = object()
+
+
+class TagCache(object):
+    """
+    In-process memoization of repository lookups, invalidated by tags.
+
+    Every result is cached under the versions of its tags; bind connects the
+    post_save and post_delete signals of a model to its tags, and invalidate must be
+    called after update or bulk writes which send no signal. A change bumps the tags at
+    once, so that the changing transaction does not read a stale result, and again on
+    commit, so that no result read before the commit survives it. With a redis backed
+    store, the bump on commit is published on its channel and the other gunicorn workers
+    bump the tags as well; the ttl bounds how long they can serve a stale result if a
+    message is lost.
+
+    Between begin_request and end_request, a request also memoizes the lookups it made,
+    and never runs the same lookup twice. Callers always get their own copy of a result.
+    """
+
+    tag_prefix = "tag_cache:"
+
+    def __init__(self, ttl=None, max_size=None, store=None):
+        if ttl is None:
+            ttl = float(os.getenv("REPO_CACHE_TTL", 30))
+        if max_size is None:
+            max_size = int(os.getenv("REPO_CACHE_MAX_SIZE", 10000))
+        self.ttl = ttl
+        self.local = LocalCache(max_size)
+        self._versions = {}
+        self.store = store
+        if store is not None:
+            store.add_listener(self._on_remote_change)
+        # patched by gevent, so every greenlet serves its own request
+        self._request = threading.local()
+
+    def cached(self, tags, ttl=None):
+        """
+        decorator of repository methods, self is not part of the key and the other
+        arguments must be hashable.
+        """
+        tags = tuple(tags)
+
+        def decorator(func):
+            name = "{}.{}".format(func.__module__, func.__qualname__)
+
+            @functools.wraps(func)
+            def wrapper(repo, *args, **kwargs):
+                if self.store is not None and self.store.enable_redis:
+                    # hear the invalidations of the other workers before serving cached results
+                    self.store._subscribe()
+                key = (name, args, tuple(sorted(kwargs.items())), tuple(self._versions.get(tag, 0) for tag in tags))
+                try:
+                    hash(key)
+                except TypeError:
+                    return func(repo, *args, **kwargs)
+                memo = getattr(self._request, "memo", None)
+                value = memo.get(key) if memo is not None else None
+                if value is None:
+                    value = self.local.get(key)
+                if value is None:
+                    # the tags are bumped on commit, a lagging replica would bring the old rows back
+                    with read_primary():
+                        value = func(repo, *args, **kwargs)
+                    if value is None:
+                        value = _NONE
+                    # a transaction may read rows that are never committed
+                    if self.ttl > 0 and not transaction.get_connection().in_atomic_block:
+                        self.local.set(key, value, self.ttl if ttl is None else ttl)
+                if memo is not None:
+                    memo[key] = value
+                return None if value is _NONE else copy.copy(value)
+
+            return wrapper
+
+        return decorator
+
+    def invalidate(self, *tags):
+        self._bump(tags)
+        transaction.on_commit(lambda: self._commit(tags))
+
+    def _commit(self, tags):
+        self._bump(tags)
+        if self.store is not None:
+            self.store.notify([self.tag_prefix + tag for tag in tags])
+
+    def _bump(self, tags):
+        for tag in tags:
+            self._versions[tag] = self._versions.get(tag, 0) + 1
+
+    def _on_remote_change(self, keys):
+        if keys is None:
+            self.clear()
+            return
+        self._bump([key[len(self.tag_prefix):] for key in keys if key.startswith(self.tag_prefix)])
+
+    def bind(self, model, *tags):
+        """invalidate tags whenever a model instance is saved or deleted"""
+
+        def receiver(sender, **kwargs):
+            self.invalidate(*tags)
+
+        uid = "tag_cache_{}_{}".format(model.__name__, "_".join(tags))
+        post_save.connect(receiver, sender=model, weak=False, dispatch_uid=uid)
+        post_delete.connect(receiver, sender=model, weak=False, dispatch_uid=uid)
+
+    def begin_request(self):
+        self._request.memo = {}
+
+    def end_request(self):
+        self._request.memo = None
+
+    def clear(self):
+        self._bump(list(self._versions.keys()))
+        self.local.clear()
+
+
+tag_cache = TagCache(store=cache)
+cached = tag_cache.cached
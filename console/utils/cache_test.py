@@ -1,8 +1,9 @@
 # -*- coding: utf8 -*-
+import threading
 import time
 import unittest
 
-from cache import Cache
+from console.utils.cache import Cache, LocalCache
 
 
 class MyTestCase(unittest.TestCase):
@@ -22,10 +23,14 @@ class MyTestCase(unittest.TestCase):
         if cache.enable_redis:
             return
         test_keys = ["key1", "key2", "key3"]
+        cache.set("key1", "key1 value", 2)
+        cache.set("key2", "key2 value", 2)
+        cache.get("key1")
+        cache.set("key3", "key3 value", 2)
+        # the least recently used key is evicted
+        self.assertEqual(cache.size, 2)
         for key in test_keys:
-            cache.set(key, "{} value".format(key), 2)
-        for key in test_keys:
-            if key == "key3":
+            if key == "key2":
                 self.assertEqual(cache.get(key), None)
                 continue
             self.assertEqual(cache.get(key), "{} value".format(key))
@@ -34,18 +39,60 @@ class MyTestCase(unittest.TestCase):
         cache = Cache(2)
         test_keys = ["key1", "key2", "key3"]
         for key in test_keys:
-            cache.set(key, "{} value".format(key), 2)
-        time.sleep(2)
+            cache.set(key, "{} value".format(key), 1)
+        time.sleep(1.1)
         for key in test_keys:
-            if cache.enable_redis:
-                self.assertEqual(cache.get(key), None)
-                continue
-            if key != "key3":
-                continue
-            self.assertEqual(cache.size, 2)
-            cache.set(key, "key3 value", 2)
-            self.assertEqual(cache.size, 1)
-            self.assertEqual(cache.get(key), "key3 value")
+            self.assertEqual(cache.get(key), None)
+        if cache.enable_redis:
+            return
+        self.assertEqual(cache.size, 0)
+        cache.set("key3", "key3 value", 2)
+        self.assertEqual(cache.size, 1)
+        self.assertEqual(cache.get("key3"), "key3 value")
+
+    def test_get_or_compute(self):
+        cache = Cache()
+        computed = []
+        started = threading.Event()
+
+        def compute():
+            computed.append(1)
+            started.set()
+            time.sleep(0.1)
+            return "value"
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute("key", compute, 2))) for _ in range(5)]
+        threads[0].start()
+        started.wait()
+        for thread in threads[1:]:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(computed), 1)
+        self.assertEqual([r if isinstance(r, str) else r.decode("UTF-8") for r in results], ["value"] * 5)
+        cache.delete("key")
+
+    def test_get_and_set_many(self):
+        cache = Cache()
+        cache.set_many({"key1": "value1", "key2": "value2"}, 2)
+        values = cache.get_many(["key1", "key2", "key3"])
+        self.assertEqual({k: v if isinstance(v, str) else v.decode("UTF-8")
+                          for k, v in values.items()}, {
+                              "key1": "value1",
+                              "key2": "value2"
+                          })
+        cache.delete_many(["key1", "key2"])
+        self.assertEqual(cache.get_many(["key1", "key2"]), {})
+
+    def test_local_cache_delete_if(self):
+        cache = LocalCache(10)
+        cache.set("key1", 1, 2)
+        cache.set("key2", 2, 2)
+        cache.delete_if(lambda value: value == 1)
+        self.assertEqual(cache.size, 1)
+        self.assertEqual(cache.get("key1"), None)
+        self.assertEqual(cache.get("key2"), 2)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+  permission codes as integer bitmasks.
+
+  every permission code of console.utils.perms owns one bit, the route permission
+  table of console.utils.perms_route_config is compiled into one mask per method
+  at import, so a permission check is a single AND and compare.
+"""
+import threading
+
+from console.utils import perms
+from console.utils import perms_route_config
+
+_lock = threading.Lock()
+_bits = {}
+
+
+def _bit(code):
+    bit = _bits.get(code)
+    if bit is None:
+        with _lock:
+            bit = _bits.get(code)
+            if bit is None:
+                # codes outside the perms tree, e.g. stale codes in the database, get a bit as well
+                bit = 1 << len(_bits)
+                _bits[code] = bit
+    return bit
+
+
+class PermissionMask(object):
+    """
+    An immutable set of permission codes, compared as one integer.
+    """
+    __slots__ = ("value", "_codes")
+
+    def __init__(self, codes=()):
+        self._codes = frozenset(codes)
+        value = 0
+        for code in self._codes:
+            value |= _bit(code)
+        self.value = value
+
+    @classmethod
+    def of(cls, codes):
+        """mask of a list of codes, masks of the literal lists in views are reused"""
+        key = tuple(codes)
+        mask = _literal_masks.get(key)
+        if mask is None:
+            mask = cls(codes)
+            _literal_masks[key] = mask
+        return mask
+
+    @staticmethod
+    def route(message, method):
+        """
+        mask required by a route of perms_route_config for an http method.
+        :param message: the "__message" dict of the route
+        """
+        compiled = _route_masks.get(id(message))
+        if compiled is None:
+            compiled = _compile_route(message)
+        return compiled[1][method.lower()]
+
+    @property
+    def codes(self):
+        return self._codes
+
+    def includes(self, other):
+        """whether all codes of other are in this mask"""
+        return self.value & other.value == other.value
+
+    def has(self, code):
+        return self.value & _bit(code) != 0
+
+    def __or__(self, other):
+        return PermissionMask(self._codes | other.codes)
+
+    def __and__(self, other):
+        return PermissionMask(self._codes & other.codes)
+
+    def __eq__(self, other):
+        return isinstance(other, PermissionMask) and self.value == other.value
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.value)
+
+    def __bool__(self):
+        return self.value != 0
+
+    __nonzero__ = __bool__
+
+    def __iter__(self):
+        return iter(self._codes)
+
+    def __len__(self):
+        return len(self._codes)
+
+    def __repr__(self):
+        return "PermissionMask({})".format(sorted(self._codes))
+
+
+_literal_masks = {}
+_route_masks = {}
+
+
+def _compile_route(message):
+    masks = {method: PermissionMask(item.get("perms") or []) for method, item in message.items()}
+    # keep a reference to message, so its id is not reused by another dict
+    _route_masks[id(message)] = (message, masks)
+    return message, masks
+
+
+# the codes of the perms tree own the low bits, in a stable order
+for _code in sorted(perms.get_enterprise_adminer_codes() | set(perm[2] for perm in perms.common_perms)):
+    _bit(_code)
+for _route in list(vars(perms_route_config).values()):
+    if isinstance(_route, dict) and isinstance(_route.get("__message"), dict):
+        _compile_route(_route["__message"])
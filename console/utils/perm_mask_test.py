@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+from console.utils import perms_route_config
+from console.utils.perm_mask import PermissionMask
+
+
+def test_includes():
+    user = PermissionMask([200001, 300002, 400001])
+
+    assert user.includes(PermissionMask.of([200001, 400001]))
+    assert user.includes(PermissionMask())
+    assert not user.includes(PermissionMask.of([200001, 999999]))
+    assert user.has(300002)
+    assert not user.has(100000)
+
+
+def test_route():
+    admin = PermissionMask([100000])
+
+    assert admin.includes(PermissionMask.route(perms_route_config.Admin["__message"], "GET"))
+    assert PermissionMask().includes(PermissionMask.route(perms_route_config.OauthConfig["__message"], "post"))
+    assert not PermissionMask().includes(PermissionMask.route(perms_route_config.OauthConfig["__message"], "put"))
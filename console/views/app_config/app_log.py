@@ -21,3 +21,20 @@ class ComponentLogView(AppBaseView):
         # disabled the GZipMiddleware on this call by inserting a fake header into the StreamingHttpResponse
         response['Content-Encoding'] = 'identity'
         return response
+
+
+class ComponentPodsLogView(AppBaseView):
+    def get(self, request, *args, **kwargs):
+        """
+        merged log stream of all pods of the component, each line is prefixed with its pod
+        """
+        container_name = request.GET.get("container_name")
+        follow = True if request.GET.get("follow") == "true" else False
+        targets = component_log_service.list_log_targets(self.tenant_name, self.region_name, self.service,
+                                                         self.tenant.enterprise_id, container_name)
+        stream = component_log_service.get_component_logs_stream(self.tenant_name, self.region_name, self.service.service_alias,
+                                                                 targets, follow)
+        response = StreamingHttpResponse(stream, content_type="text/plain; charset=utf-8")
+        # disabled the GZipMiddleware on this call by inserting a fake header into the StreamingHttpResponse
+        response['Content-Encoding'] = 'identity'
+        return response
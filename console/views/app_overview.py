@@ -251,7 +251,7 @@ class ListAppPodsView(AppBaseView):
         data = region_api.get_service_pods(self.service.service_region, self.tenant.tenant_name, self.service.service_alias,
                                            self.tenant.enterprise_id)
         result = {}
-        if data["bean"]:
+        if data.get("bean"):
 
             def foobar(data):
                 if data is None:
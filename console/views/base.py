@@ -7,16 +7,14 @@ from addict import Dict
 from console.exception.exceptions import AuthenticationInfoHasExpiredError
 from console.exception.main import (BusinessException, NoPermissionsError, ResourceNotEnoughException, ServiceHandleException,
                                     AbortRequest)
-from console.models.main import (EnterpriseUserPerm, OAuthServices, PermsInfo, RoleInfo, RolePerms, UserOAuthServices, UserRole)
+from console.models.main import OAuthServices, UserOAuthServices
 # repository
-from console.repositories.enterprise_repo import (enterprise_repo, enterprise_user_perm_repo)
-from console.repositories.group import group_repo
 from console.repositories.user_repo import user_repo
 from console.repositories.upgrade_repo import upgrade_repo
-from console.repositories.region_repo import region_repo
 # service
-from console.services.user_services import user_services
-from console.utils import perms
+from console.services.app_update_time import app_update_time
+from console.services.identity_context import IdentityContext
+from console.utils.perm_mask import PermissionMask
 from console.utils.oauth.oauth_types import get_oauth_instance
 from django.conf import settings
 from django.core.exceptions import PermissionDenied
@@ -35,7 +33,7 @@ from rest_framework.views import APIView, set_rollback
 from rest_framework_jwt.authentication import BaseJSONWebTokenAuthentication
 from rest_framework_jwt.settings import api_settings
 from www.apiclient.regionapibaseclient import RegionApiBaseHttpClient
-from www.models.main import TenantEnterprise, Tenants, Users
+from www.models.main import Tenants, Users
 from console.login.jwt_manager import JwtManager
 
 jwt_get_username_from_payload = api_settings.JWT_PAYLOAD_GET_USERNAME_HANDLER
@@ -86,9 +84,9 @@ class JSONWebTokenAuthentication(BaseJSONWebTokenAuthentication):
             msg = _('未提供验证信息')
             raise AuthenticationInfoHasExpiredError(msg)
 
-        # Check if the jwt is expired.If not, reset the expire time
+        # Check if the jwt is expired.If not, reset the expire time when it is about to expire
         jwt_manager = JwtManager()
-        if not jwt_manager.exists(jwt_value):
+        if not jwt_manager.validate(jwt_value):
             raise AuthenticationInfoHasExpiredError("token expired")
 
         # if have SSO login modules
@@ -123,7 +121,6 @@ class JSONWebTokenAuthentication(BaseJSONWebTokenAuthentication):
                 raise AuthenticationInfoHasExpiredError(msg)
 
             user = self.authenticate_credentials(payload)
-            jwt_manager.set(jwt_value, user.user_id)
             return user, jwt_value
 
     def authenticate_credentials(self, payload):
@@ -201,34 +198,40 @@ class JWTAuthApiView(APIView):
         self.enterprise = None
         self.is_enterprise_admin = False
         self.user_perms = None
+        self.user_perm_mask = PermissionMask()
+        self.identity = None
 
     def check_perms(self, request, *args, **kwargs):
         if kwargs.get("__message"):
-            request_perms = kwargs["__message"][request.META.get("REQUEST_METHOD").lower()]["perms"]
-            if request_perms and (len(set(request_perms) & set(self.user_perms)) != len(set(request_perms))):
-                logger.info("no permission. request perms: {}. user perms: {}".format(request_perms, self.user_perms))
+            request_perms = PermissionMask.route(kwargs["__message"], request.META.get("REQUEST_METHOD"))
+            if not self.user_perm_mask.includes(request_perms):
+                logger.info("no permission. request perms: {}. user perms: {}".format(request_perms, self.user_perm_mask))
                 raise NoPermissionsError
 
     def has_perms(self, request_perms):
-        if request_perms and (len(set(request_perms) & set(self.user_perms)) != len(set(request_perms))):
-            logger.info("no permission. request perms: {}. user perms: {}".format(request_perms, self.user_perms))
+        if request_perms and not self.user_perm_mask.includes(PermissionMask.of(request_perms)):
+            logger.info("no permission. request perms: {}. user perms: {}".format(request_perms, self.user_perm_mask))
             raise NoPermissionsError
 
+    def set_perms(self, user_perm_mask):
+        self.user_perm_mask = user_perm_mask
+        self.user_perms = list(user_perm_mask.codes)
+
     def get_perms(self):
-        self.user_perms = []
-        admin_roles = user_services.list_roles(self.user.enterprise_id, self.user.user_id)
-        self.user_perms = list(perms.list_enterprise_perm_codes_by_roles(admin_roles))
+        self.identity.load_enterprise_perms()
+        self.is_enterprise_admin = self.identity.is_enterprise_admin
+        self.set_perms(self.identity.perm_mask)
 
     def initial(self, request, *args, **kwargs):
         self.user = request.user
-        self.enterprise = TenantEnterprise.objects.filter(enterprise_id=self.user.enterprise_id).first()
-        self.is_enterprise_admin = enterprise_user_perm_repo.is_admin(self.user.enterprise_id, self.user.user_id)
+        self.identity = IdentityContext.of(request)
         self.get_perms()
+        self.enterprise = self.identity.enterprise
         self.check_perms(request, *args, **kwargs)
         self.tenant_name = kwargs.get("tenantName", None)
         if self.tenant_name:
             try:
-                self.tenant = Tenants.objects.get(tenant_name=self.tenant_name, enterprise_id=self.user.enterprise_id)
+                self.tenant = self.identity.load_tenant(self.tenant_name, self.user.enterprise_id)
                 self.team = self.tenant
             except Tenants.DoesNotExist:
                 raise ServiceHandleException(msg="team not found", msg_show="团队不存在")
@@ -292,32 +295,12 @@ class TenantHeaderView(JWTAuthApiView):
         self.response_region = None
 
     def get_perms(self):
-        self.user_perms = []
-        admin_roles = user_services.list_roles(self.user.enterprise_id, self.user.user_id)
-        self.user_perms = list(perms.list_enterprise_perm_codes_by_roles(admin_roles))
-        if self.is_team_owner:
-            team_perms = list(PermsInfo.objects.filter(kind="team").values_list("code", flat=True))
-            self.user_perms.extend(team_perms)
-            self.user_perms.append(200000)
-        else:
-            team_roles = RoleInfo.objects.filter(kind="team", kind_id=self.tenant.tenant_id)
-            if team_roles:
-                role_ids = team_roles.values_list("ID", flat=True)
-                team_user_roles = UserRole.objects.filter(user_id=self.user.user_id, role_id__in=role_ids)
-                if team_user_roles:
-                    team_user_role_ids = team_user_roles.values_list("role_id", flat=True)
-                    team_role_perms = RolePerms.objects.filter(role_id__in=team_user_role_ids)
-                    if team_role_perms:
-                        self.user_perms.extend(list(team_role_perms.values_list("perm_code", flat=True)))
-        self.user_perms = list(set(self.user_perms))
+        self.identity.load_team_perms()
+        self.is_enterprise_admin = self.identity.is_enterprise_admin
+        self.set_perms(self.identity.perm_mask)
 
     def initial(self, request, *args, **kwargs):
         self.user = request.user
-        self.enterprise = TenantEnterprise.objects.filter(enterprise_id=self.user.enterprise_id).first()
-        enterprise_user_perms = EnterpriseUserPerm.objects.filter(
-            enterprise_id=self.user.enterprise_id, user_id=self.user.user_id).first()
-        if enterprise_user_perms:
-            self.is_enterprise_admin = True
         self.tenant_name = kwargs.get("tenantName", None)
 
         if not self.tenant_name:
@@ -345,20 +328,15 @@ class TenantHeaderView(JWTAuthApiView):
             raise AbortRequest("region_name not found !")
         if not self.tenant_name:
             raise AbortRequest("team_name not found !")
+        self.identity = IdentityContext.of(request)
         try:
-            self.tenant = Tenants.objects.get(tenant_name=self.tenant_name)
+            self.tenant = self.identity.load_tenant(self.tenant_name)
             self.team = self.tenant
         except Tenants.DoesNotExist:
             raise NotFound("tenant {0} not found".format(self.tenant_name))
 
-        if self.user.user_id == self.tenant.creater:
-            self.is_team_owner = True
-        self.enterprise = TenantEnterprise.objects.filter(enterprise_id=self.tenant.enterprise_id).first()
-        self.is_enterprise_admin = False
-        enterprise_user_perms = EnterpriseUserPerm.objects.filter(
-            enterprise_id=self.tenant.enterprise_id, user_id=self.user.user_id).first()
-        if enterprise_user_perms:
-            self.is_enterprise_admin = True
+        self.is_team_owner = self.identity.is_team_owner
+        self.enterprise = self.identity.enterprise
         self.get_perms()
         self.check_perms(request, *args, **kwargs)
 
@@ -384,7 +362,7 @@ class RegionTenantHeaderView(TenantHeaderView):
         self.region_name = self.response_region
         if not self.response_region:
             raise ImportError("region_name not found !")
-        region = region_repo.get_region_by_region_name(self.region_name)
+        region = self.identity.load_region(self.region_name)
         if not region:
             raise AbortRequest("region not found", "数据中心不存在", status_code=404, error_code=404)
         self.region = region
@@ -408,7 +386,7 @@ class ApplicationView(RegionTenantHeaderView):
     def initial(self, request, *args, **kwargs):
         super(ApplicationView, self).initial(request, *args, **kwargs)
         app_id = kwargs.get("app_id") if kwargs.get("app_id") else kwargs.get("group_id")
-        app = group_repo.get_group_by_pk(self.tenant.tenant_id, self.region_name, app_id)
+        app = self.identity.load_app(app_id)
         if not app:
             raise ServiceHandleException("app not found", "应用不存在", status_code=404)
         self.app = app
@@ -416,7 +394,7 @@ class ApplicationView(RegionTenantHeaderView):
 
         # update update_time if the http method is not a get.
         if request.method != 'GET':
-            group_repo.update_group_time(app_id)
+            app_update_time.touch(self.app_id)
 
 
 class AppUpgradeRecordView(ApplicationView):
@@ -459,7 +437,7 @@ class EnterpriseHeaderView(JWTAuthApiView):
         eid = kwargs.get("eid", None)
         if not eid:
             raise ImportError("enterprise_id not found !")
-        self.enterprise = enterprise_repo.get_enterprise_by_enterprise_id(eid)
+        self.enterprise = self.identity.load_enterprise(eid)
         if not self.enterprise:
             raise NotFound("enterprise id: {};enterprise not found".format(eid))
 
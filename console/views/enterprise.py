@@ -1,6 +1,7 @@
 # -*- coding: utf8 -*-
 import json
 import logging
+from functools import partial
 
 from console.exception.exceptions import (ExterpriseNotExistError, TenantNotExistError, UserNotExistError)
 from console.exception.main import ServiceHandleException
@@ -16,9 +17,12 @@ from console.services.perm_services import user_kind_role_service
 from console.services.region_services import region_services
 from console.services.team_services import team_services
 from console.views.base import EnterpriseAdminView, JWTAuthApiView, EnterpriseHeaderView
+from goodrain_web.dbpool.pool import pool_stats
 from rest_framework import status
 from rest_framework.response import Response
+from www.apiclient.circuitbreaker import circuit_breakers
 from www.apiclient.regionapi import RegionInvokeApi
+from www.apiclient.singleflight import single_flight
 from www.utils.return_message import general_message
 
 region_api = RegionInvokeApi()
@@ -271,9 +275,17 @@ class EnterpriseMonitor(JWTAuthApiView):
             result = general_message(404, "no found", None)
             return Response(result, status=status.HTTP_200_OK)
         region_num = len(regions)
-        for region in regions:
+        calls = {
+            region.region_name: partial(region_api.get_region_resources, enterprise_id, region=region.region_name)
+            for region in regions
+        }
+        results = region_api.fan_out(calls)
+        for result in results.values():
+            if result.error:
+                logger.debug(result.error)
+                continue
             try:
-                res, body = region_api.get_region_resources(enterprise_id, region=region.region_name)
+                res, body = result.value
                 if res.get("status") == 200:
                     region_memory_total += body["bean"]["cap_mem"]
                     region_memory_used += body["bean"]["req_mem"]
@@ -434,13 +446,28 @@ class EnterpriseRegionDashboard(EnterpriseAdminView):
                 return Response({}, status=status.HTTP_404_NOTFOUND)
             full_path = request.get_full_path()
             path = full_path[full_path.index("/dashboard/") + 11:len(full_path)]
-            response = region_api.proxy(request, '/kubernetes/dashboard/' + path, region['region_name'])
+            response = region_api.proxy(request, '/kubernetes/dashboard/' + path, region['region_name'], stream=True)
         except Exception as exc:
             response = self.handle_exception(exc)
         self.response = self.finalize_response(request, response, *args, **kwargs)
         return self.response
 
 
+class EnterpriseRegionApiStatusView(EnterpriseAdminView):
+    def get(self, request, enterprise_id, *args, **kwargs):
+        """
+        region api 客户端状态: 各集群的熔断状态及合并请求统计, 以及本进程的数据库连接池统计
+        """
+        regions = region_repo.get_regions_by_enterprise_id(enterprise_id)
+        bean = {
+            "circuits": circuit_breakers.list([region.region_name for region in regions]),
+            "coalesce": single_flight.stats(),
+            "db_pool": pool_stats(),
+        }
+        result = general_message(200, "success", "获取成功", bean=bean)
+        return Response(result, status=status.HTTP_200_OK)
+
+
 class EnterpriseUserTeamRoleView(EnterpriseHeaderView):
     def post(self, request, eid, user_id, tenant_name, *args, **kwargs):
         role_ids = request.data.get('role_ids', [])
@@ -416,8 +416,28 @@ class TeamServiceOverViewView(RegionTenantHeaderView):
         if not self.team:
             result = general_message(400, "failed", "该团队不存在")
             return Response(result, status=400)
-        services_list = base_service.get_fuzzy_services_list(
-            team_id=self.team.tenant_id, region_name=self.response_region, query_key=query_key, fields=fields, order=order)
+        total = None
+        if service_status == "all":
+            # without a status filter, only the components of the page are read and asked for their status
+            total = base_service.count_fuzzy_services(self.team.tenant_id, self.response_region, query_key)
+            paginator = Paginator(range(total), page_size)
+            try:
+                page = paginator.validate_number(page)
+            except PageNotAnInteger:
+                page = 1
+            except EmptyPage:
+                page = paginator.num_pages
+            services_list = base_service.get_fuzzy_services_list(
+                team_id=self.team.tenant_id,
+                region_name=self.response_region,
+                query_key=query_key,
+                fields=fields,
+                order=order,
+                page=page,
+                page_size=paginator.per_page)
+        else:
+            services_list = base_service.get_fuzzy_services_list(
+                team_id=self.team.tenant_id, region_name=self.response_region, query_key=query_key, fields=fields, order=order)
         if services_list:
             try:
                 service_ids = [service["service_id"] for service in services_list]
@@ -455,14 +475,16 @@ class TeamServiceOverViewView(RegionTenantHeaderView):
                             if service["status"] == "closed" or service["status"] == "undeploy":
                                 service["min_memory"] = 0
                             result.append(service)
-                paginator = Paginator(result, page_size)
-                try:
-                    result = paginator.page(page).object_list
-                except PageNotAnInteger:
-                    result = paginator.page(1).object_list
-                except EmptyPage:
-                    result = paginator.page(paginator.num_pages).object_list
-                result = general_message(200, "query user success", "查询用户成功", list=result, total=paginator.count)
+                if total is None:
+                    paginator = Paginator(result, page_size)
+                    try:
+                        result = paginator.page(page).object_list
+                    except PageNotAnInteger:
+                        result = paginator.page(1).object_list
+                    except EmptyPage:
+                        result = paginator.page(paginator.num_pages).object_list
+                    total = paginator.count
+                result = general_message(200, "query user success", "查询用户成功", list=result, total=total)
             except Exception as e:
                 logger.exception(e)
                 return Response(services_list, status=200)
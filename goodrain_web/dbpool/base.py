@@ -0,0 +1,60 @@
+# -*- coding: utf8 -*-
+"""
+  django.db.backends.mysql with pooled connections.
+
+  django opens one connection per thread, which is one per greenlet under gevent, and
+  closes it at the end of every request. This backend takes the connections from a
+  ConnectionPool per database and worker process instead, and gives them back on close.
+
+  settings: DATABASES[alias]["POOL"] = {"MAX_SIZE": 10, "MAX_LIFETIME": 1800, "TIMEOUT": 10, "PING_INTERVAL": 30}
+
+  the pool is off unless DB_POOL=true. A request keeps its connection until request_finished,
+  and every fan out greenlet takes one more, so a worker needs up to its concurrent requests
+  (gunicorn --worker-connections with gevent) times (1 + REGION_FAN_OUT_CONCURRENCY)
+  connections. Beyond MAX_SIZE, requests wait up to TIMEOUT and then fail with PoolTimeout.
+  Size MAX_SIZE for the peak load of a worker, and keep workers * MAX_SIZE below the
+  max_connections of MySQL; the pool only pays off where opening connections is expensive,
+  e.g. with TLS or a remote database.
+"""
+import logging
+
+from django.db.backends.mysql import base as mysql_base
+
+from goodrain_web.dbpool.pool import get_pool
+
+logger = logging.getLogger('default')
+
+
+class DatabaseWrapper(mysql_base.DatabaseWrapper):
+    def __init__(self, *args, **kwargs):
+        super(DatabaseWrapper, self).__init__(*args, **kwargs)
+        self.pooled = None
+
+    def get_new_connection(self, conn_params):
+        parent = super(DatabaseWrapper, self)
+        pool = get_pool(self.alias, self.settings_dict, lambda: parent.get_new_connection(conn_params))
+        self.pooled = pool.acquire()
+        return self.pooled.connection
+
+    def init_connection_state(self):
+        # session variables survive in the pooled connection
+        if self.pooled is not None and self.pooled.initialized:
+            return
+        super(DatabaseWrapper, self).init_connection_state()
+        if self.pooled is not None:
+            self.pooled.initialized = True
+
+    def _close(self):
+        if self.connection is None or self.pooled is None:
+            return super(DatabaseWrapper, self)._close()
+        pooled, self.pooled = self.pooled, None
+        pool = get_pool(self.alias, self.settings_dict, None)
+        # django keeps using the connection of a block closed in a transaction, it can not be shared
+        discard = self.in_atomic_block or (self.errors_occurred and not self.is_usable())
+        if not discard and not self.get_autocommit():
+            try:
+                self.connection.rollback()
+            except Exception as e:
+                logger.debug("rollback pooled database connection: {}".format(e))
+                discard = True
+        pool.release(pooled, discard=discard)
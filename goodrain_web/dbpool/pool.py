@@ -0,0 +1,172 @@
+# -*- coding: utf8 -*-
+"""
+  a bounded pool of database connections, shared by the greenlets of a worker.
+"""
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger('default')
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class PooledConnection(object):
+    def __init__(self, connection):
+        self.connection = connection
+        self.created_at = time.time()
+        self.released_at = self.created_at
+        # whether the session variables of the database wrapper are set
+        self.initialized = False
+
+
+class ConnectionPool(object):
+    """
+    Hand out at most max_size connections at once, callers wait up to timeout for
+    a connection to be released.
+
+    Idle connections are reused last in first out. A connection is closed instead of
+    reused once it is older than max_lifetime, and pinged before reuse once it was
+    idle for longer than ping_interval, so connections dropped by the server are not
+    handed out.
+
+    threading primitives are patched by gevent, so waiting only blocks the greenlet.
+    """
+
+    def __init__(self, connect, max_size=10, max_lifetime=1800, timeout=10, ping_interval=30):
+        self._connect = connect
+        self.max_size = max_size
+        self.max_lifetime = max_lifetime
+        self.timeout = timeout
+        self.ping_interval = ping_interval
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._idle = deque()
+        self.in_use = 0
+        self.waits = 0
+        self.wait_time = 0.0
+        self.timeouts = 0
+        self.created = 0
+        self.closed = 0
+
+    def acquire(self):
+        """:return: a PooledConnection, release it when done"""
+        if not self._slots.acquire(False):
+            start = time.time()
+            acquired = self._slots.acquire(timeout=self.timeout)
+            with self._lock:
+                self.waits += 1
+                self.wait_time += time.time() - start
+                if not acquired:
+                    self.timeouts += 1
+            if not acquired:
+                raise PoolTimeout("no database connection released in {} seconds".format(self.timeout))
+        try:
+            pooled = self._take_idle()
+            if pooled is None:
+                pooled = PooledConnection(self._connect())
+                with self._lock:
+                    self.created += 1
+        except BaseException:
+            self._slots.release()
+            raise
+        with self._lock:
+            self.in_use += 1
+        return pooled
+
+    def _take_idle(self):
+        while True:
+            with self._lock:
+                if not self._idle:
+                    return None
+                pooled = self._idle.pop()
+            now = time.time()
+            if now - pooled.created_at >= self.max_lifetime:
+                self._close(pooled)
+            elif now - pooled.released_at >= self.ping_interval and not self._ping(pooled):
+                self._close(pooled)
+            else:
+                return pooled
+
+    @staticmethod
+    def _ping(pooled):
+        try:
+            pooled.connection.ping()
+            return True
+        except Exception as e:
+            logger.debug("drop a broken database connection: {}".format(e))
+            return False
+
+    def release(self, pooled, discard=False):
+        """give a connection back, discard it if its state is unknown"""
+        with self._lock:
+            self.in_use -= 1
+        try:
+            if discard or time.time() - pooled.created_at >= self.max_lifetime:
+                self._close(pooled)
+            else:
+                pooled.released_at = time.time()
+                with self._lock:
+                    self._idle.append(pooled)
+        finally:
+            self._slots.release()
+
+    def _close(self, pooled):
+        with self._lock:
+            self.closed += 1
+        try:
+            pooled.connection.close()
+        except Exception as e:
+            logger.debug("close database connection: {}".format(e))
+
+    def clear(self):
+        """close the idle connections"""
+        with self._lock:
+            idle, self._idle = list(self._idle), deque()
+        for pooled in idle:
+            self._close(pooled)
+
+    def stats(self):
+        return {
+            "max_size": self.max_size,
+            "in_use": self.in_use,
+            "idle": len(self._idle),
+            "waits": self.waits,
+            "wait_time": round(self.wait_time, 3),
+            "timeouts": self.timeouts,
+            "created": self.created,
+            "closed": self.closed,
+        }
+
+
+_pools_lock = threading.Lock()
+_pools = {}
+
+
+def get_pool(alias, settings_dict, connect):
+    # a forked gunicorn worker must not share the connections of its parent
+    key = (alias, os.getpid())
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                options = settings_dict.get("POOL") or {}
+                pool = ConnectionPool(
+                    connect,
+                    max_size=int(options.get("MAX_SIZE", 10)),
+                    max_lifetime=float(options.get("MAX_LIFETIME", 1800)),
+                    timeout=float(options.get("TIMEOUT", 10)),
+                    ping_interval=float(options.get("PING_INTERVAL", 30)))
+                _pools[key] = pool
+    return pool
+
+
+def pool_stats():
+    """stats of the pools of this worker, by database alias"""
+    pid = os.getpid()
+    return {alias: pool.stats() for (alias, pool_pid), pool in list(_pools.items()) if pool_pid == pid}
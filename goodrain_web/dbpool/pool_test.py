@@ -0,0 +1,75 @@
+# -*- coding: utf8 -*-
+import time
+
+import pytest
+
+from goodrain_web.dbpool.pool import ConnectionPool, PoolTimeout
+
+
+class FakeConnection(object):
+    def __init__(self):
+        self.closed = False
+        self.broken = False
+
+    def ping(self):
+        if self.broken:
+            raise Exception("server has gone away")
+
+    def close(self):
+        self.closed = True
+
+
+def test_reuse_released_connection():
+    pool = ConnectionPool(FakeConnection, max_size=2)
+    pooled = pool.acquire()
+    pool.release(pooled)
+    assert pool.acquire() is pooled
+    assert pool.stats()["created"] == 1
+    assert pool.stats()["in_use"] == 1
+
+
+def test_timeout_when_exhausted():
+    pool = ConnectionPool(FakeConnection, max_size=1, timeout=0.05)
+    pool.acquire()
+    with pytest.raises(PoolTimeout):
+        pool.acquire()
+    stats = pool.stats()
+    assert stats["waits"] == 1
+    assert stats["timeouts"] == 1
+
+
+def test_discard_and_lifetime():
+    pool = ConnectionPool(FakeConnection, max_size=1, max_lifetime=60)
+    pooled = pool.acquire()
+    pool.release(pooled, discard=True)
+    assert pooled.connection.closed
+    assert pool.acquire() is not pooled
+
+    pool = ConnectionPool(FakeConnection, max_size=1, max_lifetime=60)
+    pooled = pool.acquire()
+    pool.release(pooled)
+    pooled.created_at = time.time() - 61
+    assert pool.acquire() is not pooled
+    assert pooled.connection.closed
+    assert pool.stats()["closed"] == 1
+
+
+def test_ping_idle_connection():
+    pool = ConnectionPool(FakeConnection, max_size=1, ping_interval=10)
+    pooled = pool.acquire()
+    pool.release(pooled)
+    pooled.released_at = time.time() - 11
+    pooled.connection.broken = True
+    assert pool.acquire() is not pooled
+    assert pooled.connection.closed
+
+
+def test_failed_connect_frees_slot():
+    def connect():
+        raise Exception("can not connect")
+
+    pool = ConnectionPool(connect, max_size=1, timeout=0.05)
+    for _ in range(2):
+        with pytest.raises(Exception, match="can not connect"):
+            pool.acquire()
+    assert pool.stats()["timeouts"] == 0
@@ -1,10 +1,20 @@
+import json
+import re
+import time
+from collections import Counter
+
 from django import http
 from django.conf import settings
+from django.db import connections
 from rest_framework.response import Response
 
+from console.utils.cache import tag_cache
+from goodrain_web import router
+
 import logging
 
 logger = logging.getLogger('default')
+request_logger = logging.getLogger('request_api')
 
 
 class ErrorPage(object):
@@ -28,3 +38,107 @@ class ErrorPage(object):
             else:
                 return http.HttpResponse("<h1>server error</h1>", status=500)
         return response
+
+
+class RequestMemo(object):
+    """
+    memoize the cached repository lookups of a request, see console.utils.cache.TagCache
+    """
+
+    def process_request(self, request):
+        tag_cache.begin_request()
+
+    def process_response(self, request, response):
+        tag_cache.end_request()
+        return response
+
+
+class ReplicaStickiness(object):
+    """
+    read your writes with read replicas: a request which wrote sets a cookie, and the
+    requests of the client read from the primary until it expires, after
+    DATABASE_REPLICA_STICKY_SECONDS, the time the replicas are assumed to lag at most.
+    """
+    cookie_name = "db_primary_until"
+
+    def process_request(self, request):
+        try:
+            until = float(request.COOKIES.get(self.cookie_name) or 0)
+        except ValueError:
+            until = 0
+        router.reset(pinned=until > time.time())
+
+    def process_response(self, request, response):
+        if router.has_written() and router.read_replicas():
+            seconds = settings.DATABASE_REPLICA_STICKY_SECONDS
+            response.set_cookie(self.cookie_name, str(int(time.time() + seconds)), max_age=seconds, httponly=True)
+        router.reset()
+        return response
+
+
+_literal = re.compile(r"'(?:[^'\\]|\\.|'')*'|\b\d+(?:\.\d+)?\b")
+_in_list = re.compile(r"\((?:\s*\?\s*,)+\s*\?\s*\)")
+
+
+def fingerprint(sql):
+    """the shape of a statement, its literals replaced by ?"""
+    sql = _literal.sub("?", sql)
+    return _in_list.sub("(?)", sql)
+
+
+class QueryStats(object):
+    """
+    count the queries and the database time of every request, with QUERY_STATS_ENABLE.
+
+    A statement shape run QUERY_STATS_REPEAT_THRESHOLD times or more in a request, a
+    query in a loop (N+1), is logged to request_api as a warning. With QUERY_STATS_REPORT
+    or DEBUG, the counts of every request are also returned in a Server-Timing header and
+    logged; they tell anyone how the database is doing, so they are off by default.
+    """
+
+    def process_request(self, request):
+        if not settings.QUERY_STATS_ENABLE:
+            return
+        request._query_stats_start = time.time()
+        for conn in connections.all():
+            conn.queries_log.clear()
+            conn._query_stats_debug_cursor = conn.force_debug_cursor
+            conn.force_debug_cursor = True
+
+    def process_response(self, request, response):
+        start = getattr(request, "_query_stats_start", None)
+        if start is None:
+            return response
+        queries = []
+        for conn in connections.all():
+            if hasattr(conn, "_query_stats_debug_cursor"):
+                conn.force_debug_cursor = conn._query_stats_debug_cursor
+                del conn._query_stats_debug_cursor
+            queries.extend(conn.queries_log)
+            conn.queries_log.clear()
+        db_time = sum(float(query["time"]) for query in queries) * 1000
+        total_time = (time.time() - start) * 1000
+        report = settings.QUERY_STATS_REPORT or settings.DEBUG
+        if report:
+            response["Server-Timing"] = 'db;dur={:.1f};desc="{} queries", total;dur={:.1f}'.format(
+                db_time, len(queries), total_time)
+
+        stats = {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "queries": len(queries),
+            "db_ms": round(db_time, 1),
+            "total_ms": round(total_time, 1),
+        }
+        threshold = settings.QUERY_STATS_REPEAT_THRESHOLD
+        repeated = [{
+            "sql": sql,
+            "count": count
+        } for sql, count in Counter(fingerprint(query["sql"]) for query in queries).most_common() if count >= threshold]
+        if repeated:
+            stats["repeated"] = repeated
+            request_logger.warning("n+1 queries: {}".format(json.dumps(stats)))
+        elif report:
+            request_logger.info("query stats: {}".format(json.dumps(stats)))
+        return response
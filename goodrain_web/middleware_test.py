@@ -0,0 +1,66 @@
+# -*- coding: utf8 -*-
+import pytest
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+
+from goodrain_web.middleware import QueryStats, fingerprint
+from www.models.main import Tenants
+
+
+def test_fingerprint():
+    assert fingerprint("SELECT * FROM t WHERE id = 12 AND name = 'a''b'") == "SELECT * FROM t WHERE id = ? AND name = ?"
+    assert fingerprint("SELECT * FROM t1 WHERE id IN (1, 2, 'x')") == "SELECT * FROM t1 WHERE id IN (?)"
+
+
+@pytest.mark.django_db
+@override_settings(QUERY_STATS_ENABLE=True, QUERY_STATS_REPORT=True, QUERY_STATS_REPEAT_THRESHOLD=3)
+def test_query_stats(mocker):
+    warning = mocker.patch("goodrain_web.middleware.request_logger.warning")
+    middleware = QueryStats()
+    request = RequestFactory().get("/console/teams")
+    middleware.process_request(request)
+    for tenant_id in range(3):
+        list(Tenants.objects.filter(tenant_id=str(tenant_id)))
+    response = middleware.process_response(request, HttpResponse())
+
+    assert response["Server-Timing"].startswith("db;dur=")
+    assert '"3 queries"' in response["Server-Timing"]
+    assert warning.call_count == 1
+    assert '"count": 3' in warning.call_args[0][0]
+    assert not connection.force_debug_cursor
+
+
+@pytest.mark.django_db
+@override_settings(QUERY_STATS_ENABLE=True, QUERY_STATS_REPORT=False, DEBUG=False, QUERY_STATS_REPEAT_THRESHOLD=3)
+def test_query_stats_not_reported_by_default(mocker):
+    info = mocker.patch("goodrain_web.middleware.request_logger.info")
+    warning = mocker.patch("goodrain_web.middleware.request_logger.warning")
+    middleware = QueryStats()
+
+    request = RequestFactory().get("/console/teams")
+    middleware.process_request(request)
+    list(Tenants.objects.all())
+    response = middleware.process_response(request, HttpResponse())
+    assert not response.has_header("Server-Timing")
+    assert info.call_count == 0
+
+    # n+1 queries are still reported
+    middleware.process_request(request)
+    for tenant_id in range(3):
+        list(Tenants.objects.filter(tenant_id=str(tenant_id)))
+    response = middleware.process_response(request, HttpResponse())
+    assert not response.has_header("Server-Timing")
+    assert warning.call_count == 1
+
+
+@pytest.mark.django_db
+@override_settings(QUERY_STATS_ENABLE=False)
+def test_query_stats_disabled():
+    middleware = QueryStats()
+    request = RequestFactory().get("/console/teams")
+    middleware.process_request(request)
+    assert not connection.force_debug_cursor
+    list(Tenants.objects.all())
+    response = middleware.process_response(request, HttpResponse())
+    assert not response.has_header("Server-Timing")
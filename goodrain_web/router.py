@@ -1,7 +1,69 @@
+import random
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+# patched by gevent, so every greenlet serves its own request
+_state = threading.local()
+
+
+def read_replicas():
+    return getattr(settings, "DATABASE_READ_REPLICAS", None) or []
+
+
+def pin_primary():
+    """read from the primary for the rest of the request"""
+    _state.pinned = True
+
+
+@contextmanager
+def read_primary():
+    """
+    read from the primary inside the block, e.g. to fill a cache which is invalidated
+    on commit and must not be refilled from a replica which lags behind.
+    """
+    pinned = getattr(_state, "pinned", False)
+    _state.pinned = True
+    try:
+        yield
+    finally:
+        # a write inside the block pins the rest of the request
+        _state.pinned = pinned or has_written()
+
+
+def reset(pinned=False):
+    _state.pinned = pinned
+    _state.wrote = False
+
+
+def has_written():
+    return getattr(_state, "wrote", False)
+
+
+def read_db(db_alias=DEFAULT_DB_ALIAS):
+    """
+    the database to read from instead of db_alias: a read replica, unless the request
+    wrote or is pinned to the primary, or a transaction is open on the primary.
+    """
+    replicas = read_replicas()
+    if db_alias != DEFAULT_DB_ALIAS or not replicas or getattr(_state, "pinned", False):
+        return db_alias
+    # a transaction must see its own writes
+    if transaction.get_connection(db_alias).in_atomic_block:
+        return db_alias
+    return random.choice(replicas)
+
+
 class MultiDbRouter(object):
     """
     A router to control all database operations on models in the
     auth application.
+
+    Models without in_db are read from the read replicas of DATABASE_READ_REPLICAS,
+    if any. Once a request writes, it reads from the primary until it ends, see
+    goodrain_web.middleware.ReplicaStickiness.
     """
 
     def db_for_read(self, model, **hints):
@@ -10,7 +72,8 @@ class MultiDbRouter(object):
         """
         if hasattr(model._meta, 'in_db'):
             return model._meta.in_db
-        return None
+        alias = read_db()
+        return None if alias == DEFAULT_DB_ALIAS else alias
 
     def db_for_write(self, model, **hints):
         """
@@ -18,6 +81,17 @@ class MultiDbRouter(object):
         """
         if hasattr(model._meta, 'in_db'):
             return model._meta.in_db
+        _state.wrote = True
+        pin_primary()
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        """
+        Objects read from a replica may be related to objects of the primary.
+        """
+        primary = [DEFAULT_DB_ALIAS] + read_replicas()
+        if obj1._state.db in primary and obj2._state.db in primary:
+            return True
         return None
 
     def allow_migrate(self, db, app_label, model=None, **hints):
@@ -25,6 +99,8 @@ class MultiDbRouter(object):
         Make sure the auth app only appears in the 'auth_db'
         database.
         """
+        if db in read_replicas():
+            return False
         if model and model._meta:
             if hasattr(model._meta, 'in_db'):
                 return model._meta.in_db == db
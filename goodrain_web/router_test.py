@@ -0,0 +1,76 @@
+# -*- coding: utf8 -*-
+import time
+
+import pytest
+
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+
+from goodrain_web import router
+from goodrain_web.middleware import ReplicaStickiness
+from goodrain_web.router import MultiDbRouter
+from www.models.main import Tenants
+
+
+@override_settings(DATABASE_READ_REPLICAS=["replica_0"])
+def test_read_from_replica_until_write():
+    router.reset()
+    db_router = MultiDbRouter()
+    assert db_router.db_for_read(Tenants) == "replica_0"
+    assert router.read_db() == "replica_0"
+    assert db_router.db_for_write(Tenants) is None
+    assert db_router.db_for_read(Tenants) is None
+    assert router.read_db() == "default"
+    router.reset()
+
+
+def test_without_replicas():
+    router.reset()
+    assert MultiDbRouter().db_for_read(Tenants) is None
+    assert router.read_db() == "default"
+
+
+@override_settings(DATABASE_READ_REPLICAS=["replica_0"], DATABASE_REPLICA_STICKY_SECONDS=5)
+def test_sticky_cookie():
+    middleware = ReplicaStickiness()
+    request = RequestFactory().post("/")
+    middleware.process_request(request)
+    MultiDbRouter().db_for_write(Tenants)
+    response = middleware.process_response(request, HttpResponse())
+    cookie = response.cookies[ReplicaStickiness.cookie_name]
+    assert float(cookie.value) > time.time()
+
+    request = RequestFactory().get("/")
+    request.COOKIES[ReplicaStickiness.cookie_name] = cookie.value
+    middleware.process_request(request)
+    assert router.read_db() == "default"
+    response = middleware.process_response(request, HttpResponse())
+    assert ReplicaStickiness.cookie_name not in response.cookies
+
+    middleware.process_request(RequestFactory().get("/"))
+    assert router.read_db() == "replica_0"
+    router.reset()
+
+
+@pytest.mark.django_db(transaction=True)
+@override_settings(DATABASE_READ_REPLICAS=["replica_0"])
+def test_caches_filled_from_primary():
+    from console.repositories.region_repo import region_repo
+    from console.services.perm_cache import PermCache
+    from console.utils.cache import tag_cache
+    from www.apiclient.regioncache import RegionCache
+    router.reset()
+    tag_cache.clear()
+
+    # replica_0 is not configured, reading from it would fail
+    assert RegionCache().get_region("rainbond") is None
+    assert region_repo.get_region_by_region_name("rainbond") is None
+    assert PermCache().get_enterprise_perms("eid", 1, router.read_db) == "default"
+    assert RegionCache().get_access_info("team", "rainbond", lambda *args: router.read_db()) == "default"
+    # the request itself still reads from the replicas
+    assert router.read_db() == "replica_0"
+
+    with router.read_primary():
+        MultiDbRouter().db_for_write(Tenants)
+    assert router.read_db() == "default"
+    router.reset()
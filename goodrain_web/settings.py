@@ -91,15 +91,42 @@ DATABASES = {
 if DATABASE_TYPE == 'mysql':
     DATABASES = {
         'default': {
-            'ENGINE': 'django.db.backends.mysql',
+            # DB_POOL=true pools the connections per worker, see goodrain_web.dbpool.base before sizing it
+            'ENGINE': 'goodrain_web.dbpool' if os.environ.get('DB_POOL') == 'true' else 'django.db.backends.mysql',
             'NAME': os.environ.get('MYSQL_DB') or "console",
             'USER': os.environ.get('MYSQL_USER') or "root",
             'PASSWORD': os.environ.get('MYSQL_PASS') or "",
             'HOST': os.environ.get('MYSQL_HOST') or "127.0.0.1",
             'PORT': os.environ.get('MYSQL_PORT') or "3306",
+            'POOL': {
+                'MAX_SIZE': os.environ.get('DB_POOL_SIZE') or 10,
+                'MAX_LIFETIME': os.environ.get('DB_POOL_MAX_LIFETIME') or 1800,
+                'TIMEOUT': os.environ.get('DB_POOL_TIMEOUT') or 10,
+                'PING_INTERVAL': os.environ.get('DB_POOL_PING_INTERVAL') or 30,
+            },
         }
     }
 
+# read only copies of the default database, MYSQL_READ_REPLICAS=host[:port],...
+DATABASE_READ_REPLICAS = []
+if DATABASE_TYPE == 'mysql':
+    for index, address in enumerate(filter(None, (os.environ.get('MYSQL_READ_REPLICAS') or "").split(","))):
+        host, _, port = address.strip().partition(":")
+        alias = "replica_{}".format(index)
+        DATABASES[alias] = dict(DATABASES['default'], HOST=host, PORT=port or DATABASES['default']['PORT'])
+        DATABASES[alias]['TEST'] = {'MIRROR': 'default'}
+        DATABASE_READ_REPLICAS.append(alias)
+# how long a client reads from the primary after a write
+DATABASE_REPLICA_STICKY_SECONDS = int(os.environ.get('DB_REPLICA_STICKY_SECONDS') or 5)
+
+# the query count and database time of every request in a Server-Timing header and the log
+QUERY_STATS_REPORT = os.environ.get('QUERY_STATS_REPORT') == 'true'
+# N+1 query warnings, see goodrain_web.middleware.QueryStats; it logs every query of a
+# request, so it is off in production unless QUERY_STATS_ENABLE=true
+QUERY_STATS_ENABLE = os.environ.get('QUERY_STATS_ENABLE', 'true' if DEBUG else 'false') == 'true' or QUERY_STATS_REPORT
+# a statement run this many times in a request is reported as N+1
+QUERY_STATS_REPEAT_THRESHOLD = int(os.environ.get('QUERY_STATS_REPEAT_THRESHOLD') or 10)
+
 APP_SERVICE_API = {'url': os.environ.get('APP_CLOUD_API', 'http://api.goodrain.com:80'), 'apitype': 'app service'}
 
 SSO_LOGIN = os.getenv("SSO_LOGIN", "").upper()
@@ -200,7 +227,10 @@ if IS_OPEN_API:
         },
     }
 MIDDLEWARE_CLASSES = (
+    'goodrain_web.middleware.QueryStats',
     'goodrain_web.middleware.ErrorPage',
+    'goodrain_web.middleware.RequestMemo',
+    'goodrain_web.middleware.ReplicaStickiness',
     'django.middleware.gzip.GZipMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'console.services.auth.middleware.AuthenticationMiddleware',
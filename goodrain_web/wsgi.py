@@ -15,3 +15,12 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "goodrain_web.settings")
 
 application = get_wsgi_application()
 application = DjangoWhiteNoise(application)
+
+
+def start_background_jobs():
+    # the models can only be imported once the apps are ready
+    from console.services.event_archive import event_archiver
+    event_archiver.start()
+
+
+start_background_jobs()
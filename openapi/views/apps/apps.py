@@ -143,7 +143,8 @@ class AppInfoView(TeamAppAPIView):
                 region=self.app.region_name,
                 tenant_name=self.team.tenant_name,
                 service_ids=service_ids,
-                enterprise_id=self.team.enterprise_id)
+                enterprise_id=self.team.enterprise_id,
+                use_cache=False)
             status_list = [x for x in [x["status"] for x in status_list] if x not in ["closed", "undeploy"]]
             if len(status_list) > 0:
                 raise ServiceHandleException(
@@ -20,6 +20,7 @@ from openapi.auth.permissions import OpenAPIPermissions
 from openapi.views.exceptions import ErrEnterpriseNotFound, ErrRegionNotFound
 from www.models.main import TenantEnterprise, TenantServiceInfo
 from console.utils import perms
+from console.utils.perm_mask import PermissionMask
 
 
 class ListAPIView(generics.ListAPIView):
@@ -37,15 +38,16 @@ class BaseOpenAPIView(APIView):
         self.region_name = None
         self.regions = None
         self.user = None
+        self.user_perm_mask = PermissionMask()
 
     def check_perms(self, request, *args, **kwargs):
         if kwargs.get("__message"):
-            request_perms = kwargs["__message"][request.META.get("REQUEST_METHOD").lower()]["perms"]
-            if request_perms and (len(set(request_perms) & set(self.user_perms)) != len(set(request_perms))):
+            request_perms = PermissionMask.route(kwargs["__message"], request.META.get("REQUEST_METHOD"))
+            if not self.user_perm_mask.includes(request_perms):
                 raise NoPermissionsError
 
     def has_perms(self, request_perms):
-        if request_perms and (len(set(request_perms) & set(self.user_perms)) != len(set(request_perms))):
+        if request_perms and not self.user_perm_mask.includes(PermissionMask.of(request_perms)):
             raise NoPermissionsError
 
     def get_perms(self):
@@ -63,6 +65,7 @@ class BaseOpenAPIView(APIView):
                 if role_perms:
                     self.user_perms = role_perms.values_list("perm_code", flat=True)
         self.user_perms = list(set(self.user_perms))
+        self.user_perm_mask = PermissionMask(self.user_perms)
 
     def initial(self, request, *args, **kwargs):
         super(BaseOpenAPIView, self).initial(request, *args, **kwargs)
@@ -113,6 +116,7 @@ class TeamNoRegionAPIView(BaseOpenAPIView):
                     if team_role_perms:
                         self.user_perms.extend(list(team_role_perms.values_list("perm_code", flat=True)))
         self.user_perms = list(set(self.user_perms))
+        self.user_perm_mask = PermissionMask(self.user_perms)
 
     def initial(self, request, *args, **kwargs):
         request.user.is_administrator = False
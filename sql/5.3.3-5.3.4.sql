@@ -0,0 +1,38 @@
+-- 热点查询的联合索引，与模型 Meta.indexes 保持一致
+CREATE INDEX `service_domain_service_idx` ON `service_domain` (`service_id`, `container_port`);
+CREATE INDEX `service_domain_tenant_idx` ON `service_domain` (`tenant_id`, `region_id`);
+CREATE INDEX `service_domain_domain_idx` ON `service_domain` (`domain_name`);
+CREATE INDEX `service_env_var_tenant_idx` ON `tenant_service_env_var` (`tenant_id`, `service_id`);
+CREATE INDEX `services_port_tenant_idx` ON `tenant_services_port` (`tenant_id`, `service_id`);
+CREATE INDEX `service_group_rel_service_idx` ON `service_group_relation` (`service_id`);
+CREATE INDEX `service_group_rel_group_idx` ON `service_group_relation` (`group_id`);
+CREATE INDEX `service_event_tenant_idx` ON `service_event` (`tenant_id`, `start_time`);
+CREATE INDEX `service_event_service_idx` ON `service_event` (`service_id`, `start_time`);
+CREATE INDEX `service_event_event_idx` ON `service_event` (`event_id`);
+CREATE INDEX `service_event_tenant_id_idx` ON `service_event` (`tenant_id`, `ID`);
+CREATE INDEX `app_version_enterprise_idx` ON `rainbond_center_app_version` (`enterprise_id`, `app_id`, `version`);
+CREATE INDEX `app_version_app_idx` ON `rainbond_center_app_version` (`app_id`, `version`);
+CREATE INDEX `app_version_record_idx` ON `rainbond_center_app_version` (`record_id`);
+
+-- 已完成的历史组件事件的归档表，见 console/services/event_archive.py
+CREATE TABLE IF NOT EXISTS `service_event_archive` (
+  `ID` int(11) NOT NULL AUTO_INCREMENT PRIMARY KEY,
+  `event_id` varchar(32) NOT NULL,
+  `tenant_id` varchar(32) NOT NULL,
+  `service_id` varchar(32) NOT NULL,
+  `user_name` varchar(64) NOT NULL,
+  `start_time` datetime(6) NOT NULL,
+  `end_time` datetime(6) DEFAULT NULL,
+  `type` varchar(20) NOT NULL,
+  `status` varchar(20) NOT NULL,
+  `final_status` varchar(20) NOT NULL,
+  `message` longtext NOT NULL,
+  `deploy_version` varchar(20) NOT NULL,
+  `old_deploy_version` varchar(20) NOT NULL,
+  `code_version` varchar(200) NOT NULL,
+  `old_code_version` varchar(200) NOT NULL,
+  `region` varchar(64) NOT NULL,
+  KEY `event_archive_service_idx` (`service_id`, `start_time`),
+  KEY `event_archive_tenant_id_idx` (`tenant_id`, `ID`),
+  KEY `event_archive_event_idx` (`event_id`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8;
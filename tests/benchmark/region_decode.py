@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+  cpu cost of decoding region api responses, per decode mode of RegionApiBaseHttpClient._check_status.
+
+  python -m tests.benchmark.region_decode [--size 500] [--number 50] [recorded.json ...]
+
+  recorded.json are response bodies saved from a region api, e.g.
+  curl -k --cert client.pem --key client.key.pem https://<region>:8443/v2/tenants/<tenant>/pods?service_ids=...
+  without them, payloads shaped like the pods, services_status and events responses are generated.
+"""
+import argparse
+import copy
+import json
+import os
+import timeit
+
+_POD = {
+    "pod_name": "gr5f3a2c-0",
+    "pod_status": "RUNNING",
+    "pod_ip": "10.42.0.17",
+    "node_name": "node-1",
+    "service_id": "",
+    "container": {
+        "gr5f3a2c": {
+            "memory_limit": "536870912",
+            "memory_usage": "128450560",
+            "cpu_request": "100",
+            "status": {
+                "state": "running",
+                "reason": "",
+                "started": "2021-06-01T08:00:00Z"
+            }
+        },
+        "POD": {
+            "memory_limit": "0",
+            "memory_usage": "40960"
+        }
+    },
+    "labels": {
+        "service_id": "",
+        "service_alias": "gr5f3a2c",
+        "tenant_name": "team",
+        "version": "20210601080000"
+    },
+    "events": [{
+        "type": "Normal",
+        "reason": "Started",
+        "message": "Started container",
+        "age": "5m"
+    }],
+}
+
+_STATUS = {
+    "service_id": "",
+    "status": "running",
+    "status_cn": "运行中",
+    "start_time": "2021-06-01T08:00:00+08:00",
+    "pod_list": [],
+}
+
+_EVENT = {
+    "EventID": "",
+    "TenantID": "",
+    "Target": "service",
+    "TargetID": "",
+    "UserName": "admin",
+    "StartTime": "2021-06-01T08:00:00+08:00",
+    "EndTime": "2021-06-01T08:00:05+08:00",
+    "OptType": "deploy",
+    "SynType": 0,
+    "Status": "success",
+    "FinalStatus": "complete",
+    "Message": "",
+    "Reason": "",
+    "CodeVersion": "",
+    "DeployVersion": "20210601080000",
+}
+
+
+def _generate(template, key, size):
+    items = []
+    for i in range(size):
+        item = copy.deepcopy(template)
+        item[key] = "{:032x}".format(i)
+        items.append(item)
+    return items
+
+
+def generated_payloads(size):
+    return {
+        "pods": json.dumps({
+            "list": _generate(_POD, "service_id", size),
+            "bean": {}
+        }),
+        "services_status": json.dumps({
+            "list": _generate(_STATUS, "service_id", size),
+            "bean": {}
+        }),
+        "events": json.dumps({
+            "list": _generate(_EVENT, "EventID", size),
+            "number": size
+        }),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=500, help="entries of generated payloads")
+    parser.add_argument("--number", type=int, default=50, help="decodes per measurement")
+    parser.add_argument("recorded", nargs="*", help="recorded region response bodies")
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "goodrain_web.settings")
+    import django
+    django.setup()
+    from www.apiclient.regionapibaseclient import (DECODE_ADDICT, DECODE_ATTR, DECODE_PLAIN, RegionApiBaseHttpClient)
+
+    if args.recorded:
+        payloads = {}
+        for path in args.recorded:
+            with open(path, "rb") as f:
+                payloads[os.path.basename(path)] = f.read()
+    else:
+        payloads = generated_payloads(args.size)
+
+    client = RegionApiBaseHttpClient()
+    modes = (DECODE_ADDICT, DECODE_ATTR, DECODE_PLAIN)
+    row = "{:<24}{:>10}{:>12}{:>12}{:>12}{:>8}"
+    print(row.format("payload", "bytes", *[mode + "(ms)" for mode in modes], "saved"))
+    for name, content in sorted(payloads.items()):
+        costs = []
+        for decode in modes:
+            seconds = timeit.timeit(lambda: client._check_status("", "GET", 200, content, decode), number=args.number)
+            costs.append(seconds / args.number * 1000)
+        saved = "{:.0%}".format(1 - costs[-1] / costs[0])
+        print(row.format(name, len(content), *["{:.2f}".format(cost) for cost in costs], saved))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+
+@pytest.mark.django_db
+def test_iter_query_and_query_page():
+    from www.db.base import BaseConnection
+    from www.models.main import Tenants
+    for i in range(5):
+        Tenants.objects.create(
+            tenant_id="tid{}".format(i), tenant_name="team{}".format(i), tenant_alias="team", enterprise_id="eid", creater=1)
+
+    conn = BaseConnection()
+    sql = "SELECT ID, tenant_name FROM tenant_info WHERE enterprise_id = %s"
+    rows = list(conn.iter_query(sql + " ORDER BY ID", ["eid"], batch_size=2))
+    assert [row.tenant_name for row in rows] == ["team{}".format(i) for i in range(5)]
+    assert rows[0]["tenant_name"] == rows[0][1] == "team0"
+    assert conn.query(sql, ["eid"])[0].tenant_name == "team0"
+
+    page = conn.query_page(sql, ["eid"], page=2, page_size=2, order_by=("ID", "ASC"))
+    assert [row.tenant_name for row in page] == ["team2", "team3"]
+    page = conn.query_page(sql, ["eid"], page_size=2, order_by=("ID", "DESC"), after=page[0].ID)
+    assert [row.tenant_name for row in page] == ["team1", "team0"]
+    # query keeps the column names as they are
+    assert conn.query("SELECT tenant_name AS `select`, tenant_name FROM tenant_info WHERE tenant_id = %s",
+                      ["tid1"])[0]["select"] == "team1"
+
+
+@pytest.mark.django_db
+def test_iter_query_streams_on_mysql():
+    from django.db import connection
+    from www.db import base
+    if connection.vendor != "mysql":
+        pytest.skip("server side cursors are only used on mysql")
+    from MySQLdb.cursors import SSCursor
+    cursor = base._streaming_cursor(connection)
+    try:
+        assert isinstance(cursor.cursor.cursor, SSCursor)
+    finally:
+        cursor.close()
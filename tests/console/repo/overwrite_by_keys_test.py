@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db
+def test_overwrite_by_keys():
+    from console.repositories.app_config import env_var_repo
+    from www.models.main import TenantServiceEnvVar
+
+    def env(attr_name, attr_value, service_id="sid"):
+        return TenantServiceEnvVar(tenant_id="tid", service_id=service_id, attr_name=attr_name, attr_value=attr_value)
+
+    env_var_repo.overwrite_by_component_ids(["sid"], [env("A", "1"), env("B", "2"), env("C", "3")])
+    other = env("A", "1", service_id="other")
+    other.save()
+    ids = dict(TenantServiceEnvVar.objects.filter(service_id="sid").values_list("attr_name", "ID"))
+    create_time = TenantServiceEnvVar.objects.get(pk=ids["A"]).create_time
+
+    with CaptureQueriesContext(connection) as queries:
+        env_var_repo.overwrite_by_component_ids(["sid"], [env("A", "1"), env("B", "changed"), env("D", "4")])
+    writes = [q["sql"] for q in queries if not q["sql"].startswith(("SELECT", "SAVEPOINT", "RELEASE"))]
+    # delete C, update B, insert D; A is left as is
+    assert len(writes) == 3
+
+    envs = {e.attr_name: e for e in TenantServiceEnvVar.objects.filter(service_id="sid")}
+    assert sorted(envs) == ["A", "B", "D"]
+    assert envs["A"].ID == ids["A"] and envs["A"].create_time == create_time
+    assert envs["B"].ID == ids["B"] and envs["B"].attr_value == "changed"
+    assert TenantServiceEnvVar.objects.filter(pk=other.pk).exists()
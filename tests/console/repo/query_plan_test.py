@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+import re
+
+import pytest
+from django.db import connection
+
+
+def _hot_queries():
+    from console.models.main import RainbondCenterAppVersion
+    from www.models.main import (ServiceDomain, ServiceEvent, ServiceGroupRelation, TenantServiceEnvVar, TenantServicesPort)
+    return [
+        ServiceGroupRelation.objects.filter(service_id="sid"),
+        ServiceGroupRelation.objects.filter(group_id__in=[1, 2]),
+        TenantServiceEnvVar.objects.filter(tenant_id="tid", service_id="sid"),
+        TenantServicesPort.objects.filter(tenant_id="tid", service_id="sid"),
+        ServiceDomain.objects.filter(service_id="sid", container_port=5000),
+        ServiceDomain.objects.filter(tenant_id="tid", region_id="rid"),
+        ServiceDomain.objects.filter(domain_name="www.example.com", domain_path="/"),
+        ServiceEvent.objects.filter(tenant_id="tid").order_by("-start_time"),
+        ServiceEvent.objects.filter(service_id="sid").order_by("-start_time"),
+        ServiceEvent.objects.filter(event_id__in=["eid"]),
+        RainbondCenterAppVersion.objects.filter(enterprise_id="eid", app_id="aid", version="1.0"),
+        RainbondCenterAppVersion.objects.filter(app_id="aid", version="1.0"),
+        RainbondCenterAppVersion.objects.filter(record_id=1),
+    ]
+
+
+@pytest.mark.django_db
+def test_hot_queries_use_index():
+    if connection.vendor != "sqlite":
+        pytest.skip("the query plan is checked on sqlite")
+    for queryset in _hot_queries():
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute("EXPLAIN QUERY PLAN " + sql, params)
+            details = [row[-1] for row in cursor.fetchall()]
+        table = queryset.model._meta.db_table
+        full_scans = [detail for detail in details if re.match(r"^SCAN (TABLE )?{}$".format(table), detail)]
+        assert not full_scans, "{} falls back to a full table scan: {}".format(sql, details)
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+import time
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+def test_cached_lookup_invalidated_by_signal():
+    from console.repositories.team_repo import team_repo
+    from console.utils.cache import tag_cache
+    from www.models.main import Tenants
+    tag_cache.clear()
+    Tenants.objects.create(tenant_id="tid", tenant_name="team", tenant_alias="team", enterprise_id="eid", creater=1)
+
+    assert team_repo.get_tenant_by_tenant_name("team").tenant_alias == "team"
+    with CaptureQueriesContext(connection) as cached:
+        tenant = team_repo.get_tenant_by_tenant_name("team")
+    assert len(cached) == 0
+
+    # callers get their own copy
+    tenant.tenant_alias = "renamed"
+    assert team_repo.get_tenant_by_tenant_name("team").tenant_alias == "team"
+    tenant.save()
+    assert team_repo.get_tenant_by_tenant_name("team").tenant_alias == "renamed"
+
+    team_repo.update_by_tenant_id("tid", tenant_alias="updated")
+    assert team_repo.get_tenant_by_tenant_name("team").tenant_alias == "updated"
+
+
+@pytest.mark.django_db
+def test_request_memo():
+    from console.repositories.region_repo import region_repo
+    from console.utils.cache import tag_cache
+    tag_cache.clear()
+    tag_cache.local.clear()
+    tag_cache.ttl, ttl = 0, tag_cache.ttl
+    try:
+        tag_cache.begin_request()
+        with CaptureQueriesContext(connection) as memoized:
+            assert region_repo.get_region_by_region_name("rainbond") is None
+            assert region_repo.get_region_by_region_name("rainbond") is None
+        assert len(memoized) == 1
+        tag_cache.end_request()
+        with CaptureQueriesContext(connection) as uncached:
+            region_repo.get_region_by_region_name("rainbond")
+        assert len(uncached) == 1
+    finally:
+        tag_cache.ttl = ttl
+        tag_cache.end_request()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_invalidation_published_to_other_workers(mocker, monkeypatch):
+    import fakeredis
+    from console.utils import cache as cache_module
+    server = fakeredis.FakeServer()
+    monkeypatch.setenv("REDIS_HOST", "redis")
+    mocker.patch.object(cache_module.redis, "Redis", lambda **kwargs: fakeredis.FakeStrictRedis(server=server))
+    # two workers, each with its own store and tag cache
+    worker_a = cache_module.TagCache(store=cache_module.Cache())
+    worker_b = cache_module.TagCache(store=cache_module.Cache())
+    worker_a.store._subscribe()
+    worker_b.store._subscribe()
+    time.sleep(0.2)
+
+    worker_a.invalidate("team")
+    deadline = time.time() + 2
+    while not worker_b._versions.get("team") and time.time() < deadline:
+        time.sleep(0.01)
+    assert worker_b._versions.get("team") == 1
+    assert worker_a._versions.get("team") == 2
+
+    # a lost connection drops everything
+    worker_b._on_remote_change(None)
+    assert worker_b._versions.get("team") == 2
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+import time
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db
+def test_openapi_token_cached():
+    from console.services.access_token_cache import access_token_cache
+    from console.services.user_accesstoken_services import user_access_services
+    from console.services.user_services import user_services
+    from www.models.main import Users
+    access_token_cache.clear()
+    Users.objects.create(user_id=1, nick_name="ci", password="goodrain", enterprise_id="eid")
+    key = user_access_services.create_user_access_key("ci", 1, None)
+
+    assert user_services.get_user_by_openapi_token(key.access_key).nick_name == "ci"
+    with CaptureQueriesContext(connection) as cached:
+        user = user_services.get_user_by_openapi_token(key.access_key)
+    assert len(cached) == 0
+    # every request gets its own copy of the user
+    user.is_administrator = True
+    assert not hasattr(user_services.get_user_by_openapi_token(key.access_key), "is_administrator")
+    assert user_services.get_user_by_openapi_token("invalid") is None
+
+    user_access_services.update_user_access_key_by_id(1, key.ID)
+    # on_commit never fires inside the test transaction
+    access_token_cache._evict(1)
+    assert user_services.get_user_by_openapi_token(key.access_key) is None
+
+
+def test_lru():
+    from console.services.access_token_cache import AccessTokenCache
+
+    class User(object):
+        def __init__(self, user_id):
+            self.user_id = user_id
+
+    cache = AccessTokenCache(ttl=60, max_size=2)
+    loaded = []
+
+    def loader(token):
+        loaded.append(token)
+        return User(int(token)), None
+
+    cache.get_user("1", loader)
+    cache.get_user("2", loader)
+    cache.get_user("1", loader)
+    cache.get_user("3", loader)
+    cache.get_user("1", loader)
+    assert loaded == ["1", "2", "3"]
+    cache.get_user("2", loader)
+    assert loaded == ["1", "2", "3", "2"]
+
+    expiring = AccessTokenCache(ttl=60, max_size=2)
+    expiring.get_user("1", lambda token: (User(1), time.time() - 1))
+    assert expiring.get_user("1", lambda token: (None, None)) is None
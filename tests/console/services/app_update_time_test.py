@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+from datetime import datetime, timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db
+def test_coalesce_update_time(mocker):
+    from console.services.app_update_time import AppUpdateTimeCoalescer
+    from www.models.main import ServiceGroup
+    yesterday = datetime.now() - timedelta(days=1)
+    apps = [
+        ServiceGroup.objects.create(
+            tenant_id="tid", group_name=name, region_name="rainbond", create_time=yesterday, update_time=yesterday)
+        for name in ("a", "b", "c")
+    ]
+    coalescer = AppUpdateTimeCoalescer(interval=60)
+    mocker.patch.object(coalescer, "_start_flusher")
+
+    for _ in range(10):
+        coalescer.touch(apps[1].ID)
+    coalescer.touch(apps[0].ID)
+    with CaptureQueriesContext(connection) as queries:
+        assert coalescer.flush() == 2
+    assert len(queries) == 1
+
+    update_times = dict(ServiceGroup.objects.values_list("group_name", "update_time"))
+    assert update_times["a"] > update_times["b"] > yesterday
+    assert update_times["c"] == yesterday
+    assert coalescer.flush() == 0
@@ -0,0 +1,15 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+
+@pytest.mark.django_db
+def test_check_backup_condition_without_status_list(mocker):
+    from console.services.backup_service import groupapp_backup_service
+    from www.models.main import Tenants
+
+    mocker.patch("console.services.backup_service.group_service.get_group_services", return_value=[])
+    # the region sends "list": null when it knows none of the components, the body is a plain dict
+    mocker.patch("console.services.backup_service.region_api.service_status", return_value={"list": None})
+    team = Tenants(tenant_id="tid", tenant_name="team", enterprise_id="eid")
+
+    assert groupapp_backup_service.check_backup_condition(team, "rainbond", 1) == (200, [])
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+
+
+class _FakeLog(object):
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.closed = False
+
+    def stream(self, amt):
+        for chunk in self.chunks:
+            yield chunk
+
+    def close(self):
+        self.closed = True
+
+    def release_conn(self):
+        pass
+
+
+def test_merge_pod_logs(mocker):
+    from console.services.app_config.component_logs import component_log_service
+    logs = {
+        "pod-a": _FakeLog([b"a1\na", b"2\n"]),
+        "pod-b": _FakeLog([b"b1\nb2"]),
+    }
+    mocker.patch(
+        "console.services.app_config.component_logs.region_api.get_component_log",
+        side_effect=lambda tenant_name, region_name, service_alias, pod_name, container_name, follow: logs[pod_name])
+
+    targets = [("pod-a", "c"), ("pod-b", "c")]
+    stream = component_log_service.get_component_logs_stream("team", "rainbond", "gr123456", targets, False)
+    lines = b"".join(stream).decode("utf-8").splitlines()
+
+    assert sorted(lines) == ["[pod-a] a1", "[pod-a] a2", "[pod-b] b1", "[pod-b] b2"]
+    assert lines.index("[pod-a] a1") < lines.index("[pod-a] a2")
+    assert all(log.closed for log in logs.values())
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+from addict import Dict
+
+
+def _service_status(region, tenant_name, body):
+    return Dict({"list": [{"service_id": service_id, "status": "running"} for service_id in body["service_ids"]]})
+
+
+def test_list_status_only_fetch_missed(mocker):
+    from console.services.component_status_cache import ComponentStatusCache
+    service_status = mocker.patch(
+        "console.services.component_status_cache.region_api.service_status", side_effect=_service_status)
+    cache = ComponentStatusCache(ttl=10)
+
+    cache.list_status("rainbond", "team", ["a", "b"], "eid")
+    statuses = cache.list_status("rainbond", "team", ["a", "b", "c"], "eid")
+
+    assert [status["service_id"] for status in statuses] == ["a", "b", "c"]
+    assert service_status.call_count == 2
+    assert service_status.call_args[0][2]["service_ids"] == ["c"]
+
+
+def test_invalidate(mocker):
+    from console.services.component_status_cache import ComponentStatusCache
+    service_status = mocker.patch(
+        "console.services.component_status_cache.region_api.service_status", side_effect=_service_status)
+    cache = ComponentStatusCache(ttl=10)
+
+    cache.list_status("rainbond", "team", ["a", "b"], "eid")
+    cache.invalidate("rainbond", ["a"])
+    cache.list_status("rainbond", "team", ["a", "b"], "eid")
+
+    assert service_status.call_args[0][2]["service_ids"] == ["a"]
+
+
+def test_list_status_without_cache(mocker):
+    from console.services.component_status_cache import ComponentStatusCache
+    service_status = mocker.patch(
+        "console.services.component_status_cache.region_api.service_status", side_effect=_service_status)
+    cache = ComponentStatusCache(ttl=10)
+
+    cache.list_status("rainbond", "team", ["a", "b"], "eid")
+    cache.list_status("rainbond", "team", ["a", "b"], "eid", use_cache=False)
+
+    assert service_status.call_count == 2
+    assert service_status.call_args[0][2]["service_ids"] == ["a", "b"]
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+import datetime
+
+import pytest
+
+
+@pytest.mark.django_db
+def test_archive_and_read_through(mocker):
+    from console.repositories.event_repo import event_repo
+    from console.services.event_archive import EventArchiver
+    from www.models.main import ServiceEvent, ServiceEventArchive
+
+    now = datetime.datetime.now()
+
+    def event(i, days, final_status="complete"):
+        return ServiceEvent(
+            event_id="e{}".format(i),
+            tenant_id="tid",
+            service_id="sid",
+            start_time=now - datetime.timedelta(days=days, minutes=i),
+            final_status=final_status)
+
+    # e0, e1 are recent, e2 is old but running, e3..e6 are archived
+    ServiceEvent.objects.bulk_create([event(0, 0), event(1, 0), event(2, 40, final_status="")] +
+                                     [event(i, 40) for i in range(3, 7)])
+    ids = dict(ServiceEvent.objects.values_list("event_id", "ID"))
+
+    archiver = EventArchiver(retention_days=30, batch_size=3)
+    archive_batch = mocker.patch.object(archiver, "_archive_batch", wraps=archiver._archive_batch)
+    assert archiver.archive() == 4
+    # every batch goes on after the last event moved
+    assert [call[0][1] for call in archive_batch.call_args_list] == [0, ids["e5"]]
+    assert sorted(ServiceEvent.objects.values_list("event_id", flat=True)) == ["e0", "e1", "e2"]
+    assert ServiceEventArchive.objects.get(event_id="e3").ID == ids["e3"]
+
+    assert event_repo.get_event_by_event_id("e4").ID == ids["e4"]
+    pages = []
+    page, has_next = 1, True
+    while has_next:
+        events, has_next = event_repo.list_events_before_specify_time("tid", "sid", None, page, 2)
+        pages.append([e.event_id for e in events])
+        page += 1
+    assert pages == [["e0", "e1"], ["e2", "e3"], ["e4", "e5"], ["e6"]]
+    assert sorted(e.event_id for e in event_repo.get_events_by_event_ids(["e1", "e5", "missing"])) == ["e1", "e5"]
+    assert [e.event_id for e in event_repo.get_specified_num_events("tid", "sid", num=4)] == ["e2", "e1", "e0", "e6"]
+
+    event_repo.delete_events("sid")
+    assert event_repo.get_last_event("tid", "sid") is None
+
+
+@pytest.mark.django_db
+def test_without_archive_table(mocker):
+    from console.repositories.event_repo import event_repo
+    from console.services.event_archive import EventArchiver
+    from www.models.main import ServiceEvent, ServiceEventArchive
+
+    mocker.patch.object(event_repo, "has_archive", return_value=False)
+    archived = mocker.patch.object(ServiceEventArchive, "objects")
+    ServiceEvent.objects.create(
+        event_id="e0", tenant_id="tid", service_id="sid", start_time=datetime.datetime.now() - datetime.timedelta(days=40))
+
+    assert EventArchiver(retention_days=30).archive() == 0
+    assert event_repo.get_event_by_event_id("missing") is None
+    assert event_repo.list_events_before_specify_time("tid", "sid", None, 2, 10) == ([], False)
+    event_repo.delete_events("sid")
+    assert not ServiceEvent.objects.exists()
+    assert not archived.mock_calls
+
+
+def test_missing_archive_table_remembered(mocker):
+    from console.repositories.event_repo import ServiceEventRepository
+    table_names = mocker.patch(
+        "console.repositories.event_repo.connection.introspection.table_names", return_value=["service_event"])
+    repo = ServiceEventRepository()
+    assert not repo.has_archive()
+    assert not repo.has_archive()
+    assert table_names.call_count == 1
+
+    # looked for again after the interval
+    repo.archive_check_interval = 0
+    table_names.return_value = ["service_event", "service_event_archive"]
+    assert repo.has_archive()
+    repo.archive_check_interval = 300
+    assert repo.has_archive()
+    assert table_names.call_count == 2
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+import datetime
+
+import pytest
+
+
+@pytest.mark.django_db
+def test_get_services_events_by_cursor():
+    from console.services.event_services import service_event_dynamic
+    from console.utils.cache import cache
+    from www.models.main import ServiceEvent, Tenants
+
+    team = Tenants(tenant_id="tid", tenant_name="team")
+    ServiceEvent.objects.bulk_create([
+        ServiceEvent(
+            event_id="e{}".format(i),
+            tenant_id="tid",
+            service_id="sid",
+            start_time=datetime.datetime.now(),
+            status="success",
+            final_status="complete") for i in range(5)
+    ])
+    cache.delete("service_events_total:tid::")
+
+    events, total, cursor = service_event_dynamic.get_services_events(1, 2, None, None, team)
+    assert total == 5
+    assert [e.event_id for e in events] == ["e4", "e3"]
+    events, _, cursor = service_event_dynamic.get_services_events(1, 2, None, None, team, cursor=cursor)
+    assert [e.event_id for e in events] == ["e2", "e1"]
+    events, _, cursor = service_event_dynamic.get_services_events(1, 2, None, None, team, cursor=cursor)
+    assert [e.event_id for e in events] == ["e0"]
+    assert cursor is None
+
+    # the total is cached
+    ServiceEvent.objects.filter(event_id="e0").delete()
+    assert service_event_dynamic.get_services_events(3, 2, None, None, team)[1] == 5
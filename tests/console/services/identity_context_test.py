@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+import datetime
+
+import pytest
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+
+def _initial(user):
+    from console.views.base import RegionTenantHeaderView
+    request = RequestFactory().get("/", {"region_name": "rainbond"})
+    request.user = user
+    view = RegionTenantHeaderView()
+    view.request = request
+    view.initial(request, tenantName="team")
+    return view
+
+
+@pytest.mark.django_db
+def test_region_tenant_view_identity():
+    from console.models.main import EnterpriseUserPerm, RegionConfig
+    from console.repositories.enterprise_repo import enterprise_repo
+    from console.services.identity_context import IdentityContext, enterprise_snapshots
+    from console.services.perm_cache import perm_cache
+    from www.apiclient.regioncache import region_cache
+    from www.models.main import TenantEnterprise, Tenants, Users
+    perm_cache.clear()
+    enterprise_snapshots.clear()
+    region_cache.clear()
+    TenantEnterprise.objects.create(enterprise_id="eid", enterprise_name="ent", enterprise_alias="ent")
+    RegionConfig.objects.create(region_id="rid", region_name="rainbond", region_alias="rainbond", status="1")
+    Tenants.objects.create(tenant_id="tid", tenant_name="team", enterprise_id="eid", creater=1)
+    user = Users.objects.create(user_id=1, nick_name="dev", password="goodrain", enterprise_id="eid")
+    EnterpriseUserPerm.objects.create(user_id=1, enterprise_id="eid", identity="admin")
+
+    _initial(user)
+    with CaptureQueriesContext(connection) as cached:
+        view = _initial(user)
+    assert len(cached) == 1
+    assert view.is_team_owner and view.is_enterprise_admin
+    assert 200000 in view.user_perms
+    assert view.region.region_name == "rainbond"
+    assert IdentityContext.of(view.request) is view.identity
+    assert view.identity.tenant is view.tenant
+
+    # every request gets its own copy of the enterprise
+    assert view.enterprise is not _initial(user).enterprise
+    enterprise_repo.update("eid", enterprise_alias="renamed")
+    # on_commit never fires inside the test transaction
+    enterprise_snapshots._bump()
+    assert _initial(user).enterprise.enterprise_alias == "renamed"
+
+
+@pytest.mark.django_db
+def test_enterprise_and_app_views_identity():
+    from console.models.main import RegionConfig
+    from console.services.identity_context import IdentityContext, enterprise_snapshots
+    from console.views.base import ApplicationView, EnterpriseHeaderView
+    from www.apiclient.regioncache import region_cache
+    from www.models.main import ServiceGroup, TenantEnterprise, Tenants, Users
+    region_cache.clear()
+    enterprise_snapshots.clear()
+    TenantEnterprise.objects.create(enterprise_id="eid", enterprise_name="ent", enterprise_alias="ent")
+    RegionConfig.objects.create(region_id="rid", region_name="rainbond", region_alias="rainbond", status="1")
+    Tenants.objects.create(tenant_id="tid", tenant_name="team", enterprise_id="eid", creater=1)
+    now = datetime.datetime.now()
+    app = ServiceGroup.objects.create(
+        tenant_id="tid", region_name="rainbond", group_name="app", create_time=now, update_time=now)
+    user = Users.objects.create(user_id=1, nick_name="dev", password="goodrain", enterprise_id="eid")
+
+    request = RequestFactory().get("/", {"region_name": "rainbond"})
+    request.user = user
+    view = EnterpriseHeaderView()
+    view.request = request
+    view.initial(request, eid="eid")
+    # the enterprise of the user is read once per request
+    assert view.enterprise is IdentityContext.of(request).enterprise
+
+    view = ApplicationView()
+    view.request = request
+    view.initial(request, tenantName="team", app_id=app.ID)
+    assert view.app.ID == app.ID
+    assert view.identity.app is view.app
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+import pytest
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+
+def _initial(user):
+    from console.views.base import TenantHeaderView
+    request = RequestFactory().get("/", {"region_name": "rainbond"})
+    request.user = user
+    view = TenantHeaderView()
+    view.request = request
+    view.initial(request, tenantName="team")
+    return view
+
+
+@pytest.mark.django_db
+def test_team_perms_cached():
+    from console.models.main import EnterpriseUserPerm, RoleInfo, RolePerms, UserRole
+    from console.services.identity_context import enterprise_snapshots
+    from console.services.perm_cache import perm_cache
+    from www.models.main import TenantEnterprise, Tenants, Users
+    perm_cache.clear()
+    enterprise_snapshots.clear()
+    TenantEnterprise.objects.create(enterprise_id="eid", enterprise_name="ent", enterprise_alias="ent")
+    Tenants.objects.create(tenant_id="tid", tenant_name="team", enterprise_id="eid", creater=100)
+    user = Users.objects.create(user_id=1, nick_name="dev", password="goodrain", enterprise_id="eid")
+    EnterpriseUserPerm.objects.create(user_id=1, enterprise_id="eid", identity="app_store")
+    role = RoleInfo.objects.create(kind="team", kind_id="tid", name="developer")
+    UserRole.objects.create(user_id=1, role_id=role.ID)
+    RolePerms.objects.create(role_id=role.ID, perm_code=200001)
+
+    with CaptureQueriesContext(connection) as uncached:
+        view = _initial(user)
+    assert 200001 in view.user_perms
+    assert view.is_enterprise_admin
+
+    with CaptureQueriesContext(connection) as cached:
+        view = _initial(user)
+    assert 200001 in view.user_perms
+    assert view.is_enterprise_admin
+    # only the team is queried
+    assert len(cached) == 1
+    assert len(cached) < len(uncached)
+
+    perm_cache._bump()
+    with CaptureQueriesContext(connection) as invalidated:
+        _initial(user)
+    assert len(invalidated) > len(cached)
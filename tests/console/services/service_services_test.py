@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+import datetime
+
+import pytest
+
+
+@pytest.mark.django_db
+def test_count_fuzzy_services_matches_list():
+    from console.services.service_services import base_service
+    from www.models.main import ServiceGroup, ServiceGroupRelation, TenantServiceInfo
+    now = datetime.datetime.now()
+    for i in range(2):
+        TenantServiceInfo.objects.create(
+            tenant_id="tid",
+            service_id="sid{}".format(i),
+            service_alias="gr{}".format(i),
+            service_cname="web{}".format(i),
+            service_region="rainbond",
+            update_time=now)
+    app = ServiceGroup.objects.create(
+        tenant_id="tid", region_name="rainbond", group_name="app", create_time=now, update_time=now)
+    # a component left in two apps is listed once per app
+    for group_id in (app.ID, app.ID + 1):
+        ServiceGroupRelation.objects.create(service_id="sid0", group_id=group_id, tenant_id="tid", region_name="rainbond")
+
+    services = base_service.get_fuzzy_services_list("tid", "rainbond", "web", "ID", "desc")
+    assert len(services) == 3
+    assert base_service.count_fuzzy_services("tid", "rainbond", "web") == 3
+    page = base_service.get_fuzzy_services_list("tid", "rainbond", "web", "ID", "desc", page=1, page_size=2)
+    assert len(page) == 2
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+
+@pytest.mark.django_db
+def test_graph_details_with_bean_only_pods(mocker):
+    from console.services.topological_services import topological_service
+    from www.models.main import TenantServiceInfo, Tenants
+
+    mocker.patch(
+        "console.services.topological_services.component_status_cache.get_status", return_value={"cur_status": "running"})
+    # the pods endpoint only returns a bean, the body is a plain dict
+    mocker.patch(
+        "console.services.topological_services.region_api.get_service_pods",
+        return_value={"bean": {
+            "new_pods": [],
+            "old_pods": []
+        }})
+    team = Tenants(tenant_id="tid", tenant_name="team", enterprise_id="eid")
+    service = TenantServiceInfo(
+        tenant_id="tid", service_id="sid", service_alias="gr123456", service_region="rainbond", min_memory=128, min_node=1)
+
+    result = topological_service.get_group_topological_graph_details(team, "tid", "team", service, "rainbond")
+    assert result["cur_status"] == "running"
+    assert result["pod_list"] == []
@@ -0,0 +1,117 @@
+# -*- coding: utf8 -*-
+"""
+  per region circuit breaker of the region api.
+"""
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger('default')
+
+
+class CircuitBreaker(object):
+    """
+    closed: requests pass, consecutive failures are counted.
+    open: requests fail fast until recovery_timeout passed.
+    half_open: a single probe request passes, its result closes or reopens the circuit.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name, failure_threshold, recovery_timeout):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.rejected = 0
+        self._probing = False
+        self._probe_at = None
+        self._lock = threading.Lock()
+
+    def allow(self):
+        if self.failure_threshold <= 0:
+            return True
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.time() - self.opened_at >= self.recovery_timeout:
+                self.state = self.HALF_OPEN
+                self._probing = False
+            if self.state == self.HALF_OPEN:
+                # a probe which never reported back does not block the circuit forever
+                if not self._probing or time.time() - self._probe_at >= self.recovery_timeout:
+                    self._probing = True
+                    self._probe_at = time.time()
+                    return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info("region {} circuit closed".format(self.name))
+            self.state = self.CLOSED
+            self.failures = 0
+            self.opened_at = None
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold > 0:
+                if self.state != self.OPEN:
+                    logger.warning("region {0} circuit open after {1} consecutive failures".format(self.name, self.failures))
+                self.state = self.OPEN
+                self.opened_at = time.time()
+                self._probing = False
+
+    def record_aborted(self):
+        """the request ended without telling whether the region is reachable"""
+        with self._lock:
+            # let the next request probe instead of waiting for the probe timeout
+            self._probing = False
+
+    def reset(self):
+        self.record_success()
+        self.rejected = 0
+
+    def to_dict(self):
+        return {
+            "region_name": self.name,
+            "state": self.state,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "opened_at": self.opened_at,
+        }
+
+
+class CircuitBreakers(object):
+    def __init__(self):
+        self.failure_threshold = int(os.getenv("REGION_CIRCUIT_FAILURE_THRESHOLD", 5))
+        self.recovery_timeout = float(os.getenv("REGION_CIRCUIT_RECOVERY_TIMEOUT", 30))
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def get(self, region_name):
+        breaker = self._breakers.get(region_name)
+        if breaker:
+            return breaker
+        with self._lock:
+            breaker = self._breakers.get(region_name)
+            if not breaker:
+                breaker = CircuitBreaker(region_name, self.failure_threshold, self.recovery_timeout)
+                self._breakers[region_name] = breaker
+            return breaker
+
+    def list(self, region_names=None):
+        return [
+            breaker.to_dict() for name, breaker in sorted(self._breakers.items())
+            if region_names is None or name in region_names
+        ]
+
+
+circuit_breakers = CircuitBreakers()
@@ -0,0 +1,138 @@
+# -*- coding: utf8 -*-
+import pytest
+from urllib3.exceptions import MaxRetryError
+
+from console.exception.main import ErrRegionUnavailable, ServiceHandleException
+from www.apiclient import circuitbreaker
+from www.apiclient.circuitbreaker import CircuitBreaker
+
+
+class Clock(object):
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(mocker):
+    clock = Clock()
+    mocker.patch.object(circuitbreaker.time, "time", clock.time)
+    return clock
+
+
+def test_open_after_consecutive_failures(clock):
+    breaker = CircuitBreaker("r1", failure_threshold=3, recovery_timeout=30)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+    assert breaker.to_dict()["rejected"] == 1
+
+
+def test_half_open_probe(clock):
+    breaker = CircuitBreaker("r1", failure_threshold=1, recovery_timeout=30)
+    breaker.record_failure()
+    clock.now += 30
+    # a single probe passes
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()
+
+    # a failed probe reopens the circuit
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+    clock.now += 30
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.failures == 0
+    assert breaker.allow() and breaker.allow()
+
+
+def test_half_open_lost_probe(clock):
+    breaker = CircuitBreaker("r1", failure_threshold=1, recovery_timeout=30)
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow()
+    # a probe which never reports back is replaced after recovery_timeout
+    clock.now += 29
+    assert not breaker.allow()
+    clock.now += 1
+    assert breaker.allow()
+
+    # an aborted probe is replaced at once
+    breaker.record_aborted()
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+
+def test_disabled():
+    breaker = CircuitBreaker("r1", failure_threshold=0, recovery_timeout=30)
+    for _ in range(10):
+        breaker.record_failure()
+    assert breaker.allow()
+
+
+@pytest.fixture
+def region_client(mocker):
+    from www.apiclient.regionapibaseclient import RegionApiBaseHttpClient
+    breakers = circuitbreaker.CircuitBreakers()
+    breakers.failure_threshold = 2
+    mocker.patch("www.apiclient.regionapibaseclient.circuit_breakers", breakers)
+    mocker.patch("www.apiclient.regionapibaseclient.region_cache.get_region", return_value=object())
+    client = RegionApiBaseHttpClient()
+    http = mocker.Mock()
+    mocker.patch.object(client, "get_client", return_value=http)
+    return client, http, breakers.get("r1")
+
+
+def test_only_transport_failures_open_circuit(region_client):
+    client, http, breaker = region_client
+    http.request.side_effect = ValueError("bad header")
+    for _ in range(3):
+        with pytest.raises(ServiceHandleException):
+            client._request("http://r1/v2/show", "GET", region="r1")
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.failures == 0
+
+    http.request.side_effect = MaxRetryError(None, "http://r1/v2/show")
+    for _ in range(2):
+        with pytest.raises(ServiceHandleException):
+            client._request("http://r1/v2/show", "GET", region="r1")
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(ErrRegionUnavailable):
+        client._request("http://r1/v2/show", "GET", region="r1")
+
+
+def test_killed_request_does_not_open_circuit(region_client):
+    client, http, breaker = region_client
+    http.request.side_effect = KeyboardInterrupt()
+    for _ in range(3):
+        with pytest.raises(KeyboardInterrupt):
+            client._request("http://r1/v2/show", "GET", region="r1")
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_missing_region_does_not_take_probe(region_client, mocker, clock):
+    client, http, breaker = region_client
+    http.request.side_effect = MaxRetryError(None, "http://r1/v2/show")
+    for _ in range(2):
+        with pytest.raises(ServiceHandleException):
+            client._request("http://r1/v2/show", "GET", region="r1")
+    assert breaker.state == CircuitBreaker.OPEN
+    clock.now += 60
+
+    mocker.patch("www.apiclient.regionapibaseclient.region_cache.get_region", return_value=None)
+    with pytest.raises(ServiceHandleException):
+        client._request("http://r1/v2/show", "GET", region="r1")
+    # the probe is still free for the next call
+    assert breaker.allow()
@@ -0,0 +1,113 @@
+# -*- coding: utf8 -*-
+"""
+  run independent region api calls concurrently.
+"""
+import logging
+import os
+import time
+from collections import namedtuple
+from concurrent import futures
+
+from django.db import connections
+
+logger = logging.getLogger('default')
+
+FanOutResult = namedtuple("FanOutResult", ["value", "error"])
+
+
+class FanOutTimeout(Exception):
+    def __init__(self, key, seconds):
+        super(FanOutTimeout, self).__init__("call {0} did not finish in {1}s".format(key, seconds))
+        self.key = key
+        self.seconds = seconds
+
+
+def gevent_patched():
+    try:
+        from gevent import monkey
+    except ImportError:
+        return False
+    return monkey.is_module_patched("socket")
+
+
+def _call(func):
+    try:
+        return FanOutResult(func(), None)
+    except Exception as e:
+        return FanOutResult(None, e)
+    finally:
+        # every greenlet or thread holds its own db connection
+        connections.close_all()
+
+
+def _gevent_call(key, func, call_timeout):
+    import gevent
+    timer = gevent.Timeout(call_timeout)
+    timer.start()
+    try:
+        return _call(func)
+    except gevent.Timeout as t:
+        if t is not timer:
+            raise
+        return FanOutResult(None, FanOutTimeout(key, call_timeout))
+    finally:
+        timer.close()
+
+
+def _gevent_fan_out(calls, timeout, call_timeout, concurrency):
+    import gevent
+    from gevent.pool import Pool
+    pool = Pool(concurrency)
+    greenlets = [(key, pool.spawn(_gevent_call, key, func, call_timeout)) for key, func in calls.items()]
+    gevent.joinall([g for _, g in greenlets], timeout=timeout)
+    results = {}
+    for key, g in greenlets:
+        if g.ready():
+            results[key] = g.value
+            continue
+        g.kill(block=False)
+        results[key] = FanOutResult(None, FanOutTimeout(key, timeout))
+    return results
+
+
+def _thread_fan_out(calls, timeout, call_timeout, concurrency):
+    start = time.time()
+    deadlines = [start + t for t in (timeout, call_timeout) if t is not None]
+    deadline = min(deadlines) if deadlines else None
+    executor = futures.ThreadPoolExecutor(max_workers=min(concurrency, len(calls)))
+    try:
+        fs = [(key, executor.submit(_call, func)) for key, func in calls.items()]
+        results = {}
+        for key, f in fs:
+            wait = max(deadline - time.time(), 0) if deadline is not None else None
+            try:
+                results[key] = f.result(timeout=wait)
+            except futures.TimeoutError:
+                f.cancel()
+                results[key] = FanOutResult(None, FanOutTimeout(key, round(time.time() - start, 3)))
+        return results
+    finally:
+        executor.shutdown(wait=False)
+
+
+def fan_out(calls, timeout=None, call_timeout=None, concurrency=None):
+    """
+    run calls concurrently and return the partial results.
+
+    :param calls: dict of key -> callable without arguments
+    :param timeout: overall deadline in seconds, calls still running are abandoned
+    :param call_timeout: deadline in seconds of every single call
+    :param concurrency: max number of calls running at the same time
+    :return: dict of key -> FanOutResult(value, error), error is None if the call succeeded
+    """
+    if not calls:
+        return {}
+    if concurrency is None:
+        concurrency = int(os.getenv("REGION_FAN_OUT_CONCURRENCY", 10))
+    start = time.time()
+    if gevent_patched():
+        results = _gevent_fan_out(calls, timeout, call_timeout, concurrency)
+    else:
+        results = _thread_fan_out(calls, timeout, call_timeout, concurrency)
+    logger.debug("fan out {0} calls take time {1}".format(len(calls), round(time.time() - start, 3)))
+    return results
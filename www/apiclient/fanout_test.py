@@ -0,0 +1,73 @@
+# -*- coding: utf8 -*-
+import time
+
+import pytest
+
+from www.apiclient import fanout
+from www.apiclient.fanout import FanOutTimeout, fan_out
+
+
+def _sleep(seconds, value):
+    def call():
+        time.sleep(seconds)
+        return value
+
+    return call
+
+
+def _fail():
+    raise ValueError("region down")
+
+
+@pytest.fixture(params=["thread", "gevent"])
+def mode(request, mocker):
+    if request.param == "gevent":
+        pytest.importorskip("gevent")
+        # gevent.sleep yields without monkey patching the whole process
+        import gevent
+        mocker.patch.object(fanout, "gevent_patched", return_value=True)
+        mocker.patch.object(time, "sleep", gevent.sleep)
+    else:
+        mocker.patch.object(fanout, "gevent_patched", return_value=False)
+    return request.param
+
+
+def test_partial_results(mode):
+    results = fan_out({"ok": lambda: 1, "fail": _fail}, timeout=1)
+    assert results["ok"].value == 1 and results["ok"].error is None
+    assert results["fail"].value is None
+    assert isinstance(results["fail"].error, ValueError)
+
+
+def test_overall_deadline(mode):
+    start = time.time()
+    results = fan_out({"fast": _sleep(0, "fast"), "slow": _sleep(2, "slow")}, timeout=0.2)
+    assert time.time() - start < 1
+    assert results["fast"].value == "fast"
+    assert isinstance(results["slow"].error, FanOutTimeout)
+    assert results["slow"].error.key == "slow"
+
+
+def test_call_deadline(mode):
+    start = time.time()
+    results = fan_out({"fast": _sleep(0, "fast"), "slow": _sleep(2, "slow")}, timeout=5, call_timeout=0.2)
+    assert time.time() - start < 1
+    assert results["fast"].value == "fast"
+    assert isinstance(results["slow"].error, FanOutTimeout)
+
+
+def test_calls_run_concurrently(mode):
+    start = time.time()
+    results = fan_out({i: _sleep(0.2, i) for i in range(5)}, timeout=2)
+    assert time.time() - start < 0.8
+    assert [results[i].value for i in range(5)] == list(range(5))
+
+
+def test_connections_closed(mode, mocker):
+    close_all = mocker.patch.object(fanout.connections, "close_all")
+    fan_out({"ok": lambda: 1, "fail": _fail}, timeout=1)
+    assert close_all.call_count == 2
+
+
+def test_no_calls():
+    assert fan_out({}) == {}
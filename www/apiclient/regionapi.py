@@ -10,8 +10,10 @@ from django import http
 from django.conf import settings
 from www.apiclient.baseclient import client_auth_service
 from www.apiclient.exception import err_region_not_found
-from www.apiclient.regionapibaseclient import RegionApiBaseHttpClient
-from www.models.main import TenantRegionInfo, Tenants
+from www.apiclient.fanout import fan_out
+from www.apiclient.regionapibaseclient import DECODE_PLAIN, RegionApiBaseHttpClient
+from www.apiclient.regioncache import region_cache
+from www.models.main import Tenants
 
 logger = logging.getLogger('default')
 
@@ -32,31 +34,40 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         client = httplib2.Http(proxy_info=proxy, timeout=25)
         return client
 
-    def _set_headers(self, token):
+    def _build_headers(self, token):
+        """build the headers of a single call, the shared default headers are never changed"""
+        headers = dict(self.default_headers)
         if settings.MODULES["RegionToken"]:
             if not token:
                 if os.environ.get('REGION_TOKEN'):
-                    self.default_headers.update({"Authorization": os.environ.get('REGION_TOKEN')})
+                    headers.update({"Authorization": os.environ.get('REGION_TOKEN')})
                 else:
-                    self.default_headers.update({"Authorization": ""})
+                    headers.update({"Authorization": ""})
             else:
-                self.default_headers.update({"Authorization": token})
-        # logger.debug('Default headers: {0}'.format(self.default_headers))
+                headers.update({"Authorization": token})
+        return headers
+
+    def fan_out(self, calls, timeout=None, call_timeout=None):
+        """
+        run region api calls concurrently, latency is the slowest call instead of the sum of them.
+
+        :param calls: dict of key -> callable without arguments, e.g. functools.partial of a region api
+        :param timeout: overall deadline in seconds, default REGION_CONNECTION_TIMEOUT + REGION_RED_TIMEOUT
+        :param call_timeout: deadline in seconds of every single call
+        :return: dict of key -> FanOutResult(value, error), failed or timed out calls only set error
+        """
+        if timeout is None:
+            connect, red = self.get_default_timeout_conifg()
+            timeout = connect + red
+        return fan_out(calls, timeout=timeout, call_timeout=call_timeout)
 
     def __get_tenant_region_info(self, tenant_name, region):
         if type(tenant_name) == Tenants:
             tenant_name = tenant_name.tenant_name
-        tenants = Tenants.objects.filter(tenant_name=tenant_name)
-        if tenants:
-            tenant = tenants[0]
-            tenant_regions = TenantRegionInfo.objects.filter(tenant_id=tenant.tenant_id, region_name=region)
-            if not tenant_regions:
-                logger.error("tenant {0} is not init in region {1}".format(tenant_name, region))
-                raise http.Http404
-        else:
-            logger.error("team {0} is not found!".format(tenant_name))
+        tenant_region = region_cache.get_tenant_region(tenant_name, region)
+        if not tenant_region:
             raise http.Http404
-        return tenant_regions[0]
+        return tenant_region
 
     def get_tenant_resources(self, region, tenant_name, enterprise_id):
         """获取指定租户的资源使用情况"""
@@ -65,15 +76,15 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/resources?enterprise_id=" + enterprise_id
 
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region, timeout=10)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region, timeout=10)
         return body
 
     def get_region_publickey(self, tenant_name, region, enterprise_id, tenant_id):
         url, token = self.__get_region_access_info(tenant_name, region)
         url += "/v2/builder/publickey/" + tenant_id
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region)
         return res, body
 
     def create_tenant(self, region, tenant_name, tenant_id, enterprise_id):
@@ -85,10 +96,10 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         data = {"tenant_id": tenant_id, "tenant_name": tenant_name, "eid": enterprise_id}
         url += "/v2/tenants"
 
-        self._set_headers(token)
+        headers = self._build_headers(token)
         logger.debug("create tenant url :{0}".format(url))
         try:
-            res, body = self._post(url, self.default_headers, region=region, body=json.dumps(data))
+            res, body = self._post(url, headers, region=region, body=json.dumps(data))
             return res, body
         except RegionApiBaseHttpClient.CallApiError as e:
             return {'status': e.message['httpcode']}, e.message['body']
@@ -100,8 +111,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name
 
-        self._set_headers(token)
-        res, body = self._delete(url, self.default_headers, region=region)
+        headers = self._build_headers(token)
+        res, body = self._delete(url, headers, region=region)
         return body
 
     def create_service(self, region, tenant_name, body):
@@ -113,8 +124,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         body["tenant_id"] = tenant_region.region_tenant_id
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services"
 
-        self._set_headers(token)
-        res, body = self._post(url, self.default_headers, region=region, body=json.dumps(body))
+        headers = self._build_headers(token)
+        res, body = self._post(url, headers, region=region, body=json.dumps(body))
         return body
 
     def get_service_info(self, region, tenant_name, service_alias):
@@ -124,8 +135,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias
 
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region)
         return body
 
     def update_service(self, region, tenant_name, service_alias, body):
@@ -135,8 +146,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias
 
-        self._set_headers(token)
-        res, body = self._put(url, self.default_headers, region=region, body=json.dumps(body))
+        headers = self._build_headers(token)
+        res, body = self._put(url, headers, region=region, body=json.dumps(body))
         return body
 
     def delete_service(self, region, tenant_name, service_alias, enterprise_id, data=None):
@@ -147,10 +158,10 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" \
             + service_alias + "?enterprise_id=" + enterprise_id
 
-        self._set_headers(token)
+        headers = self._build_headers(token)
         if not data:
             data = {}
-        res, body = self._delete(url, self.default_headers, region=region, body=json.dumps(data))
+        res, body = self._delete(url, headers, region=region, body=json.dumps(data))
         return body
 
     def build_service(self, region, tenant_name, service_alias, body):
@@ -160,8 +171,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias + "/build"
 
-        self._set_headers(token)
-        res, body = self._post(url, self.default_headers, region=region, body=json.dumps(body))
+        headers = self._build_headers(token)
+        res, body = self._post(url, headers, region=region, body=json.dumps(body))
         return body
 
     def code_check(self, region, tenant_name, body):
@@ -173,8 +184,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         body["tenant_id"] = tenant_region.region_tenant_id
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/code-check"
 
-        self._set_headers(token)
-        res, body = self._post(url, self.default_headers, region=region, body=json.dumps(body))
+        headers = self._build_headers(token)
+        res, body = self._post(url, headers, region=region, body=json.dumps(body))
         return body
 
     def get_service_language(self, region, service_id, tenant_name):
@@ -183,8 +194,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         url, token = self.__get_region_access_info(tenant_name, region)
         url = url + "/v2/builder/codecheck/service/{0}".format(service_id)
 
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region)
         return body
 
     def add_service_dependency(self, region, tenant_name, service_alias, body):
@@ -196,8 +207,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         body["tenant_id"] = tenant_region.region_tenant_id
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias + "/dependency"
 
-        self._set_headers(token)
-        res, body = self._post(url, self.default_headers, region=region, body=json.dumps(body))
+        headers = self._build_headers(token)
+        res, body = self._post(url, headers, region=region, body=json.dumps(body))
         return body
 
     def delete_service_dependency(self, region, tenant_name, service_alias, body):
@@ -209,8 +220,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         body["tenant_id"] = tenant_region.region_tenant_id
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias + "/dependency"
 
-        self._set_headers(token)
-        res, body = self._delete(url, self.default_headers, region=region, body=json.dumps(body))
+        headers = self._build_headers(token)
+        res, body = self._delete(url, headers, region=region, body=json.dumps(body))
         return body
 
     def add_service_env(self, region, tenant_name, service_alias, body):
@@ -222,8 +233,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         body["tenant_id"] = tenant_region.region_tenant_id
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias + "/env"
 
-        self._set_headers(token)
-        res, body = self._post(url, self.default_headers, region=region, body=json.dumps(body))
+        headers = self._build_headers(token)
+        res, body = self._post(url, headers, region=region, body=json.dumps(body))
         return body
 
     def delete_service_env(self, region, tenant_name, service_alias, body):
@@ -235,8 +246,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         body["tenant_id"] = tenant_region.region_tenant_id
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias + "/env"
 
-        self._set_headers(token)
-        res, body = self._delete(url, self.default_headers, region=region, body=json.dumps(body))
+        headers = self._build_headers(token)
+        res, body = self._delete(url, headers, region=region, body=json.dumps(body))
         return body
 
     def update_service_env(self, region, tenant_name, service_alias, body):
@@ -245,8 +256,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         body["tenant_id"] = tenant_region.region_tenant_id
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias + "/env"
 
-        self._set_headers(token)
-        res, body = self._put(url, self.default_headers, region=region, body=json.dumps(body))
+        headers = self._build_headers(token)
+        res, body = self._put(url, headers, region=region, body=json.dumps(body))
         return res, body
 
     def horizontal_upgrade(self, region, tenant_name, service_alias, body):
@@ -256,8 +267,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias + "/horizontal"
 
-        self._set_headers(token)
-        res, body = self._put(url, self.default_headers, region=region, body=json.dumps(body))
+        headers = self._build_headers(token)
+        res, body = self._put(url, headers, region=region, body=json.dumps(body))
         return body
 
     def vertical_upgrade(self, region, tenant_name, service_alias, body):
@@ -267,8 +278,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias + "/vertical"
 
-        self._set_headers(token)
-        res, body = self._put(url, self.default_headers, region=region, body=json.dumps(body))
+        headers = self._build_headers(token)
+        res, body = self._put(url, headers, region=region, body=json.dumps(body))
         return body
 
     def change_memory(self, region, tenant_name, service_alias, body):
@@ -278,8 +289,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias + "/language"
 
-        self._set_headers(token)
-        res, body = self._post(url, self.default_headers, region=region, body=json.dumps(body))
+        headers = self._build_headers(token)
+        res, body = self._post(url, headers, region=region, body=json.dumps(body))
         return body
 
     def get_region_labels(self, region, tenant_name):
@@ -288,8 +299,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         url, token = self.__get_region_access_info(tenant_name, region)
         url = url + "/v2/resources/labels"
 
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region)
         return body
 
     def addServiceNodeLabel(self, region, tenant_name, service_alias, body):
@@ -299,8 +310,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias + "/label"
 
-        self._set_headers(token)
-        res, body = self._post(url, self.default_headers, json.dumps(body), region=region)
+        headers = self._build_headers(token)
+        res, body = self._post(url, headers, json.dumps(body), region=region)
         return body
 
     def deleteServiceNodeLabel(self, region, tenant_name, service_alias, body):
@@ -310,8 +321,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias + "/label"
 
-        self._set_headers(token)
-        res, body = self._delete(url, self.default_headers, json.dumps(body), region=region)
+        headers = self._build_headers(token)
+        res, body = self._delete(url, headers, json.dumps(body), region=region)
         return body
 
     def add_service_state_label(self, region, tenant_name, service_alias, body):
@@ -321,8 +332,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias + "/label"
 
-        self._set_headers(token)
-        res, body = self._post(url, self.default_headers, body, region=region)
+        headers = self._build_headers(token)
+        res, body = self._post(url, headers, body, region=region)
         return body
 
     def update_service_state_label(self, region, tenant_name, service_alias, body):
@@ -332,8 +343,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias + "/label"
 
-        self._set_headers(token)
-        res, body = self._put(url, self.default_headers, json.dumps(body), region=region)
+        headers = self._build_headers(token)
+        res, body = self._put(url, headers, json.dumps(body), region=region)
         return res, body
 
     def get_service_pods(self, region, tenant_name, service_alias, enterprise_id):
@@ -344,16 +355,16 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" \
             + service_alias + "/pods?enterprise_id=" + enterprise_id
 
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, None, region=region, timeout=15)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, None, region=region, timeout=15, coalesce=True, decode=DECODE_PLAIN)
         return body
 
     def get_dynamic_services_pods(self, region, tenant_name, services_ids):
         url, token = self.__get_region_access_info(tenant_name, region)
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/pods?service_ids={}".format(",".join(services_ids))
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region, timeout=15)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region, timeout=15, coalesce=True, decode=DECODE_PLAIN)
         return body
 
     def pod_detail(self, region, tenant_name, service_alias, pod_name):
@@ -364,8 +375,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" \
             + service_alias + "/pods/" + pod_name + "/detail"
 
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, None, region=region)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, None, region=region)
         return body
 
     def add_service_port(self, region, tenant_name, service_alias, body):
@@ -378,8 +389,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
             port["tenant_id"] = tenant_region.region_tenant_id
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias + "/ports"
 
-        self._set_headers(token)
-        res, body = self._post(url, self.default_headers, json.dumps(body), region=region)
+        headers = self._build_headers(token)
+        res, body = self._post(url, headers, json.dumps(body), region=region)
         return body
 
     def update_service_port(self, region, tenant_name, service_alias, body):
@@ -392,8 +403,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
             port["tenant_id"] = tenant_region.region_tenant_id
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias + "/ports"
 
-        self._set_headers(token)
-        res, body = self._put(url, self.default_headers, json.dumps(body), region=region)
+        headers = self._build_headers(token)
+        res, body = self._put(url, headers, json.dumps(body), region=region)
         return body
 
     def delete_service_port(self, region, tenant_name, service_alias, port, enterprise_id, body={}):
@@ -404,8 +415,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias + "/ports/" + str(
             port) + "?enterprise_id=" + enterprise_id
 
-        self._set_headers(token)
-        res, body = self._delete(url, self.default_headers, json.dumps(body), region=region)
+        headers = self._build_headers(token)
+        res, body = self._delete(url, headers, json.dumps(body), region=region)
         return body
 
     def manage_inner_port(self, region, tenant_name, service_alias, port, body):
@@ -416,8 +427,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias + "/ports/" + str(
             port) + "/inner"
 
-        self._set_headers(token)
-        res, body = self._put(url, self.default_headers, json.dumps(body), region=region)
+        headers = self._build_headers(token)
+        res, body = self._put(url, headers, json.dumps(body), region=region)
         return body
 
     def manage_outer_port(self, region, tenant_name, service_alias, port, body):
@@ -428,8 +439,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
             url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias + "/ports/" + str(
                 port) + "/outer"
 
-            self._set_headers(token)
-            res, body = self._put(url, self.default_headers, json.dumps(body), region=region)
+            headers = self._build_headers(token)
+            res, body = self._put(url, headers, json.dumps(body), region=region)
             return body
         except RegionApiBaseHttpClient.CallApiError as e:
             message = e.body.get("msg")
@@ -449,8 +460,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         body["tenant_id"] = tenant_region.region_tenant_id
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias + "/probe"
 
-        self._set_headers(token)
-        res, body = self._put(url, self.default_headers, json.dumps(body), region=region)
+        headers = self._build_headers(token)
+        res, body = self._put(url, headers, json.dumps(body), region=region)
         return res, body
 
     def add_service_probe(self, region, tenant_name, service_alias, body):
@@ -461,8 +472,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         body["tenant_id"] = tenant_region.region_tenant_id
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias + "/probe"
 
-        self._set_headers(token)
-        res, body = self._post(url, self.default_headers, json.dumps(body), region=region)
+        headers = self._build_headers(token)
+        res, body = self._post(url, headers, json.dumps(body), region=region)
         return res, body
 
     def delete_service_probe(self, region, tenant_name, service_alias, body):
@@ -472,8 +483,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias + "/probe"
 
-        self._set_headers(token)
-        res, body = self._delete(url, self.default_headers, json.dumps(body), region=region)
+        headers = self._build_headers(token)
+        res, body = self._delete(url, headers, json.dumps(body), region=region)
         return body
 
     def restart_service(self, region, tenant_name, service_alias, body):
@@ -483,8 +494,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias + "/restart"
 
-        self._set_headers(token)
-        res, body = self._post(url, self.default_headers, json.dumps(body), region=region)
+        headers = self._build_headers(token)
+        res, body = self._post(url, headers, json.dumps(body), region=region)
         return body
 
     def rollback(self, region, tenant_name, service_alias, body):
@@ -494,8 +505,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias + "/rollback"
 
-        self._set_headers(token)
-        res, body = self._post(url, self.default_headers, json.dumps(body), region=region)
+        headers = self._build_headers(token)
+        res, body = self._post(url, headers, json.dumps(body), region=region)
         return body
 
     def start_service(self, region, tenant_name, service_alias, body):
@@ -505,8 +516,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias + "/start"
 
-        self._set_headers(token)
-        res, body = self._post(url, self.default_headers, json.dumps(body), region=region)
+        headers = self._build_headers(token)
+        res, body = self._post(url, headers, json.dumps(body), region=region)
         return body
 
     def stop_service(self, region, tenant_name, service_alias, body):
@@ -516,8 +527,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias + "/stop"
 
-        self._set_headers(token)
-        res, body = self._post(url, self.default_headers, json.dumps(body), region=region)
+        headers = self._build_headers(token)
+        res, body = self._post(url, headers, json.dumps(body), region=region)
         return body
 
     def upgrade_service(self, region, tenant_name, service_alias, body):
@@ -527,8 +538,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias + "/upgrade"
 
-        self._set_headers(token)
-        res, body = self._post(url, self.default_headers, json.dumps(body), region=region)
+        headers = self._build_headers(token)
+        res, body = self._post(url, headers, json.dumps(body), region=region)
         return body
 
     def check_service_status(self, region, tenant_name, service_alias, enterprise_id):
@@ -539,15 +550,15 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" \
             + service_alias + "/status?enterprise_id=" + enterprise_id
 
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region, coalesce=True)
         return body
 
     def get_volume_options(self, region, tenant_name):
         uri_prefix, token = self.__get_region_access_info(tenant_name, region)
         url = uri_prefix + "/v2/volume-options"
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region)
         return body
 
     def get_service_volumes_status(self, region, tenant_name, service_alias):
@@ -555,8 +566,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         tenant_name = tenant_region.region_tenant_name
         url = uri_prefix + "/v2/tenants/{0}/services/{1}/volumes-status".format(tenant_name, service_alias)
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region)
         return res, body
 
     def get_service_volumes(self, region, tenant_name, service_alias, enterprise_id):
@@ -565,8 +576,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_name = tenant_region.region_tenant_name
         url = uri_prefix + "/v2/tenants/{0}/services/{1}/volumes?enterprise_id={2}".format(
             tenant_name, service_alias, enterprise_id)
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region)
         return res, body
 
     def add_service_volumes(self, region, tenant_name, service_alias, body):
@@ -574,8 +585,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         tenant_name = tenant_region.region_tenant_name
         url = uri_prefix + "/v2/tenants/{0}/services/{1}/volumes".format(tenant_name, service_alias)
-        self._set_headers(token)
-        return self._post(url, self.default_headers, json.dumps(body), region=region)
+        headers = self._build_headers(token)
+        return self._post(url, headers, json.dumps(body), region=region)
 
     def delete_service_volumes(self, region, tenant_name, service_alias, volume_name, enterprise_id, body={}):
         uri_prefix, token = self.__get_region_access_info(tenant_name, region)
@@ -583,16 +594,16 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_name = tenant_region.region_tenant_name
         url = uri_prefix + "/v2/tenants/{0}/services/{1}/volumes/{2}?enterprise_id={3}".format(
             tenant_name, service_alias, volume_name, enterprise_id)
-        self._set_headers(token)
-        return self._delete(url, self.default_headers, json.dumps(body), region=region)
+        headers = self._build_headers(token)
+        return self._delete(url, headers, json.dumps(body), region=region)
 
     def upgrade_service_volumes(self, region, tenant_name, service_alias, body):
         uri_prefix, token = self.__get_region_access_info(tenant_name, region)
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         tenant_name = tenant_region.region_tenant_name
         url = uri_prefix + "/v2/tenants/{0}/services/{1}/volumes".format(tenant_name, service_alias)
-        self._set_headers(token)
-        return self._put(url, self.default_headers, json.dumps(body), region=region)
+        headers = self._build_headers(token)
+        return self._put(url, headers, json.dumps(body), region=region)
 
     def get_service_dep_volumes(self, region, tenant_name, service_alias, enterprise_id):
         uri_prefix, token = self.__get_region_access_info(tenant_name, region)
@@ -600,8 +611,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_name = tenant_region.region_tenant_name
         url = uri_prefix + "/v2/tenants/{0}/services/{1}/depvolumes?enterprise_id={2}".format(
             tenant_name, service_alias, enterprise_id)
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region)
         return res, body
 
     def add_service_dep_volumes(self, region, tenant_name, service_alias, body):
@@ -610,8 +621,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         tenant_name = tenant_region.region_tenant_name
         url = uri_prefix + "/v2/tenants/{0}/services/{1}/depvolumes".format(tenant_name, service_alias)
-        self._set_headers(token)
-        res, body = self._post(url, self.default_headers, json.dumps(body), region=region)
+        headers = self._build_headers(token)
+        res, body = self._post(url, headers, json.dumps(body), region=region)
         return res, body
 
     def delete_service_dep_volumes(self, region, tenant_name, service_alias, body):
@@ -620,8 +631,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         tenant_name = tenant_region.region_tenant_name
         url = uri_prefix + "/v2/tenants/{0}/services/{1}/depvolumes".format(tenant_name, service_alias)
-        self._set_headers(token)
-        return self._delete(url, self.default_headers, json.dumps(body), region=region)
+        headers = self._build_headers(token)
+        return self._delete(url, headers, json.dumps(body), region=region)
 
     def add_service_volume(self, region, tenant_name, service_alias, body):
         """添加组件持久化目录"""
@@ -630,8 +641,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias + "/volume"
 
-        self._set_headers(token)
-        res, body = self._post(url, self.default_headers, json.dumps(body), region=region)
+        headers = self._build_headers(token)
+        res, body = self._post(url, headers, json.dumps(body), region=region)
         return res, body
 
     def delete_service_volume(self, region, tenant_name, service_alias, body):
@@ -641,8 +652,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias + "/volume"
 
-        self._set_headers(token)
-        res, body = self._delete(url, self.default_headers, json.dumps(body), region=region)
+        headers = self._build_headers(token)
+        res, body = self._delete(url, headers, json.dumps(body), region=region)
         return res, body
 
     def add_service_volume_dependency(self, region, tenant_name, service_alias, body):
@@ -652,8 +663,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias + "/volume-dependency"
 
-        self._set_headers(token)
-        res, body = self._post(url, self.default_headers, json.dumps(body), region=region)
+        headers = self._build_headers(token)
+        res, body = self._post(url, headers, json.dumps(body), region=region)
         return body
 
     def delete_service_volume_dependency(self, region, tenant_name, service_alias, body):
@@ -663,8 +674,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias + "/volume-dependency"
 
-        self._set_headers(token)
-        res, body = self._delete(url, self.default_headers, json.dumps(body), region=region)
+        headers = self._build_headers(token)
+        res, body = self._delete(url, headers, json.dumps(body), region=region)
         return body
 
     def service_status(self, region, tenant_name, body):
@@ -674,8 +685,9 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services_status"
 
-        self._set_headers(token)
-        res, body = self._post(url, self.default_headers, region=region, body=json.dumps(body), timeout=20)
+        headers = self._build_headers(token)
+        res, body = self._post(
+            url, headers, region=region, body=json.dumps(body), timeout=20, coalesce=True, decode=DECODE_PLAIN)
         return body
 
     def get_enterprise_running_services(self, enterprise_id, region, test=False):
@@ -683,8 +695,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
             self.get_enterprise_api_version_v2(enterprise_id, region=region)
         url, token = self.__get_region_access_info_by_enterprise_id(enterprise_id, region)
         url = url + "/v2/enterprise/" + enterprise_id + "/running-services"
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region, timeout=10)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region, timeout=10)
         if res.get("status") == 200 and isinstance(body, dict):
             return body
         return None
@@ -697,8 +709,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" \
             + service_alias + "/log-instance?enterprise_id=" + enterprise_id
 
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region)
         return body
 
     def get_service_logs(self, region, tenant_name, service_alias, rows):
@@ -706,8 +718,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         url, token = self.__get_region_access_info(tenant_name, region)
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/{0}/services/{1}/logs?rows={2}".format(tenant_region.region_tenant_name, service_alias, rows)
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region)
         return body
 
     def get_service_log_files(self, region, tenant_name, service_alias, enterprise_id):
@@ -718,8 +730,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" \
             + service_alias + "/log-file?enterprise_id=" + enterprise_id
 
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region)
         return body
 
     def get_event_log(self, region, tenant_name, service_alias, body):
@@ -728,39 +740,39 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         url, token = self.__get_region_access_info(tenant_name, region)
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias + "/event-log"
-        self._set_headers(token)
-        res, body = self._post(url, self.default_headers, region=region, body=json.dumps(body), timeout=10)
+        headers = self._build_headers(token)
+        res, body = self._post(url, headers, region=region, body=json.dumps(body), timeout=10)
         return res, body
 
     def get_target_events_list(self, region, tenant_name, target, target_id, page, page_size):
         """获取作用对象事件日志列表"""
         url, token = self.__get_region_access_info(tenant_name, region)
         url = url + "/v2/events" + "?target={0}&target-id={1}&page={2}&size={3}".format(target, target_id, page, page_size)
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region, timeout=20)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region, timeout=20, decode=DECODE_PLAIN)
         return res, body
 
     def get_events_log(self, tenant_name, region, event_id):
         """获取作用对象事件日志内容"""
         url, token = self.__get_region_access_info(tenant_name, region)
         url = url + "/v2/events/" + event_id + "/log"
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region)
         return res, body
 
     def get_api_version(self, url, token, region):
         """获取api版本"""
         url += "/v2/show"
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region)
         return res, body
 
     def get_api_version_v2(self, tenant_name, region_name):
         """获取api版本-v2"""
         url, token = self.__get_region_access_info(tenant_name, region_name)
         url += "/v2/show"
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region_name)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region_name)
         return res, body
 
     def get_enterprise_api_version_v2(self, enterprise_id, region, **kwargs):
@@ -769,24 +781,24 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         kwargs["timeout"] = 1
         url, token = self.__get_region_access_info_by_enterprise_id(enterprise_id, region)
         url += "/v2/show"
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region, **kwargs)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region, **kwargs)
         return res, body
 
     def get_region_tenants_resources(self, region, data, enterprise_id=""):
         """获取租户在数据中心下的资源使用情况"""
         url, token = self.__get_region_access_info_by_enterprise_id(enterprise_id, region)
         url += "/v2/resources/tenants"
-        self._set_headers(token)
-        res, body = self._post(url, self.default_headers, json.dumps(data), region=region, timeout=15.0)
+        headers = self._build_headers(token)
+        res, body = self._post(url, headers, json.dumps(data), region=region, timeout=15.0)
         return body
 
     def get_service_resources(self, tenant_name, region, data):
         """获取一批组件的资源使用情况"""
         url, token = self.__get_region_access_info(tenant_name, region)
         url += "/v2/resources/services"
-        self._set_headers(token)
-        res, body = self._post(url, self.default_headers, json.dumps(data), region=region, timeout=10.0)
+        headers = self._build_headers(token)
+        res, body = self._post(url, headers, json.dumps(data), region=region, timeout=10.0)
         return body
 
     # v3.5版本后弃用
@@ -797,8 +809,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/cloud-share"
 
-        self._set_headers(token)
-        res, body = self._post(url, self.default_headers, region=region, body=json.dumps(body))
+        headers = self._build_headers(token)
+        res, body = self._post(url, headers, region=region, body=json.dumps(body))
         return res, body
 
     # v3.5版本新加可用
@@ -807,8 +819,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         url, token = self.__get_region_access_info(tenant_name, region)
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = "{0}/v2/tenants/{1}/services/{2}/share".format(url, tenant_region.region_tenant_name, service_alias)
-        self._set_headers(token)
-        res, body = self._post(url, self.default_headers, region=region, body=json.dumps(body))
+        headers = self._build_headers(token)
+        res, body = self._post(url, headers, region=region, body=json.dumps(body))
         return res, body
 
     def share_service_result(self, region, tenant_name, service_alias, region_share_id):
@@ -817,8 +829,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = "{0}/v2/tenants/{1}/services/{2}/share/{3}".format(url, tenant_region.region_tenant_name, service_alias,
                                                                  region_share_id)
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region)
         return res, body
 
     def share_plugin(self, region_name, tenant_name, plugin_id, body):
@@ -826,8 +838,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         url, token = self.__get_region_access_info(tenant_name, region_name)
         tenant_region = self.__get_tenant_region_info(tenant_name, region_name)
         url = "{0}/v2/tenants/{1}/plugins/{2}/share".format(url, tenant_region.region_tenant_name, plugin_id)
-        self._set_headers(token)
-        res, body = self._post(url, self.default_headers, region=region_name, body=json.dumps(body))
+        headers = self._build_headers(token)
+        res, body = self._post(url, headers, region=region_name, body=json.dumps(body))
         return res, body
 
     def share_plugin_result(self, region_name, tenant_name, plugin_id, region_share_id):
@@ -836,8 +848,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region_name)
         url = "{0}/v2/tenants/{1}/plugins/{2}/share/{3}".format(url, tenant_region.region_tenant_name, plugin_id,
                                                                 region_share_id)
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region_name)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region_name)
         return res, body
 
     def bindDomain(self, region, tenant_name, service_alias, body):
@@ -847,8 +859,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         body["tenant_id"] = tenant_region.region_tenant_id
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias + "/domains"
 
-        self._set_headers(token)
-        res, body = self._post(url, self.default_headers, json.dumps(body), region=region)
+        headers = self._build_headers(token)
+        res, body = self._post(url, headers, json.dumps(body), region=region)
         return body
 
     def unbindDomain(self, region, tenant_name, service_alias, body):
@@ -857,8 +869,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias + "/domains/" + \
             body["domain"]
-        self._set_headers(token)
-        res, body = self._delete(url, self.default_headers, json.dumps(body), region=region)
+        headers = self._build_headers(token)
+        res, body = self._delete(url, headers, json.dumps(body), region=region)
         return body
 
     def bind_http_domain(self, region, tenant_name, body):
@@ -867,8 +879,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         body["tenant_id"] = tenant_region.region_tenant_id
         url = url + "/v2/tenants/" + tenant_name + "/http-rule"
-        self._set_headers(token)
-        res, body = self._post(url, self.default_headers, json.dumps(body), region=region)
+        headers = self._build_headers(token)
+        res, body = self._post(url, headers, json.dumps(body), region=region)
         return body
 
     def update_http_domain(self, region, tenant_name, body):
@@ -878,8 +890,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         body["tenant_id"] = tenant_region.region_tenant_id
         url = url + "/v2/tenants/" + tenant_name + "/http-rule"
 
-        self._set_headers(token)
-        res, body = self._put(url, self.default_headers, json.dumps(body), region=region)
+        headers = self._build_headers(token)
+        res, body = self._put(url, headers, json.dumps(body), region=region)
         return body
 
     def delete_http_domain(self, region, tenant_name, body):
@@ -887,8 +899,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         url, token = self.__get_region_access_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_name + "/http-rule"
 
-        self._set_headers(token)
-        res, body = self._delete(url, self.default_headers, json.dumps(body), region=region)
+        headers = self._build_headers(token)
+        res, body = self._delete(url, headers, json.dumps(body), region=region)
         return body
 
     def bindTcpDomain(self, region, tenant_name, body):
@@ -897,8 +909,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         body["tenant_id"] = tenant_region.region_tenant_id
         url = url + "/v2/tenants/" + tenant_name + "/tcp-rule"
-        self._set_headers(token)
-        res, body = self._post(url, self.default_headers, json.dumps(body), region=region)
+        headers = self._build_headers(token)
+        res, body = self._post(url, headers, json.dumps(body), region=region)
         return body
 
     def updateTcpDomain(self, region, tenant_name, body):
@@ -908,8 +920,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         body["tenant_id"] = tenant_region.region_tenant_id
         url = url + "/v2/tenants/" + tenant_name + "/tcp-rule"
 
-        self._set_headers(token)
-        res, body = self._put(url, self.default_headers, json.dumps(body), region=region)
+        headers = self._build_headers(token)
+        res, body = self._put(url, headers, json.dumps(body), region=region)
         return body
 
     def unbindTcpDomain(self, region, tenant_name, body):
@@ -917,22 +929,22 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         url, token = self.__get_region_access_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_name + "/tcp-rule"
 
-        self._set_headers(token)
-        res, body = self._delete(url, self.default_headers, json.dumps(body), region=region)
+        headers = self._build_headers(token)
+        res, body = self._delete(url, headers, json.dumps(body), region=region)
         return body
 
     def get_port(self, region, tenant_name, lock=False):
         url, token = self.__get_region_access_info(tenant_name, region)
         url = url + "/v2/gateway/ports?lock={}".format(lock)
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region)
         return res, body
 
     def get_ips(self, region, tenant_name):
         url, token = self.__get_region_access_info(tenant_name, region)
         url = url + "/v2/gateway/ips"
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region)
         return res, body
 
     def pluginServiceRelation(self, region, tenant_name, service_alias, body):
@@ -941,8 +953,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias + "/plugin"
 
-        self._set_headers(token)
-        return self._post(url, self.default_headers, json.dumps(body), region=region)
+        headers = self._build_headers(token)
+        return self._post(url, headers, json.dumps(body), region=region)
 
     def delPluginServiceRelation(self, region, tenant_name, plugin_id, service_alias):
 
@@ -950,8 +962,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias + "/plugin/" + plugin_id
 
-        self._set_headers(token)
-        return self._delete(url, self.default_headers, None, region=region)
+        headers = self._build_headers(token)
+        return self._delete(url, headers, None, region=region)
 
     def updatePluginServiceRelation(self, region, tenant_name, service_alias, body):
         url, token = self.__get_region_access_info(tenant_name, region)
@@ -959,8 +971,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
 
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias + "/plugin"
 
-        self._set_headers(token)
-        return self._put(url, self.default_headers, json.dumps(body), region=region)
+        headers = self._build_headers(token)
+        return self._put(url, headers, json.dumps(body), region=region)
 
     def postPluginAttr(self, region, tenant_name, service_alias, plugin_id, body):
 
@@ -969,8 +981,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias + "/plugin/" \
             + plugin_id + "/setenv"
 
-        self._set_headers(token)
-        return self._post(url, self.default_headers, json.dumps(body), region=region)
+        headers = self._build_headers(token)
+        return self._post(url, headers, json.dumps(body), region=region)
 
     def putPluginAttr(self, region, tenant_name, service_alias, plugin_id, body):
 
@@ -980,8 +992,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" \
             + service_alias + "/plugin/" + plugin_id + "/upenv"
 
-        self._set_headers(token)
-        return self._put(url, self.default_headers, json.dumps(body), region=region)
+        headers = self._build_headers(token)
+        return self._put(url, headers, json.dumps(body), region=region)
 
     def create_plugin(self, region, tenant_name, body):
         """创建数据中心端插件"""
@@ -990,8 +1002,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/plugin"
 
-        self._set_headers(token)
-        res, body = self._post(url, self.default_headers, json.dumps(body), region=region)
+        headers = self._build_headers(token)
+        res, body = self._post(url, headers, json.dumps(body), region=region)
         return res, body
 
     def build_plugin(self, region, tenant_name, plugin_id, body):
@@ -1000,8 +1012,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/{0}/plugin/{1}/build".format(tenant_region.region_tenant_name, plugin_id)
 
-        self._set_headers(token)
-        res, body = self._post(url, self.default_headers, json.dumps(body), region=region)
+        headers = self._build_headers(token)
+        res, body = self._post(url, headers, json.dumps(body), region=region)
         return body
 
     def get_build_status(self, region, tenant_name, plugin_id, build_version):
@@ -1011,8 +1023,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         url = url + "/v2/tenants/{0}/plugin/{1}/build-version/{2}".format(tenant_region.region_tenant_name, plugin_id,
                                                                           build_version)
 
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region)
         return body
 
     def get_plugin_event_log(self, region, tenant_name, data):
@@ -1021,8 +1033,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         url, token = self.__get_region_access_info(tenant_name, region)
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/{0}/event-log".format(tenant_region.region_tenant_name)
-        self._set_headers(token)
-        res, body = self._post(url, self.default_headers, json.dumps(data), region=region)
+        headers = self._build_headers(token)
+        res, body = self._post(url, headers, json.dumps(data), region=region)
         return body
 
     def delete_plugin_version(self, region, tenant_name, plugin_id, build_version):
@@ -1033,8 +1045,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         url = url + "/v2/tenants/{0}/plugin/{1}/build-version/{2}".format(tenant_region.region_tenant_name, plugin_id,
                                                                           build_version)
 
-        self._set_headers(token)
-        res, body = self._delete(url, self.default_headers, region=region)
+        headers = self._build_headers(token)
+        res, body = self._delete(url, headers, region=region)
         return body
 
     def get_query_data(self, region, tenant_name, params):
@@ -1042,8 +1054,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
 
         url, token = self.__get_region_access_info(tenant_name, region)
         url = url + "/api/v1/query" + params
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region, timeout=10, retries=1)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region, timeout=10, retries=1)
         return res, body
 
     def get_query_service_access(self, region, tenant_name, params):
@@ -1051,8 +1063,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
 
         url, token = self.__get_region_access_info(tenant_name, region)
         url = url + "/api/v1/query" + params
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region, timeout=10, retries=1)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region, timeout=10, retries=1)
         return res, body
 
     def get_query_domain_access(self, region, tenant_name, params):
@@ -1060,16 +1072,16 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
 
         url, token = self.__get_region_access_info(tenant_name, region)
         url = url + "/api/v1/query" + params
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region, timeout=10, retries=1)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region, timeout=10, retries=1)
         return res, body
 
     def get_query_range_data(self, region, tenant_name, params):
         """获取监控范围数据"""
         url, token = self.__get_region_access_info(tenant_name, region)
         url = url + "/api/v1/query_range" + params
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region, timeout=10, retries=1)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region, timeout=10, retries=1)
         return res, body
 
     def get_service_publish_status(self, region, tenant_name, service_key, app_version):
@@ -1077,8 +1089,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         url, token = self.__get_region_access_info(tenant_name, region)
         url = url + "/v2/builder/publish/service/{0}/version/{1}".format(service_key, app_version)
 
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region)
         return res, body
 
     def get_tenant_events(self, region, tenant_name, event_ids):
@@ -1088,29 +1100,32 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/event"
 
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region, body=json.dumps({"event_ids": event_ids}), timeout=10)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region, body=json.dumps({"event_ids": event_ids}), timeout=10)
         return body
 
     def get_events_by_event_ids(self, region_name, event_ids):
         """获取多个event的事件"""
         region_info = self.get_region_info(region_name)
         url = region_info.url + "/v2/event"
-        self._set_headers(region_info.token)
+        headers = self._build_headers(region_info.token)
         res, body = self._get(
-            url, self.default_headers, region=region_name, body=json.dumps({"event_ids": event_ids}), timeout=10)
+            url, headers, region=region_name, body=json.dumps({"event_ids": event_ids}), timeout=10, decode=DECODE_PLAIN)
         return body
 
     def __get_region_access_info(self, tenant_name, region):
         """获取一个团队在指定数据中心的身份认证信息"""
+        if type(tenant_name) == Tenants:
+            tenant_name = tenant_name.tenant_name
+        return region_cache.get_access_info(tenant_name, region, self.__load_region_access_info)
+
+    def __load_region_access_info(self, tenant_name, region):
         # 根据团队名获取其归属的企业在指定数据中心的访问信息
         token = None
         if tenant_name:
-            if type(tenant_name) == Tenants:
-                tenant_name = tenant_name.tenant_name
             url, token = client_auth_service.get_region_access_token_by_tenant(tenant_name, region)
         # 如果团队所在企业所属数据中心信息不存在则使用通用的配置(兼容未申请数据中心token的企业)
-        # 管理后台数据需要及时生效，对于数据中心的信息查询使用直接查询原始数据库
+        # 管理后台数据需要及时生效，数据中心信息由 region_cache 缓存，配置变更时通过信号失效
         region_info = self.get_region_info(region_name=region)
         if region_info is None:
             raise err_region_not_found
@@ -1123,7 +1138,7 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
 
     def __get_region_access_info_by_enterprise_id(self, enterprise_id, region):
         url, token = client_auth_service.get_region_access_token_by_enterprise_id(enterprise_id, region)
-        # 管理后台数据需要及时生效，对于数据中心的信息查询使用直接查询原始数据库
+        # 管理后台数据需要及时生效，数据中心信息由 region_cache 缓存，配置变更时通过信号失效
         region_info = self.get_region_info(region_name=region)
         if not region_info:
             raise ServiceHandleException("region not found")
@@ -1141,15 +1156,12 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         url, token = self.__get_region_access_info(tenant_name, region)
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/protocols"
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region)
         return body
 
     def get_region_info(self, region_name):
-        configs = RegionConfig.objects.filter(region_name=region_name)
-        if configs:
-            return configs[0]
-        return None
+        return region_cache.get_region(region_name)
 
     def get_enterprise_region_info(self, eid, region):
         configs = RegionConfig.objects.filter(enterprise_id=eid, region_name=region)
@@ -1167,8 +1179,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/servicecheck"
 
-        self._set_headers(token)
-        res, body = self._post(url, self.default_headers, region=region, body=json.dumps(body))
+        headers = self._build_headers(token)
+        res, body = self._post(url, headers, region=region, body=json.dumps(body))
         return res, body
 
     def get_service_check_info(self, region, tenant_name, uuid):
@@ -1177,8 +1189,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/servicecheck/" + str(uuid)
 
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region)
         return res, body
 
     def service_chargesverify(self, region, tenant_name, data):
@@ -1187,24 +1199,24 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + \
             "/chargesverify?quantity={0}&reason={1}&eid={2}".format(data["quantity"], data["reason"], data["eid"])
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region, body=json.dumps(data))
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region, body=json.dumps(data))
         return res, body
 
     def update_plugin_info(self, region, tenant_name, plugin_id, data):
         url, token = self.__get_region_access_info(tenant_name, region)
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url += "/v2/tenants/{0}/plugin/{1}".format(tenant_region.region_tenant_name, plugin_id)
-        self._set_headers(token)
-        res, body = self._put(url, self.default_headers, json.dumps(data), region=region)
+        headers = self._build_headers(token)
+        res, body = self._put(url, headers, json.dumps(data), region=region)
         return body
 
     def delete_plugin(self, region, tenant_name, plugin_id):
         url, token = self.__get_region_access_info(tenant_name, region)
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url += "/v2/tenants/{0}/plugin/{1}".format(tenant_region.region_tenant_name, plugin_id)
-        self._set_headers(token)
-        res, body = self._delete(url, self.default_headers, region=region)
+        headers = self._build_headers(token)
+        res, body = self._delete(url, headers, region=region)
         return res, body
 
     def install_service_plugin(self, region, tenant_name, service_alias, body):
@@ -1213,16 +1225,16 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias + "/plugin"
 
-        self._set_headers(token)
-        return self._post(url, self.default_headers, json.dumps(body), region=region)
+        headers = self._build_headers(token)
+        return self._post(url, headers, json.dumps(body), region=region)
 
     def uninstall_service_plugin(self, region, tenant_name, plugin_id, service_alias, body={}):
 
         url, token = self.__get_region_access_info(tenant_name, region)
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias + "/plugin/" + plugin_id
-        self._set_headers(token)
-        return self._delete(url, self.default_headers, json.dumps(body), region=region)
+        headers = self._build_headers(token)
+        return self._delete(url, headers, json.dumps(body), region=region)
 
     def update_plugin_service_relation(self, region, tenant_name, service_alias, body):
         url, token = self.__get_region_access_info(tenant_name, region)
@@ -1230,8 +1242,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
 
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias + "/plugin"
 
-        self._set_headers(token)
-        return self._put(url, self.default_headers, json.dumps(body), region=region)
+        headers = self._build_headers(token)
+        return self._put(url, headers, json.dumps(body), region=region)
 
     def update_service_plugin_config(self, region, tenant_name, service_alias, plugin_id, body):
 
@@ -1241,8 +1253,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" \
             + service_alias + "/plugin/" + plugin_id + "/upenv"
 
-        self._set_headers(token)
-        return self._put(url, self.default_headers, json.dumps(body), region=region)
+        headers = self._build_headers(token)
+        return self._put(url, headers, json.dumps(body), region=region)
 
     def get_services_pods(self, region, tenant_name, service_id_list, enterprise_id):
         """获取多个组件的pod信息"""
@@ -1252,108 +1264,108 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/pods?enterprise_id=" \
             + enterprise_id + "&service_ids=" + service_ids
 
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, None, region=region, timeout=10)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, None, region=region, timeout=10)
         return body
 
     def export_app(self, region, enterprise_id, data):
         """导出应用"""
         url, token = self.__get_region_access_info_by_enterprise_id(enterprise_id, region)
         url += "/v2/app/export"
-        self._set_headers(token)
-        res, body = self._post(url, self.default_headers, region=region, body=json.dumps(data).encode('utf-8'))
+        headers = self._build_headers(token)
+        res, body = self._post(url, headers, region=region, body=json.dumps(data).encode('utf-8'))
         return res, body
 
     def get_app_export_status(self, region, enterprise_id, event_id):
         """查询应用导出状态"""
         url, token = self.__get_region_access_info_by_enterprise_id(enterprise_id, region)
         url = url + "/v2/app/export/" + event_id
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region)
         return res, body
 
     def import_app_2_enterprise(self, region, enterprise_id, data):
         """ import app to enterprise"""
         url, token = self.__get_region_access_info_by_enterprise_id(enterprise_id, region)
         url += "/v2/app/import"
-        self._set_headers(token)
-        res, body = self._post(url, self.default_headers, region=region, body=json.dumps(data))
+        headers = self._build_headers(token)
+        res, body = self._post(url, headers, region=region, body=json.dumps(data))
         return res, body
 
     def import_app(self, region, tenant_name, data):
         """导入应用"""
         url, token = self.__get_region_access_info(tenant_name, region)
         url += "/v2/app/import"
-        self._set_headers(token)
-        res, body = self._post(url, self.default_headers, region=region, body=json.dumps(data))
+        headers = self._build_headers(token)
+        res, body = self._post(url, headers, region=region, body=json.dumps(data))
         return res, body
 
     def get_app_import_status(self, region, tenant_name, event_id):
         """查询导入状态"""
         url, token = self.__get_region_access_info(tenant_name, region)
         url = url + "/v2/app/import/" + event_id
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region)
         return res, body
 
     def get_enterprise_app_import_status(self, region, eid, event_id):
         url, token = self.__get_region_access_info_by_enterprise_id(eid, region)
         url = url + "/v2/app/import/" + event_id
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region)
         return res, body
 
     def get_enterprise_import_file_dir(self, region, eid, event_id):
         url, token = self.__get_region_access_info_by_enterprise_id(eid, region)
         url = url + "/v2/app/import/ids/" + event_id
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region)
         return res, body
 
     def get_import_file_dir(self, region, tenant_name, event_id):
         """查询导入目录"""
         url, token = self.__get_region_access_info(tenant_name, region)
         url = url + "/v2/app/import/ids/" + event_id
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region)
         return res, body
 
     def delete_enterprise_import(self, region, eid, event_id):
         url, token = self.__get_region_access_info_by_enterprise_id(eid, region)
         url = url + "/v2/app/import/" + event_id
-        self._set_headers(token)
-        res, body = self._delete(url, self.default_headers, region=region)
+        headers = self._build_headers(token)
+        res, body = self._delete(url, headers, region=region)
         return res, body
 
     def delete_import(self, region, tenant_name, event_id):
         """删除导入"""
         url, token = self.__get_region_access_info(tenant_name, region)
         url = url + "/v2/app/import/" + event_id
-        self._set_headers(token)
-        res, body = self._delete(url, self.default_headers, region=region)
+        headers = self._build_headers(token)
+        res, body = self._delete(url, headers, region=region)
         return res, body
 
     def create_import_file_dir(self, region, tenant_name, event_id):
         """创建导入目录"""
         url, token = self.__get_region_access_info(tenant_name, region)
         url = url + "/v2/app/import/ids/" + event_id
-        self._set_headers(token)
-        res, body = self._post(url, self.default_headers, region=region)
+        headers = self._build_headers(token)
+        res, body = self._post(url, headers, region=region)
         return res, body
 
     def delete_enterprise_import_file_dir(self, region, eid, event_id):
         url, token = self.__get_region_access_info_by_enterprise_id(eid, region)
         url = url + "/v2/app/import/ids/" + event_id
-        self._set_headers(token)
-        res, body = self._delete(url, self.default_headers, region=region)
+        headers = self._build_headers(token)
+        res, body = self._delete(url, headers, region=region)
         return res, body
 
     def delete_import_file_dir(self, region, tenant_name, event_id):
         """删除导入目录"""
         url, token = self.__get_region_access_info(tenant_name, region)
         url = url + "/v2/app/import/ids/" + event_id
-        self._set_headers(token)
-        res, body = self._delete(url, self.default_headers, region=region)
+        headers = self._build_headers(token)
+        res, body = self._delete(url, headers, region=region)
         return res, body
 
     def backup_group_apps(self, region, tenant_name, body):
@@ -1361,8 +1373,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/groupapp/backups"
 
-        self._set_headers(token)
-        res, body = self._post(url, self.default_headers, region=region, body=json.dumps(body))
+        headers = self._build_headers(token)
+        res, body = self._post(url, headers, region=region, body=json.dumps(body))
         return body
 
     def get_backup_status_by_backup_id(self, region, tenant_name, backup_id):
@@ -1370,8 +1382,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/groupapp/backups/" + str(backup_id)
 
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region)
         return body
 
     def delete_backup_by_backup_id(self, region, tenant_name, backup_id):
@@ -1379,8 +1391,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/groupapp/backups/" + str(backup_id)
 
-        self._set_headers(token)
-        res, body = self._delete(url, self.default_headers, region=region)
+        headers = self._build_headers(token)
+        res, body = self._delete(url, headers, region=region)
         return body
 
     def get_backup_status_by_group_id(self, region, tenant_name, group_uuid):
@@ -1388,8 +1400,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/groupapp/backups?group_id=" + str(group_uuid)
 
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region)
         return body
 
     def star_apps_migrate_task(self, region, tenant_name, backup_id, data):
@@ -1398,8 +1410,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/groupapp/backups/" + backup_id + "/restore"
 
-        self._set_headers(token)
-        res, body = self._post(url, self.default_headers, region=region, body=json.dumps(data))
+        headers = self._build_headers(token)
+        res, body = self._post(url, headers, region=region, body=json.dumps(data))
         return body
 
     def get_apps_migrate_status(self, region, tenant_name, backup_id, restore_id):
@@ -1409,8 +1421,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/groupapp/backups/" \
             + backup_id + "/restore/" + restore_id
 
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region)
         return body
 
     def copy_backup_data(self, region, tenant_name, data):
@@ -1419,8 +1431,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/groupapp/backupcopy"
 
-        self._set_headers(token)
-        res, body = self._post(url, self.default_headers, region=region, body=json.dumps(data))
+        headers = self._build_headers(token)
+        res, body = self._post(url, headers, region=region, body=json.dumps(data))
         return body
 
     def get_service_build_versions(self, region, tenant_name, service_alias):
@@ -1431,8 +1443,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" \
             + service_alias + "/build-list"
 
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region)
         return body
 
     def delete_service_build_version(self, region, tenant_name, service_alias, version_id):
@@ -1443,8 +1455,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" \
             + service_alias + "/build-version/" + version_id
 
-        self._set_headers(token)
-        res, body = self._delete(url, self.default_headers, region=region)
+        headers = self._build_headers(token)
+        res, body = self._delete(url, headers, region=region)
         return body
 
     def get_service_build_version_by_id(self, region, tenant_name, service_alias, version_id):
@@ -1455,8 +1467,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" \
             + service_alias + "/build-version/" + version_id
 
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region)
         return res, body
 
     def get_team_services_deploy_version(self, region, tenant_name, data):
@@ -1465,8 +1477,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/deployversions"
 
-        self._set_headers(token)
-        res, body = self._post(url, self.default_headers, region=region, body=json.dumps(data))
+        headers = self._build_headers(token)
+        res, body = self._post(url, headers, region=region, body=json.dumps(data))
         return res, body
 
     def get_service_deploy_version(self, region, tenant_name, service_alias):
@@ -1475,16 +1487,16 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias + "/deployversions"
 
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region)
         return res, body
 
     # 获取数据中心应用异常信息
 
     def get_app_abnormal(self, url, token, region, start_stamp, end_stamp):
         url += "/v2/notificationEvent?start={0}&end={1}".format(start_stamp, end_stamp)
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region)
         return res, body
 
     # 第三方注册api注册方式添加endpoints
@@ -1494,8 +1506,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias + "/endpoints"
 
-        self._set_headers(token)
-        res, body = self._put(url, self.default_headers, region=region, body=json.dumps(data))
+        headers = self._build_headers(token)
+        res, body = self._put(url, headers, region=region, body=json.dumps(data))
         return res, body
 
     # 第三方注册api注册方式添加endpoints
@@ -1505,8 +1517,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias + "/endpoints"
 
-        self._set_headers(token)
-        res, body = self._post(url, self.default_headers, region=region, body=json.dumps(data))
+        headers = self._build_headers(token)
+        res, body = self._post(url, headers, region=region, body=json.dumps(data))
         return res, body
 
     # 第三方注册api注册方式添加endpoints
@@ -1516,8 +1528,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias + "/endpoints"
 
-        self._set_headers(token)
-        res, body = self._delete(url, self.default_headers, region=region, body=json.dumps(data))
+        headers = self._build_headers(token)
+        res, body = self._delete(url, headers, region=region, body=json.dumps(data))
         return res, body
 
     # 第三方组件endpoint数据
@@ -1527,8 +1539,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias + "/endpoints"
 
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region)
         return res, body
 
     # 获取第三方组件健康检测信息
@@ -1538,8 +1550,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias + "/3rd-party/probe"
 
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region)
         return res, body
 
     # 修改第三方组件健康检测信息
@@ -1548,8 +1560,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias + "/3rd-party/probe"
 
-        self._set_headers(token)
-        res, body = self._put(url, self.default_headers, region=region, body=json.dumps(body))
+        headers = self._build_headers(token)
+        res, body = self._put(url, headers, region=region, body=json.dumps(body))
         return res, body
 
     # 5.1版本组件批量操作
@@ -1558,8 +1570,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/batchoperation"
 
-        self._set_headers(token)
-        res, body = self._post(url, self.default_headers, region=region, body=json.dumps(body))
+        headers = self._build_headers(token)
+        res, body = self._post(url, headers, region=region, body=json.dumps(body))
         return res, body
 
     # 修改网关自定义配置项
@@ -1568,8 +1580,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         body["tenant_id"] = tenant_region.region_tenant_id
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias + "/rule-config"
-        self._set_headers(token)
-        res, body = self._put(url, self.default_headers, json.dumps(body), region=region)
+        headers = self._build_headers(token)
+        res, body = self._put(url, headers, json.dumps(body), region=region)
         logger.debug('-------1111--body----->{0}'.format(body))
         return res, body
 
@@ -1580,8 +1592,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias + uri
 
-        self._set_headers(token)
-        res, body = self._post(url, self.default_headers, json.dumps(body), region=region)
+        headers = self._build_headers(token)
+        res, body = self._post(url, headers, json.dumps(body), region=region)
         return body
 
     def list_scaling_records(self, region, tenant_name, service_alias, page=None, page_size=None):
@@ -1592,8 +1604,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         if page is not None and page_size is not None:
             url = url + "?page={}&page_size={}".format(page, page_size)
 
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region)
         return body
 
     def create_xpa_rule(self, region, tenant_name, service_alias, data):
@@ -1601,8 +1613,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias + "/xparules"
 
-        self._set_headers(token)
-        res, body = self._post(url, self.default_headers, body=json.dumps(data), region=region)
+        headers = self._build_headers(token)
+        res, body = self._post(url, headers, body=json.dumps(data), region=region)
         return body
 
     def update_xpa_rule(self, region, tenant_name, service_alias, data):
@@ -1610,16 +1622,16 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias + "/xparules"
 
-        self._set_headers(token)
-        res, body = self._put(url, self.default_headers, body=json.dumps(data), region=region)
+        headers = self._build_headers(token)
+        res, body = self._put(url, headers, body=json.dumps(data), region=region)
         return body
 
     def update_ingresses_by_certificate(self, region_name, tenant_name, body):
         url, token = self.__get_region_access_info(tenant_name, region_name)
         region = self.__get_tenant_region_info(tenant_name, region_name)
         url = url + "/v2/tenants/" + region.region_tenant_name + "/gateway/certificate"
-        self._set_headers(token)
-        res, body = self._put(url, self.default_headers, body=json.dumps(body), region=region_name)
+        headers = self._build_headers(token)
+        res, body = self._put(url, headers, body=json.dumps(body), region=region_name)
         return res, body
 
     def get_region_resources(self, enterprise_id, **kwargs):
@@ -1628,16 +1640,17 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
             self.get_enterprise_api_version_v2(enterprise_id, region=region_name)
         url, token = self.__get_region_access_info_by_enterprise_id(enterprise_id, region_name)
         url = url + "/v2/cluster"
-        self._set_headers(token)
+        headers = self._build_headers(token)
         kwargs["retries"] = 1
         kwargs["timeout"] = 3
-        res, body = self._get(url, self.default_headers, **kwargs)
+        res, body = self._get(url, headers, **kwargs)
         return res, body
 
     def test_region_api(self, region_data):
         region = RegionConfig(**region_data)
         url = region.url + "/v2/show"
-        return self._get(url, self.default_headers, region=region, for_test=True, retries=1, timeout=1)
+        headers = self._build_headers(region.token)
+        return self._get(url, headers, region=region, for_test=True, retries=1, timeout=1)
 
     def check_region_api(self, enterprise_id, region):
         region_info = self.get_enterprise_region_info(enterprise_id, region)
@@ -1645,7 +1658,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
             raise ServiceHandleException("region not found")
         try:
             url = region_info.url + "/v2/show"
-            _, body = self._get(url, self.default_headers, region=region_info.region_name, retries=1, timeout=1)
+            headers = self._build_headers(region_info.token)
+            _, body = self._get(url, headers, region=region_info.region_name, retries=1, timeout=1)
             return body
         except Exception as e:
             logger.exception(e)
@@ -1659,7 +1673,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         url = region_info.url
         url += "/v2/tenants?page={0}&pageSize={1}&eid={2}".format(page, page_size, enterprise_id)
         try:
-            res, body = self._get(url, self.default_headers, region=region_info.region_name)
+            headers = self._build_headers(region_info.token)
+            res, body = self._get(url, headers, region=region_info.region_name)
             return res, body
         except RegionApiBaseHttpClient.CallApiError as e:
             return {'status': e.message['httpcode']}, e.message['body']
@@ -1670,7 +1685,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
             raise ServiceHandleException("region not found")
         url = region_info.url
         url += "/v2/tenants/{0}/limit_memory".format(tenant_name)
-        res, body = self._post(url, self.default_headers, region=region_info.region_name, body=json.dumps(body))
+        headers = self._build_headers(region_info.token)
+        res, body = self._post(url, headers, region=region_info.region_name, body=json.dumps(body))
         return res, body
 
     def create_service_monitor(self, enterprise_id, region, tenant_name, service_alias, body):
@@ -1679,7 +1695,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
             raise ServiceHandleException("region not found")
         url = region_info.url
         url += "/v2/tenants/{0}/services/{1}/service-monitors".format(tenant_name, service_alias)
-        res, body = self._post(url, self.default_headers, region=region_info.region_name, body=json.dumps(body))
+        headers = self._build_headers(region_info.token)
+        res, body = self._post(url, headers, region=region_info.region_name, body=json.dumps(body))
         return res, body
 
     def update_service_monitor(self, enterprise_id, region, tenant_name, service_alias, name, body):
@@ -1688,7 +1705,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
             raise ServiceHandleException("region not found")
         url = region_info.url
         url += "/v2/tenants/{0}/services/{1}/service-monitors/{2}".format(tenant_name, service_alias, name)
-        res, body = self._put(url, self.default_headers, region=region_info.region_name, body=json.dumps(body))
+        headers = self._build_headers(region_info.token)
+        res, body = self._put(url, headers, region=region_info.region_name, body=json.dumps(body))
         return res, body
 
     def delete_service_monitor(self, enterprise_id, region, tenant_name, service_alias, name, body):
@@ -1697,7 +1715,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
             raise ServiceHandleException("region not found")
         url = region_info.url
         url += "/v2/tenants/{0}/services/{1}/service-monitors/{2}".format(tenant_name, service_alias, name)
-        res, body = self._delete(url, self.default_headers, region=region_info.region_name, body=json.dumps(body))
+        headers = self._build_headers(region_info.token)
+        res, body = self._delete(url, headers, region=region_info.region_name, body=json.dumps(body))
 
     def delete_maven_setting(self, enterprise_id, region, name):
         region_info = self.get_enterprise_region_info(enterprise_id, region)
@@ -1705,7 +1724,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
             raise ServiceHandleException("region not found")
         url = region_info.url
         url += "/v2/cluster/builder/mavensetting/{0}".format(name)
-        res, body = self._delete(url, self.default_headers, region=region_info.region_name)
+        headers = self._build_headers(region_info.token)
+        res, body = self._delete(url, headers, region=region_info.region_name)
         return res, body
 
     def add_maven_setting(self, enterprise_id, region, body):
@@ -1714,7 +1734,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
             raise ServiceHandleException("region not found")
         url = region_info.url
         url += "/v2/cluster/builder/mavensetting"
-        res, body = self._post(url, self.default_headers, region=region_info.region_name, body=json.dumps(body))
+        headers = self._build_headers(region_info.token)
+        res, body = self._post(url, headers, region=region_info.region_name, body=json.dumps(body))
         return res, body
 
     def get_maven_setting(self, enterprise_id, region, name):
@@ -1723,7 +1744,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
             raise ServiceHandleException("region not found")
         url = region_info.url
         url += "/v2/cluster/builder/mavensetting/{0}".format(name)
-        res, body = self._get(url, self.default_headers, region=region_info.region_name)
+        headers = self._build_headers(region_info.token)
+        res, body = self._get(url, headers, region=region_info.region_name)
         return res, body
 
     def update_maven_setting(self, enterprise_id, region, name, body):
@@ -1732,7 +1754,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
             raise ServiceHandleException("region not found")
         url = region_info.url
         url += "/v2/cluster/builder/mavensetting/{0}".format(name)
-        res, body = self._put(url, self.default_headers, region=region_info.region_name, body=json.dumps(body))
+        headers = self._build_headers(region_info.token)
+        res, body = self._put(url, headers, region=region_info.region_name, body=json.dumps(body))
         return res, body
 
     def list_maven_settings(self, enterprise_id, region):
@@ -1741,7 +1764,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
             raise ServiceHandleException("region not found")
         url = region_info.url
         url += "/v2/cluster/builder/mavensetting"
-        res, body = self._get(url, self.default_headers, region=region_info.region_name)
+        headers = self._build_headers(region_info.token)
+        res, body = self._get(url, headers, region=region_info.region_name)
         return res, body
 
     def update_app_ports(self, region_name, tenant_name, app_id, data):
@@ -1749,8 +1773,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region_name)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/apps/" + app_id + "/ports"
 
-        self._set_headers(token)
-        res, body = self._put(url, self.default_headers, body=json.dumps(data), region=region_name)
+        headers = self._build_headers(token)
+        res, body = self._put(url, headers, body=json.dumps(data), region=region_name)
         return body
 
     def get_app_status(self, region_name, tenant_name, region_app_id):
@@ -1758,8 +1782,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region_name)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/apps/" + region_app_id + "/status"
 
-        self._set_headers(token)
-        res, body = self._put(url, self.default_headers, region=region_name)
+        headers = self._build_headers(token)
+        res, body = self._put(url, headers, region=region_name)
         return body["bean"]
 
     def get_app_detect_process(self, region_name, tenant_name, region_app_id):
@@ -1767,8 +1791,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region_name)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/apps/" + region_app_id + "/detect-process"
 
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region_name)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region_name)
         return body["list"]
 
     def get_pod(self, region_name, tenant_name, pod_name):
@@ -1776,8 +1800,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region_name)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/pods/" + pod_name
 
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region_name)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region_name)
         return body["bean"]
 
     def install_app(self, region_name, tenant_name, region_app_id, data):
@@ -1785,16 +1809,16 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region_name)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/apps/" + region_app_id + "/install"
 
-        self._set_headers(token)
-        _, _ = self._post(url, self.default_headers, region=region_name, body=json.dumps(data))
+        headers = self._build_headers(token)
+        _, _ = self._post(url, headers, region=region_name, body=json.dumps(data))
 
     def list_app_services(self, region_name, tenant_name, region_app_id):
         url, token = self.__get_region_access_info(tenant_name, region_name)
         tenant_region = self.__get_tenant_region_info(tenant_name, region_name)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/apps/" + region_app_id + "/services"
 
-        self._set_headers(token)
-        _, body = self._get(url, self.default_headers, region=region_name)
+        headers = self._build_headers(token)
+        _, body = self._get(url, headers, region=region_name)
         return body["list"]
 
     def create_application(self, region_name, tenant_name, body):
@@ -1802,8 +1826,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region_name)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/apps"
 
-        self._set_headers(token)
-        res, body = self._post(url, self.default_headers, region=region_name, body=json.dumps(body))
+        headers = self._build_headers(token)
+        res, body = self._post(url, headers, region=region_name, body=json.dumps(body))
         return body.get("bean", None)
 
     def batch_create_application(self, region_name, tenant_name, body):
@@ -1811,8 +1835,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region_name)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/batch_create_apps"
 
-        self._set_headers(token)
-        res, body = self._post(url, self.default_headers, region=region_name, body=json.dumps(body))
+        headers = self._build_headers(token)
+        res, body = self._post(url, headers, region=region_name, body=json.dumps(body))
         return body.get("list", None)
 
     def update_service_app_id(self, region_name, tenant_name, service_alias, body):
@@ -1820,8 +1844,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region_name)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/services/" + service_alias
 
-        self._set_headers(token)
-        res, body = self._put(url, self.default_headers, region=region_name, body=json.dumps(body))
+        headers = self._build_headers(token)
+        res, body = self._put(url, headers, region=region_name, body=json.dumps(body))
         return body.get("bean", None)
 
     def batch_update_service_app_id(self, region_name, tenant_name, app_id, body):
@@ -1829,8 +1853,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region_name)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/apps/" + app_id + "/services"
 
-        self._set_headers(token)
-        res, body = self._put(url, self.default_headers, region=region_name, body=json.dumps(body))
+        headers = self._build_headers(token)
+        res, body = self._put(url, headers, region=region_name, body=json.dumps(body))
         return body.get("bean", None)
 
     def update_app(self, region_name, tenant_name, app_id, body):
@@ -1838,8 +1862,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region_name)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/apps/" + app_id
 
-        self._set_headers(token)
-        res, body = self._put(url, self.default_headers, region=region_name, body=json.dumps(body))
+        headers = self._build_headers(token)
+        res, body = self._put(url, headers, region=region_name, body=json.dumps(body))
         return body.get("bean", None)
 
     def create_app_config_group(self, region_name, tenant_name, app_id, body):
@@ -1847,8 +1871,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region_name)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/apps/" + app_id + "/configgroups"
 
-        self._set_headers(token)
-        res, body = self._post(url, self.default_headers, region=region_name, body=json.dumps(body))
+        headers = self._build_headers(token)
+        res, body = self._post(url, headers, region=region_name, body=json.dumps(body))
         return body.get("bean", None)
 
     def update_app_config_group(self, region_name, tenant_name, app_id, config_group_name, body):
@@ -1856,8 +1880,8 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region_name)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/apps/" + app_id + "/configgroups/" + config_group_name
 
-        self._set_headers(token)
-        res, body = self._put(url, self.default_headers, region=region_name, body=json.dumps(body))
+        headers = self._build_headers(token)
+        res, body = self._put(url, headers, region=region_name, body=json.dumps(body))
         return body.get("bean", None)
 
     def delete_app(self, region_name, tenant_name, app_id, data={}):
@@ -1865,24 +1889,24 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region_name)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/apps/" + app_id
 
-        self._set_headers(token)
-        _, _ = self._delete(url, self.default_headers, region=region_name, body=json.dumps(data))
+        headers = self._build_headers(token)
+        _, _ = self._delete(url, headers, region=region_name, body=json.dumps(data))
 
     def delete_app_config_group(self, region_name, tenant_name, app_id, config_group_name):
         url, token = self.__get_region_access_info(tenant_name, region_name)
         tenant_region = self.__get_tenant_region_info(tenant_name, region_name)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/apps/" + app_id + "/configgroups/" + config_group_name
 
-        self._set_headers(token)
-        res, body = self._delete(url, self.default_headers, region=region_name)
+        headers = self._build_headers(token)
+        res, body = self._delete(url, headers, region=region_name)
         return res, body
 
     def get_monitor_metrics(self, region_name, tenant, target, app_id, component_id):
         url, token = self.__get_region_access_info(tenant.tenant_name, region_name)
         url = url + "/v2/monitor/metrics?target={target}&tenant={tenant_id}&app={app_id}&component={component_id}".format(
             target=target, tenant_id=tenant.tenant_id, app_id=app_id, component_id=component_id)
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region_name)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region_name)
         return body
 
     def check_resource_name(self, tenant_name, region_name, rtype, name):
@@ -1890,9 +1914,9 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region_name)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/checkResourceName"
 
-        self._set_headers(token)
+        headers = self._build_headers(token)
         _, body = self._post(
-            url, self.default_headers, region=region_name, body=json.dumps({
+            url, headers, region=region_name, body=json.dumps({
                 "type": rtype,
                 "name": name,
             }))
@@ -1903,9 +1927,9 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region_name)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/apps/" + app_id + "/parse-services"
 
-        self._set_headers(token)
+        headers = self._build_headers(token)
         _, body = self._post(
-            url, self.default_headers, region=region_name, body=json.dumps({
+            url, headers, region=region_name, body=json.dumps({
                 "values": values,
             }))
         return body["list"]
@@ -1915,46 +1939,46 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         tenant_region = self.__get_tenant_region_info(tenant_name, region_name)
         url = url + "/v2/tenants/" + tenant_region.region_tenant_name + "/apps/" + app_id + "/releases"
 
-        self._set_headers(token)
-        _, body = self._get(url, self.default_headers, region=region_name)
+        headers = self._build_headers(token)
+        _, body = self._get(url, headers, region=region_name)
         return body["list"]
 
     def sync_components(self, tenant_name, region_name, app_id, components):
         url, token = self.__get_region_access_info(tenant_name, region_name)
         url = url + "/v2/tenants/{tenant_name}/apps/{app_id}/components".format(tenant_name=tenant_name, app_id=app_id)
-        self._set_headers(token)
-        self._post(url, self.default_headers, body=json.dumps(components), region=region_name)
+        headers = self._build_headers(token)
+        self._post(url, headers, body=json.dumps(components), region=region_name)
 
     def sync_config_groups(self, tenant_name, region_name, app_id, body):
         url, token = self.__get_region_access_info(tenant_name, region_name)
         url = url + "/v2/tenants/{tenant_name}/apps/{app_id}/app-config-groups".format(tenant_name=tenant_name, app_id=app_id)
-        self._set_headers(token)
-        self._post(url, self.default_headers, body=json.dumps(body), region=region_name)
+        headers = self._build_headers(token)
+        self._post(url, headers, body=json.dumps(body), region=region_name)
 
     def sync_plugins(self, tenant_name, region_name, body):
         url, token = self.__get_region_access_info(tenant_name, region_name)
         url = url + "/v2/tenants/{tenant_name}/plugins".format(tenant_name=tenant_name)
-        self._set_headers(token)
-        self._post(url, self.default_headers, body=json.dumps(body), region=region_name)
+        headers = self._build_headers(token)
+        self._post(url, headers, body=json.dumps(body), region=region_name)
 
     def build_plugins(self, tenant_name, region_name, body):
         url, token = self.__get_region_access_info(tenant_name, region_name)
         url = url + "/v2/tenants/{tenant_name}/batch-build-plugins".format(tenant_name=tenant_name)
-        self._set_headers(token)
-        self._post(url, self.default_headers, body=json.dumps(body), region=region_name)
+        headers = self._build_headers(token)
+        self._post(url, headers, body=json.dumps(body), region=region_name)
 
     def get_region_license_feature(self, tenant: Tenants, region_name):
         url, token = self.__get_region_access_info(tenant.tenant_name, region_name)
         url = url + "/license/features"
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, region=region_name)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, region=region_name)
         return body
 
     def list_app_statuses_by_app_ids(self, tenant_name, region_name, body):
         url, token = self.__get_region_access_info(tenant_name, region_name)
         url = url + "/v2/tenants/{tenant_name}/appstatuses".format(tenant_name=tenant_name)
-        self._set_headers(token)
-        res, body = self._get(url, self.default_headers, body=json.dumps(body), region=region_name)
+        headers = self._build_headers(token)
+        res, body = self._get(url, headers, body=json.dumps(body), region=region_name, coalesce=True, decode=DECODE_PLAIN)
         return body
 
     def get_component_log(self, tenant_name, region_name, service_alias, pod_name, container_name, follow=False):
@@ -1962,6 +1986,6 @@ class RegionInvokeApi(RegionApiBaseHttpClient):
         follow = "true" if follow else "false"
         url = url + "/v2/tenants/{}/services/{}/log?podName={}&containerName={}&follow={}".format(
             tenant_name, service_alias, pod_name, container_name, follow)
-        self._set_headers(token)
-        resp, _ = self._get(url, self._set_headers(token), region=region_name, preload_content=False)
+        headers = self._build_headers(token)
+        resp, _ = self._get(url, headers, region=region_name, preload_content=False)
         return resp
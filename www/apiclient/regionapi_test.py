@@ -0,0 +1,27 @@
+# -*- coding: utf8 -*-
+from www.apiclient.regionapi import RegionInvokeApi
+
+
+def test_build_headers_per_call(settings):
+    settings.MODULES = dict(settings.MODULES, RegionToken=True)
+    api = RegionInvokeApi()
+    default_headers = dict(api.default_headers)
+
+    first = api._build_headers("token-a")
+    second = api._build_headers("token-b")
+    assert first["Authorization"] == "token-a"
+    assert second["Authorization"] == "token-b"
+    assert api.default_headers == default_headers
+
+
+def test_enterprise_region_calls_send_region_token(settings, mocker):
+    from console.models.main import RegionConfig
+    settings.MODULES = dict(settings.MODULES, RegionToken=True)
+    api = RegionInvokeApi()
+    region = RegionConfig(region_name="r1", url="http://r1", token="token-r1")
+    mocker.patch.object(api, "get_enterprise_region_info", return_value=region)
+    request = mocker.patch.object(api, "_get", return_value=({"status": 200}, {}))
+
+    api.list_maven_settings("eid", "r1")
+    assert request.call_args[0][1]["Authorization"] == "token-r1"
+    assert "Authorization" not in api.default_headers
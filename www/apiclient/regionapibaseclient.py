@@ -12,14 +12,38 @@ import ssl
 import certifi
 import urllib3
 from addict import Dict
-from console.exception.main import ServiceHandleException, ErrClusterLackOfMemory, ErrTenantLackOfMemory
-from console.repositories.region_repo import region_repo
+from console.exception.main import (ServiceHandleException, ErrClusterLackOfMemory, ErrTenantLackOfMemory, ErrRegionUnavailable)
 from django.conf import settings
-from django.http import HttpResponse, QueryDict
+from django.http import HttpResponse, QueryDict, StreamingHttpResponse
 from urllib3.exceptions import MaxRetryError
+from www.apiclient.circuitbreaker import circuit_breakers
+from www.apiclient.regioncache import region_cache
+from www.apiclient.singleflight import single_flight
 
 logger = logging.getLogger('default')
 
+# how response bodies are decoded, see RegionApiBaseHttpClient._check_status
+DECODE_ADDICT = "addict"
+DECODE_ATTR = "attr"
+DECODE_PLAIN = "plain"
+
+
+class AttrDict(dict):
+    """
+    dict with read and write attribute access, built by json.loads(object_hook=AttrDict).
+
+    unlike addict.Dict, nested values are not converted again and missing keys raise AttributeError.
+    """
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        self[name] = value
+
 
 class RegionApiBaseHttpClient(object):
     class CallApiError(Exception):
@@ -70,9 +94,9 @@ class RegionApiBaseHttpClient(object):
         self.clients = {}
         self.apitype = 'Not specified'
 
-    def _jsondecode(self, string):
+    def _jsondecode(self, string, object_hook=None):
         try:
-            pybody = json.loads(string)
+            pybody = json.loads(string, object_hook=object_hook)
         except ValueError:
             if len(string) < 10000:
                 pybody = {"raw": string}
@@ -80,12 +104,17 @@ class RegionApiBaseHttpClient(object):
                 pybody = {"raw": "too long to record!"}
         return pybody
 
-    def _check_status(self, url, method, status, content):
+    def _check_status(self, url, method, status, content, decode=DECODE_ADDICT):
+        """
+        :param decode: DECODE_ADDICT converts the whole body into addict.Dict, which costs more cpu than the
+        request itself for large lists. DECODE_PLAIN returns the dicts of json.loads, DECODE_ATTR returns
+        AttrDict. endpoints opt in when their callers only use dict access (or plain attribute access).
+        """
         body = None
         if content:
-            body = self._jsondecode(content)
+            body = self._jsondecode(content, object_hook=AttrDict if decode == DECODE_ATTR else None)
         res = Dict({"status": status})
-        if isinstance(body, dict):
+        if decode == DECODE_ADDICT and isinstance(body, dict):
             body = Dict(body)
         if 400 <= status <= 600:
             if not body:
@@ -133,17 +162,22 @@ class RegionApiBaseHttpClient(object):
         d_connect, d_red = self.get_default_timeout_conifg()
         timeout = kwargs.get("timeout", d_red)
         preload_content = kwargs.get("preload_content")
+        breaker = None
         if kwargs.get("for_test"):
             region = region_name
             region_name = region.region_name
         else:
-            region = region_repo.get_region_by_region_name(region_name)
+            breaker = circuit_breakers.get(region_name)
+            region = region_cache.get_region(region_name)
         if not region:
             raise ServiceHandleException("region {0} not found".format(region_name), error_code=10412)
         client = self.get_client(region_config=region)
         if not client:
             raise ServiceHandleException(
                 msg="create region api client failure", msg_show="创建集群通信客户端错误，请检查集群配置", error_code=10411)
+        # right before the call, so that a half open probe is always reported back
+        if breaker and not breaker.allow():
+            raise ErrRegionUnavailable(region_name)
         try:
             if preload_content is False:
                 response = client.request(
@@ -153,6 +187,7 @@ class RegionApiBaseHttpClient(object):
                     preload_content=preload_content,
                     timeout=None,  # None will set an infinite timeout.
                 )
+                self._record_success(breaker)
                 return response, None
             if body is None:
                 response = client.request(
@@ -169,24 +204,56 @@ class RegionApiBaseHttpClient(object):
                     body=body,
                     timeout=urllib3.Timeout(connect=d_connect, read=timeout),
                     retries=retries)
+            # any http response, even an error status, means the region is reachable
+            self._record_success(breaker)
             return response.status, response.data
         except urllib3.exceptions.SSLError:
+            self._record_failure(breaker)
             self.destroy_client(region_config=region)
             raise ServiceHandleException(error_code=10411, msg="SSLError", msg_show="访问数据中心异常，请稍后重试")
         except socket.timeout as e:
+            self._record_failure(breaker)
             raise self.CallApiError(self.apitype, url, method, Dict({"status": 101}), {
                 "type": "request time out",
                 "error": str(e),
                 "error_code": 10411,
             })
         except MaxRetryError as e:
+            self._record_failure(breaker)
             logger.debug("error url {}".format(url))
             logger.exception(e)
             raise ServiceHandleException(error_code=10411, msg="MaxRetryError", msg_show="访问数据中心异常，请稍后重试")
+        except urllib3.exceptions.HTTPError as e:
+            # connection and read errors which were not retried
+            self._record_failure(breaker)
+            logger.debug("error url {}".format(url))
+            logger.exception(e)
+            raise ServiceHandleException(error_code=10411, msg="Exception", msg_show="访问数据中心异常，请稍后重试")
         except Exception as e:
+            # not a sign of an unreachable region, only transport failures open the circuit
+            self._record_aborted(breaker)
             logger.debug("error url {}".format(url))
             logger.exception(e)
             raise ServiceHandleException(error_code=10411, msg="Exception", msg_show="访问数据中心异常，请稍后重试")
+        except BaseException:
+            # e.g. killed by a fan out deadline
+            self._record_aborted(breaker)
+            raise
+
+    @staticmethod
+    def _record_success(breaker):
+        if breaker:
+            breaker.record_success()
+
+    @staticmethod
+    def _record_failure(breaker):
+        if breaker:
+            breaker.record_failure()
+
+    @staticmethod
+    def _record_aborted(breaker):
+        if breaker:
+            breaker.record_aborted()
 
     def destroy_client(self, region_config):
         key = hash(region_config.url + region_config.ssl_ca_cert + region_config.cert_file + region_config.key_file)
@@ -252,48 +319,68 @@ class RegionApiBaseHttpClient(object):
                 **addition_pool_args)
         return self.pool_manager
 
+    def _coalesced_request(self, url, method, headers=None, body=None, **kwargs):
+        """
+        identical concurrent requests share one http call, every caller decodes its own copy of the
+        response. only for endpoints without side effects.
+        """
+        key = single_flight.make_key(kwargs.get("region"), method, url, headers, body)
+        return single_flight.do(key, self._request, url, method, headers=headers, body=body, **kwargs)
+
     def _get(self, url, headers, body=None, *args, **kwargs):
-        if body is not None:
+        decode = kwargs.pop("decode", DECODE_ADDICT)
+        coalesce = kwargs.pop("coalesce", False)
+        if coalesce and kwargs.get("preload_content") is not False:
+            response, content = self._coalesced_request(url, 'GET', headers=headers, body=body, **kwargs)
+        elif body is not None:
             response, content = self._request(url, 'GET', headers=headers, body=body, *args, **kwargs)
         else:
             response, content = self._request(url, 'GET', headers=headers, *args, **kwargs)
         preload_content = kwargs.get("preload_content")
         if preload_content is False:
             return response, None
-        res, body = self._check_status(url, 'GET', response, content)
+        res, body = self._check_status(url, 'GET', response, content, decode)
         return res, body
 
     def _post(self, url, headers, body=None, *args, **kwargs):
-        if body is not None:
+        decode = kwargs.pop("decode", DECODE_ADDICT)
+        # some read-only queries are sent as POST because of the size of their body
+        if kwargs.pop("coalesce", False):
+            response, content = self._coalesced_request(url, 'POST', headers=headers, body=body, **kwargs)
+        elif body is not None:
             response, content = self._request(url, 'POST', headers=headers, body=body, *args, **kwargs)
         else:
             response, content = self._request(url, 'POST', headers=headers, *args, **kwargs)
-        res, body = self._check_status(url, 'POST', response, content)
+        res, body = self._check_status(url, 'POST', response, content, decode)
         return res, body
 
     def _put(self, url, headers, body=None, *args, **kwargs):
+        decode = kwargs.pop("decode", DECODE_ADDICT)
         if body is not None:
             response, content = self._request(url, 'PUT', headers=headers, body=body, *args, **kwargs)
         else:
             response, content = self._request(url, 'PUT', headers=headers, *args, **kwargs)
-        res, body = self._check_status(url, 'PUT', response, content)
+        res, body = self._check_status(url, 'PUT', response, content, decode)
         return res, body
 
     def _delete(self, url, headers, body=None, *args, **kwargs):
+        decode = kwargs.pop("decode", DECODE_ADDICT)
         if body is not None:
             response, content = self._request(url, 'DELETE', headers=headers, body=body, *args, **kwargs)
         else:
             response, content = self._request(url, 'DELETE', headers=headers, *args, **kwargs)
-        res, body = self._check_status(url, 'DELETE', response, content)
+        res, body = self._check_status(url, 'DELETE', response, content, decode)
         return res, body
 
-    def proxy(self, request, url, region_name, requests_args=None):
+    def proxy(self, request, url, region_name, requests_args=None, stream=False):
         """
         Forward as close to an exact copy of the request as possible along to the
         given url.  Respond with as close to an exact copy of the resulting
         response as possible.
         If there are any additional arguments you wish to send to requests, put
         them in the requests_args dictionary.
+        If stream is True, the upstream body is copied to the client chunk by chunk
+        instead of being read into memory first.
         """
         requests_args = (requests_args or {}).copy()
         headers = self.get_headers(request.META)
@@ -317,39 +404,47 @@ class RegionApiBaseHttpClient(object):
 
         requests_args['headers'] = headers
 
-        region = region_repo.get_region_by_region_name(region_name)
+        region = region_cache.get_region(region_name)
         if not region:
             raise ServiceHandleException("region {0} not found".format(region_name), error_code=10412)
         client = self.get_client(region_config=region)
+        if stream:
+            return self._stream_proxy(client, request.method, "{}{}".format(region.url, url), requests_args)
         response = client.request(method=request.method, timeout=20, url="{}{}".format(region.url, url), **requests_args)
 
         proxy_response = HttpResponse(response.data, status=response.status)
+        self._copy_proxy_headers(response, proxy_response, self.proxy_excluded_headers)
+        return proxy_response
 
-        excluded_headers = set([
-            # Hop-by-hop headers
-            # ------------------
-            # Certain response headers should NOT be just tunneled through.  These
-            # are they.  For more info, see:
-            # http://www.w3.org/Protocols/rfc2616/rfc2616-sec13.html#sec13.5.1
-            'connection',
-            'keep-alive',
-            'proxy-authenticate',
-            'proxy-authorization',
-            'te',
-            'trailers',
-            'transfer-encoding',
-            'upgrade',
-
-            # Although content-encoding is not listed among the hop-by-hop headers,
-            # it can cause trouble as well.  Just let the server set the value as
-            # it should be.
-            'content-encoding',
-
-            # Since the remote server may or may not have sent the content in the
-            # same encoding as Django will, let Django worry about what the length
-            # should be.
-            'content-length',
-        ])
+    # Hop-by-hop headers
+    # ------------------
+    # Certain response headers should NOT be just tunneled through.  These
+    # are they.  For more info, see:
+    # http://www.w3.org/Protocols/rfc2616/rfc2616-sec13.html#sec13.5.1
+    proxy_hop_by_hop_headers = frozenset([
+        'connection',
+        'keep-alive',
+        'proxy-authenticate',
+        'proxy-authorization',
+        'te',
+        'trailers',
+        'transfer-encoding',
+        'upgrade',
+    ])
+    proxy_excluded_headers = proxy_hop_by_hop_headers | frozenset([
+        # Although content-encoding is not listed among the hop-by-hop headers,
+        # it can cause trouble as well.  Just let the server set the value as
+        # it should be.
+        'content-encoding',
+
+        # Since the remote server may or may not have sent the content in the
+        # same encoding as Django will, let Django worry about what the length
+        # should be.
+        'content-length',
+    ])
+    proxy_stream_chunk_size = 64 * 1024
+
+    def _copy_proxy_headers(self, response, proxy_response, excluded_headers):
         for key, value in list(response.headers.items()):
             if key.lower() in excluded_headers:
                 continue
@@ -360,8 +455,37 @@ class RegionApiBaseHttpClient(object):
             else:
                 proxy_response[key] = value
 
+    def _stream_proxy(self, client, method, url, requests_args):
+        d_connect, _ = self.get_default_timeout_conifg()
+        # the read timeout applies to every chunk, not to the whole body
+        response = client.request(
+            method=method,
+            url=url,
+            timeout=urllib3.Timeout(connect=d_connect, read=20),
+            preload_content=False,
+            decode_content=False,
+            **requests_args)
+        proxy_response = StreamingHttpResponse(self._iter_proxy_body(response), status=response.status)
+        # the body is passed through as it is, so are its encoding and length
+        self._copy_proxy_headers(response, proxy_response, self.proxy_hop_by_hop_headers)
         return proxy_response
 
+    def _iter_proxy_body(self, response):
+        completed = False
+        try:
+            for chunk in response.stream(self.proxy_stream_chunk_size, decode_content=False):
+                yield chunk
+            completed = True
+        except Exception as e:
+            # headers are sent already, all we can do is to cut the body short
+            logger.warning("proxy {} interrupted: {}".format(response.geturl(), e))
+        finally:
+            # the client disconnected or the upstream failed, the rest of the body
+            # is useless and the connection can not be reused
+            if not completed:
+                response.close()
+            response.release_conn()
+
     def get_headers(self, environ):
         """
         Retrieve the HTTP headers from a WSGI environment dictionary.  See
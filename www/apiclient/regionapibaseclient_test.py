@@ -0,0 +1,100 @@
+# -*- coding: utf8 -*-
+import gzip
+
+import pytest
+from django.middleware.gzip import GZipMiddleware
+from django.test import RequestFactory
+
+from www.apiclient.regionapibaseclient import RegionApiBaseHttpClient
+
+
+class _Region(object):
+    url = "https://region"
+
+
+class _Upstream(object):
+    def __init__(self, chunks, headers=None, fail_at=None):
+        self.chunks = chunks
+        self.headers = headers or {}
+        self.status = 200
+        self.fail_at = fail_at
+        self.read = 0
+        self.closed = False
+        self.released = False
+
+    def stream(self, amt, decode_content=True):
+        assert decode_content is False
+        for i, chunk in enumerate(self.chunks):
+            if i == self.fail_at:
+                raise IOError("connection reset")
+            self.read += 1
+            yield chunk
+
+    def geturl(self):
+        return "https://region/dashboard"
+
+    def close(self):
+        self.closed = True
+
+    def release_conn(self):
+        self.released = True
+
+
+@pytest.fixture
+def proxy(mocker):
+    def proxy(upstream, **headers):
+        client = RegionApiBaseHttpClient()
+        http = mocker.Mock()
+        http.request.return_value = upstream
+        mocker.patch("www.apiclient.regionapibaseclient.region_cache.get_region", return_value=_Region())
+        mocker.patch.object(client, "get_client", return_value=http)
+        request = RequestFactory().get("/console/proxy/dashboard", **headers)
+        return request, client.proxy(request, "/dashboard", "r1", stream=True), http
+
+    return proxy
+
+
+def test_stream_proxy_streams_body(proxy):
+    upstream = _Upstream([b"a" * 10, b"b" * 10], headers={"Content-Length": "20", "Connection": "keep-alive"})
+    _, response, http = proxy(upstream)
+
+    assert http.request.call_args[1]["preload_content"] is False
+    assert response.streaming
+    assert response["Content-Length"] == "20"
+    assert not response.has_header("Connection")
+    # nothing is read before the client asks for the body
+    assert upstream.read == 0
+    body = iter(response.streaming_content)
+    assert next(body) == b"a" * 10
+    assert upstream.read == 1 and not upstream.released
+    assert list(body) == [b"b" * 10]
+    assert upstream.released and not upstream.closed
+
+
+def test_stream_proxy_releases_interrupted_body(proxy):
+    upstream = _Upstream([b"a", b"b", b"c"], fail_at=1)
+    _, response, _ = proxy(upstream)
+    assert b"".join(response.streaming_content) == b"a"
+    assert upstream.closed and upstream.released
+
+
+# closing the response sends request_finished, which closes old db connections
+@pytest.mark.django_db
+def test_stream_proxy_releases_on_client_disconnect(proxy):
+    upstream = _Upstream([b"a", b"b", b"c"])
+    _, response, _ = proxy(upstream)
+    body = iter(response.streaming_content)
+    next(body)
+    # the wsgi server closes the response when the client goes away
+    response.close()
+    assert upstream.closed and upstream.released
+
+
+def test_gzip_skips_encoded_proxy_body(proxy):
+    content = gzip.compress(b"dashboard")
+    upstream = _Upstream([content], headers={"Content-Encoding": "gzip"})
+    request, response, _ = proxy(upstream, HTTP_ACCEPT_ENCODING="gzip")
+
+    response = GZipMiddleware().process_response(request, response)
+    assert response["Content-Encoding"] == "gzip"
+    assert b"".join(response.streaming_content) == content
@@ -0,0 +1,131 @@
+# -*- coding: utf8 -*-
+"""
+  process-local cache for region access info and tenant region mappings.
+"""
+import logging
+import os
+
+from console.models.main import RegionConfig
+from console.utils.cache import LocalCache
+from django.db.models.signals import post_delete, post_save
+from goodrain_web.router import read_primary
+from www.models.main import TenantEnterpriseToken, TenantRegionInfo, Tenants
+
+logger = logging.getLogger('default')
+
+_MISS = object()
+
+
+class RegionCache(object):
+    """
+    Cache region configs, region access info and tenant region mappings in process.
+
+    The entries live in a LocalCache, the least recently used are evicted when it is
+    full. Every entry records the version of the namespace it was read under. Model
+    signals bump the version, so a change in this worker is visible at once;
+    the ttl bounds how long other gunicorn workers can serve a stale entry.
+    """
+
+    def __init__(self, ttl=None, max_size=None):
+        if ttl is None:
+            ttl = float(os.getenv("REGION_CACHE_TTL", 30))
+        if max_size is None:
+            max_size = int(os.getenv("REGION_CACHE_MAX_SIZE", 10000))
+        self.ttl = ttl
+        self.max_size = max_size
+        self.region_version = 0
+        self.tenant_version = 0
+        self._entries = LocalCache(max_size)
+
+    @property
+    def enabled(self):
+        return self.ttl > 0
+
+    @property
+    def size(self):
+        return self._entries.size
+
+    def _get(self, key, version):
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != version:
+            return _MISS
+        return entry[1]
+
+    def _set(self, key, version, value):
+        if self.enabled:
+            self._entries.set(key, (version, value), self.ttl)
+
+    def get_region(self, region_name):
+        """return the RegionConfig of region_name, or None if not exists"""
+        key = ("region", region_name)
+        version = self.region_version
+        region = self._get(key, version)
+        if region is not _MISS:
+            return region
+        # the entries are dropped on commit, a lagging replica would bring the old row back
+        with read_primary():
+            region = RegionConfig.objects.filter(region_name=region_name).first()
+        if region:
+            self._set(key, version, region)
+        return region
+
+    def get_access_info(self, tenant_name, region_name, loader):
+        """return the (url, token) of a team in the region, loader is called on miss"""
+        key = ("access", tenant_name, region_name)
+        version = (self.region_version, self.tenant_version)
+        access_info = self._get(key, version)
+        if access_info is not _MISS:
+            return access_info
+        with read_primary():
+            access_info = loader(tenant_name, region_name)
+        self._set(key, version, access_info)
+        return access_info
+
+    def get_tenant_region(self, tenant_name, region_name):
+        """return the TenantRegionInfo of a team in the region, or None if not exists"""
+        key = ("tenant_region", tenant_name, region_name)
+        version = self.tenant_version
+        tenant_region = self._get(key, version)
+        if tenant_region is not _MISS:
+            return tenant_region
+        with read_primary():
+            tenant = Tenants.objects.filter(tenant_name=tenant_name).first()
+            if not tenant:
+                logger.error("team {0} is not found!".format(tenant_name))
+                return None
+            tenant_region = TenantRegionInfo.objects.filter(tenant_id=tenant.tenant_id, region_name=region_name).first()
+        if not tenant_region:
+            logger.error("tenant {0} is not init in region {1}".format(tenant_name, region_name))
+            return None
+        self._set(key, version, tenant_region)
+        return tenant_region
+
+    def invalidate_regions(self):
+        self.region_version += 1
+
+    def invalidate_tenants(self):
+        self.tenant_version += 1
+
+    def clear(self):
+        self.invalidate_regions()
+        self.invalidate_tenants()
+        self._entries.clear()
+
+
+region_cache = RegionCache()
+
+
+def _invalidate_regions(sender, **kwargs):
+    region_cache.invalidate_regions()
+
+
+def _invalidate_tenants(sender, **kwargs):
+    region_cache.invalidate_tenants()
+
+
+for _sender in (RegionConfig, TenantEnterpriseToken):
+    post_save.connect(_invalidate_regions, sender=_sender, dispatch_uid="region_cache_regions_{}".format(_sender.__name__))
+    post_delete.connect(_invalidate_regions, sender=_sender, dispatch_uid="region_cache_regions_{}".format(_sender.__name__))
+for _sender in (Tenants, TenantRegionInfo):
+    post_save.connect(_invalidate_tenants, sender=_sender, dispatch_uid="region_cache_tenants_{}".format(_sender.__name__))
+    post_delete.connect(_invalidate_tenants, sender=_sender, dispatch_uid="region_cache_tenants_{}".format(_sender.__name__))
@@ -0,0 +1,113 @@
+# -*- coding: utf8 -*-
+import time
+
+import pytest
+from django.db import connection
+from django.db.models import signals
+from django.test.utils import CaptureQueriesContext
+
+from www.apiclient.regioncache import RegionCache, region_cache
+
+
+def _region(name="r1"):
+    from console.models.main import RegionConfig
+    return RegionConfig.objects.create(
+        region_id=name, region_name=name, region_alias=name, url="http://{}".format(name), status="1")
+
+
+@pytest.mark.django_db
+def test_get_region_cached_and_versioned():
+    cache = RegionCache(ttl=30)
+    _region()
+    assert cache.get_region("r1").url == "http://r1"
+    with CaptureQueriesContext(connection) as queries:
+        cache.get_region("r1")
+    assert len(queries) == 0
+
+    cache.invalidate_regions()
+    with CaptureQueriesContext(connection) as queries:
+        cache.get_region("r1")
+    assert len(queries) == 1
+    # a missing region is not cached
+    assert cache.get_region("missing") is None
+    assert cache.size == 1
+
+
+@pytest.mark.django_db
+def test_full_cache_evicts_least_recently_used():
+    cache = RegionCache(ttl=30, max_size=2)
+    for name in ("r1", "r2", "r3"):
+        _region(name)
+    cache.get_region("r1")
+    cache.get_region("r2")
+    cache.get_region("r1")
+    cache.get_region("r3")
+    assert cache.size == 2
+    with CaptureQueriesContext(connection) as queries:
+        cache.get_region("r1")
+        cache.get_region("r3")
+    assert len(queries) == 0
+    with CaptureQueriesContext(connection) as queries:
+        cache.get_region("r2")
+    assert len(queries) == 1
+
+
+@pytest.mark.django_db
+def test_ttl():
+    cache = RegionCache(ttl=0.05)
+    _region()
+    cache.get_region("r1")
+    time.sleep(0.06)
+    with CaptureQueriesContext(connection) as queries:
+        cache.get_region("r1")
+    assert len(queries) == 1
+
+    disabled = RegionCache(ttl=0)
+    disabled.get_region("r1")
+    assert disabled.size == 0
+
+
+@pytest.mark.django_db
+def test_access_info_depends_on_both_versions():
+    cache = RegionCache(ttl=30)
+    calls = []
+
+    def loader(tenant_name, region_name):
+        calls.append((tenant_name, region_name))
+        return "http://r1", "token"
+
+    assert cache.get_access_info("team", "r1", loader) == ("http://r1", "token")
+    cache.get_access_info("team", "r1", loader)
+    assert len(calls) == 1
+    cache.invalidate_tenants()
+    cache.get_access_info("team", "r1", loader)
+    cache.invalidate_regions()
+    cache.get_access_info("team", "r1", loader)
+    assert len(calls) == 3
+
+
+@pytest.mark.django_db
+def test_signals_invalidate():
+    from console.models.main import RegionConfig
+    from www.models.main import TenantEnterpriseToken, TenantRegionInfo, Tenants
+    region_cache.clear()
+
+    for model, version in ((RegionConfig, "region_version"), (TenantEnterpriseToken, "region_version"),
+                           (Tenants, "tenant_version"), (TenantRegionInfo, "tenant_version")):
+        before = getattr(region_cache, version)
+        signals.post_save.send(sender=model, instance=model(), created=True)
+        signals.post_delete.send(sender=model, instance=model())
+        assert getattr(region_cache, version) == before + 2, model.__name__
+
+
+@pytest.mark.django_db
+def test_tenant_region_invalidated_on_save():
+    from www.models.main import TenantRegionInfo, Tenants
+    region_cache.clear()
+    Tenants.objects.create(tenant_id="tid", tenant_name="team", tenant_alias="team", enterprise_id="eid", creater=1)
+    tenant_region = TenantRegionInfo.objects.create(tenant_id="tid", region_name="r1", region_tenant_id="rtid")
+
+    assert region_cache.get_tenant_region("team", "r1").region_tenant_id == "rtid"
+    tenant_region.region_tenant_id = "changed"
+    tenant_region.save()
+    assert region_cache.get_tenant_region("team", "r1").region_tenant_id == "changed"
@@ -0,0 +1,91 @@
+# -*- coding: utf8 -*-
+"""
+  collapse identical concurrent region api requests into one.
+"""
+import hashlib
+import logging
+import threading
+
+logger = logging.getLogger('default')
+
+
+class _Call(object):
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+        self.interrupted = False
+
+
+class SingleFlight(object):
+    """
+    The first caller of a key does the work, concurrent callers of the same key
+    wait for it and share its result or its exception.
+
+    threading primitives are patched by gevent, so waiting only blocks the greenlet.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.requests = 0
+        self.collapsed = 0
+
+    @staticmethod
+    def make_key(region_name, method, url, headers=None, body=None):
+        digest = hashlib.md5()
+        if headers:
+            digest.update(str(headers.get("Authorization", "")).encode("utf-8"))
+        if body:
+            digest.update(body if isinstance(body, bytes) else str(body).encode("utf-8"))
+        return region_name, method, url, digest.hexdigest()
+
+    def do(self, key, func, *args, **kwargs):
+        retried = False
+        while True:
+            with self._lock:
+                if not retried:
+                    self.requests += 1
+                call = self._calls.get(key)
+                leader = call is None
+                if leader:
+                    call = _Call()
+                    self._calls[key] = call
+                elif not retried:
+                    self.collapsed += 1
+            if leader:
+                return self._lead(key, call, func, *args, **kwargs)
+            call.event.wait()
+            if call.interrupted:
+                # the leader was killed, one of the waiting callers takes over
+                retried = True
+                continue
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+    def _lead(self, key, call, func, *args, **kwargs):
+        try:
+            call.result = func(*args, **kwargs)
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        except BaseException:
+            # e.g. killed by a fan out deadline, the error is not the followers' one
+            call.interrupted = True
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+    def stats(self):
+        return {
+            "requests": self.requests,
+            "collapsed": self.collapsed,
+            "inflight": len(self._calls),
+        }
+
+
+single_flight = SingleFlight()
@@ -0,0 +1,109 @@
+# -*- coding: utf8 -*-
+import threading
+import time
+
+from www.apiclient.singleflight import SingleFlight
+
+
+class Killed(BaseException):
+    pass
+
+
+def _run(flight, func, callers):
+    results, errors = [], []
+
+    def call():
+        try:
+            results.append(flight.do("key", func))
+        except BaseException as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(callers)]
+    for t in threads:
+        t.start()
+    return threads, results, errors
+
+
+def _wait_followers(flight, count):
+    deadline = time.time() + 2
+    while flight.collapsed < count and time.time() < deadline:
+        time.sleep(0.01)
+
+
+def test_collapse():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def func():
+        calls.append(1)
+        release.wait(2)
+        return "body"
+
+    threads, results, errors = _run(flight, func, 4)
+    _wait_followers(flight, 3)
+    release.set()
+    for t in threads:
+        t.join()
+    assert results == ["body"] * 4 and not errors
+    assert len(calls) == 1
+    assert flight.stats() == {"requests": 4, "collapsed": 3, "inflight": 0}
+
+
+def test_error_shared():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def func():
+        release.wait(2)
+        raise ValueError("region down")
+
+    threads, results, errors = _run(flight, func, 3)
+    _wait_followers(flight, 2)
+    release.set()
+    for t in threads:
+        t.join()
+    assert not results
+    assert len(errors) == 3 and all(isinstance(e, ValueError) for e in errors)
+    # the next call runs again
+    assert flight.do("key", lambda: "body") == "body"
+
+
+def test_follower_takes_over_interrupted_leader():
+    flight = SingleFlight()
+    release, takeover = threading.Event(), threading.Event()
+    calls = []
+
+    def func():
+        calls.append(1)
+        if len(calls) == 1:
+            release.wait(2)
+            raise Killed()
+        # let the other follower join the new leader
+        takeover.wait(2)
+        return "body"
+
+    threads, results, errors = _run(flight, func, 3)
+    _wait_followers(flight, 2)
+    release.set()
+    time.sleep(0.1)
+    takeover.set()
+    for t in threads:
+        t.join()
+    assert len(errors) == 1 and isinstance(errors[0], Killed)
+    assert results == ["body", "body"]
+    assert len(calls) == 2
+    assert flight.stats()["inflight"] == 0
+
+
+def test_make_key():
+    key = SingleFlight.make_key("r1", "GET", "/v2/pods", {"Authorization": "a"})
+    assert key == SingleFlight.make_key("r1", "GET", "/v2/pods", {"Authorization": "a"})
+    assert key != SingleFlight.make_key("r1", "GET", "/v2/pods", {"Authorization": "b"})
+    assert key != SingleFlight.make_key("r1", "GET", "/v2/pods", {"Authorization": "a"}, body="{}")
+
+
+def test_single_caller():
+    flight = SingleFlight()
+    assert flight.do("key", lambda x: x * 2, 2) == 4
+    assert flight.stats() == {"requests": 1, "collapsed": 0, "inflight": 0}
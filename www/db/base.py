@@ -1,6 +1,46 @@
 # -*- coding: utf8 -*-
+from collections import namedtuple
+
 from addict import Dict
 from django.db import connections
+from goodrain_web.router import read_db
+
+_row_classes = {}
+
+
+def _row_class(columns):
+    """a namedtuple of the columns, whose fields can also be read as row["column"]"""
+    row_class = _row_classes.get(columns)
+    if row_class is None:
+        base = namedtuple("Row", columns, rename=True)
+
+        class Row(base):
+            __slots__ = ()
+
+            def __getitem__(self, key):
+                if isinstance(key, str):
+                    return getattr(self, key)
+                return base.__getitem__(self, key)
+
+            def get(self, key, default=None):
+                return getattr(self, key, default)
+
+        row_class = _row_classes[columns] = Row
+    return row_class
+
+
+def _streaming_cursor(connection):
+    """
+    a cursor which reads the rows from the server as they are fetched. The default
+    MySQLdb cursor buffers the whole result on execute.
+    """
+    if connection.vendor != "mysql":
+        return connection.cursor()
+    from django.db.backends.mysql.base import CursorWrapper
+    from MySQLdb.cursors import SSCursor
+    connection.ensure_connection()
+    with connection.wrap_database_errors:
+        return connection._prepare_cursor(CursorWrapper(connection.connection.cursor(SSCursor)))
 
 
 class BaseConnection(object):
@@ -11,7 +51,50 @@ class BaseConnection(object):
         desc = cursor.description
         return [Dict(list(zip([col[0] for col in desc], row))) for row in cursor.fetchall()]
 
-    def query(self, sql):
-        cursor = connections[self.db_alias].cursor()
-        cursor.execute(sql)
-        return self._dict_fetch_all(cursor)
+    def query(self, sql, args=None):
+        # raw queries only read, a read replica serves them like the reads of models
+        with connections[read_db(self.db_alias)].cursor() as cursor:
+            cursor.execute(sql, args)
+            return self._dict_fetch_all(cursor)
+
+    def iter_query(self, sql, params=None, batch_size=500):
+        """
+        iterate the rows of sql, fetched batch_size at a time. The rows are read only
+        namedtuples, row.column or row["column"].
+        On MySQL the rows are streamed from the server, so the connection must not run
+        other queries until the iteration is over.
+        :param params: bound to the %s placeholders of sql
+        """
+        cursor = _streaming_cursor(connections[read_db(self.db_alias)])
+        try:
+            cursor.execute(sql, params)
+            row_class = _row_class(tuple(col[0] for col in cursor.description))
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield row_class(*row)
+        finally:
+            cursor.close()
+
+    def query_page(self, sql, params=None, page=1, page_size=10, order_by=None, after=None):
+        """
+        a page of the rows of sql, which must end with its WHERE clause.
+        :param order_by: (column, "ASC" or "DESC"), the order of the pages
+        :param after: the order_by column of the last row of the previous page, to seek the
+            page by the key instead of skipping (page - 1) * page_size rows
+        """
+        params = list(params or [])
+        if after is not None:
+            column, direction = order_by
+            sql += " AND {} {} %s".format(column, "<" if direction.upper() == "DESC" else ">")
+            params.append(after)
+        if order_by:
+            sql += " ORDER BY {} {}".format(*order_by)
+        sql += " LIMIT %s"
+        params.append(page_size)
+        if after is None:
+            sql += " OFFSET %s"
+            params.append((max(page, 1) - 1) * page_size)
+        return list(self.iter_query(sql, params))
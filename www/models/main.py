@@ -705,6 +705,11 @@ class TenantServiceExtendMethod(BaseModel):
 class ServiceDomain(BaseModel):
     class Meta:
         db_table = 'service_domain'
+        indexes = [
+            models.Index(fields=['service_id', 'container_port'], name='service_domain_service_idx'),
+            models.Index(fields=['tenant_id', 'region_id'], name='service_domain_tenant_idx'),
+            models.Index(fields=['domain_name'], name='service_domain_domain_idx'),
+        ]
 
     http_rule_id = models.CharField(max_length=128, unique=True, help_text="http_rule_id")
     region_id = models.CharField(max_length=36, help_text="region id")
@@ -937,6 +942,7 @@ class TenantServiceL7Info(BaseModel):
 class TenantServiceEnvVar(BaseModel):
     class Meta:
         db_table = 'tenant_service_env_var'
+        indexes = [models.Index(fields=['tenant_id', 'service_id'], name='service_env_var_tenant_idx')]
 
     class ScopeType(Enum):
         """范围"""
@@ -967,6 +973,7 @@ class TenantServicesPort(BaseModel):
     class Meta:
         db_table = 'tenant_services_port'
         unique_together = ('service_id', 'container_port')
+        indexes = [models.Index(fields=['tenant_id', 'service_id'], name='services_port_tenant_idx')]
 
     tenant_id = models.CharField(max_length=32, null=True, blank=True, help_text='租户id')
     service_id = models.CharField(max_length=32, db_index=True, help_text="组件ID")
@@ -1075,6 +1082,10 @@ class ServiceGroupRelation(BaseModel):
 
     class Meta:
         db_table = 'service_group_relation'
+        indexes = [
+            models.Index(fields=['service_id'], name='service_group_rel_service_idx'),
+            models.Index(fields=['group_id'], name='service_group_rel_group_idx'),
+        ]
 
     service_id = models.CharField(max_length=32, help_text="组件id")
     group_id = models.IntegerField()
@@ -1235,9 +1246,9 @@ class ServiceConsume(BaseModel):
     real_disk_money = models.DecimalField(max_digits=10, decimal_places=2, default=0.00, help_text="磁盘按需金额")
 
 
-class ServiceEvent(BaseModel):
+class AbstractServiceEvent(BaseModel):
     class Meta:
-        db_table = 'service_event'
+        abstract = True
 
     event_id = models.CharField(max_length=32, help_text="操作id")
     tenant_id = models.CharField(max_length=32, help_text="租户id")
@@ -1256,6 +1267,29 @@ class ServiceEvent(BaseModel):
     region = models.CharField(max_length=64, default="", help_text="组件所属数据中心")
 
 
+class ServiceEvent(AbstractServiceEvent):
+    class Meta:
+        db_table = 'service_event'
+        indexes = [
+            models.Index(fields=['tenant_id', 'start_time'], name='service_event_tenant_idx'),
+            models.Index(fields=['service_id', 'start_time'], name='service_event_service_idx'),
+            models.Index(fields=['event_id'], name='service_event_event_idx'),
+            models.Index(fields=['tenant_id', 'ID'], name='service_event_tenant_id_idx'),
+        ]
+
+
+class ServiceEventArchive(AbstractServiceEvent):
+    """completed service events moved out of service_event, see console.services.event_archive"""
+
+    class Meta:
+        db_table = 'service_event_archive'
+        indexes = [
+            models.Index(fields=['service_id', 'start_time'], name='event_archive_service_idx'),
+            models.Index(fields=['tenant_id', 'ID'], name='event_archive_tenant_id_idx'),
+            models.Index(fields=['event_id'], name='event_archive_event_idx'),
+        ]
+
+
 class GroupCreateTemp(BaseModel):
     class Meta:
         db_table = 'group_create_temp'